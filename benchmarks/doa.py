@@ -0,0 +1,93 @@
+"""Benchmark the overhead of following function calls in DOA
+
+It runs a small program inside a temporary project using
+`rope.base.oi.runmod`, once without dynamic object analysis and once
+with each of the tracers ``doa_tracer`` project config can select
+and some of the sampling configs, and reports how much slower each
+run is.  Run it from the root of the
+source tree::
+
+  PYTHONPATH=. python benchmarks/doa.py
+
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import rope.base.oi.runmod
+
+
+PROGRAM = '''\
+class Point(object):
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def distance(self, other):
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return (dx * dx + dy * dy) ** 0.5
+
+
+def walk(count):
+    total = 0.0
+    previous = Point(0, 0)
+    for i in range(count):
+        point = Point(i % 7, i % 11)
+        for j in range(20):
+            total += j * 0.5
+        total += previous.distance(point)
+        previous = point
+    return total
+
+
+walk(50000)
+'''
+
+OPTIONS = ['tracer=trace', 'tracer=profile',
+           'tracer=profile,sample_rate=0.1',
+           'tracer=profile,max_calls=100',
+           'tracer=profile,max_signatures=3']
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        program = os.path.join(root, 'program.py')
+        with open(program, 'w') as output:
+            output.write(PROGRAM)
+        data = os.path.join(root, 'data')
+        base = _run(root, '-', '', program)
+        print('without doa: %.3f s' % base)
+        for options in OPTIONS:
+            seconds = _run(root, data, options, program)
+            print('%s: %.3f s (%.1fx slower)' % (options, seconds,
+                                                 seconds / base))
+    finally:
+        shutil.rmtree(root)
+
+
+def _run(root, send_info, options, program, repeat=3):
+    runmod = rope.base.oi.runmod.__file__
+    if runmod.endswith('.pyc'):
+        runmod = runmod[:-1]
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(runmod)))))
+    result = None
+    for i in range(repeat):
+        start = time.time()
+        subprocess.check_call([sys.executable, runmod, send_info, root,
+                               options, program], cwd=root, env=env)
+        seconds = time.time() - start
+        result = seconds if result is None else min(result, seconds)
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark the memory used by loaded modules
+
+It creates a project with generated modules, loads them and visits
+all of their scopes and names, and reports the bytes allocated per
+module and the number of pynames and scopes created.  It needs
+`tracemalloc` (python 3.4 or later).  Run it from the root of the
+source tree::
+
+  PYTHONPATH=. python benchmarks/memory.py
+
+"""
+import gc
+import shutil
+import tempfile
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import rope.base.project
+from rope.base import pynames, pyscopes
+
+
+def generate_module(index, classes=10, methods=10):
+    lines = ['import os\n', 'from os import path\n\n']
+    for i in range(classes):
+        lines.append('class Class%d(object):\n\n' % i)
+        lines.append('    def __init__(self, arg):\n')
+        lines.append('        self.arg = arg\n\n')
+        for j in range(methods):
+            lines.append('    def method%d(self, a, b=%d):\n' % (j, j))
+            lines.append('        c, (d, e) = a, (b, %d)\n' % index)
+            lines.append('        f = [x for x in (a, b)]\n')
+            lines.append('        return path.join(c, f)\n\n')
+    lines.append('instance = Class0(%d)\n' % index)
+    return ''.join(lines)
+
+
+def visit_scope(scope, counts):
+    counts['scopes'] += 1
+    for pyname in scope.get_names().values():
+        if isinstance(pyname, pynames.PyName):
+            counts['pynames'] += 1
+            if isinstance(pyname, pynames.AssignedName):
+                counts['assignments'] += len(pyname.assignments)
+    scope.get_logical_end()
+    for child in scope.get_scopes():
+        visit_scope(child, counts)
+
+
+def main(modules=100):
+    if tracemalloc is None:
+        print('tracemalloc is not available')
+        return
+    root = tempfile.mkdtemp()
+    try:
+        project = rope.base.project.Project(root, ropefolder=None)
+        for index in range(modules):
+            module = project.root.create_file('mod%d.py' % index)
+            module.write(generate_module(index))
+        resources = project.get_python_files()
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        counts = {'scopes': 0, 'pynames': 0, 'assignments': 0}
+        pymodules = []
+        for resource in resources:
+            pymodule = project.get_pymodule(resource)
+            pymodules.append(pymodule)
+            visit_scope(pymodule.get_scope(), counts)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        print('%d modules: %d bytes per module' %
+              (len(pymodules), used // len(pymodules)))
+        print('  %(scopes)d scopes, %(pynames)d pynames, '
+              '%(assignments)d assignments' % counts)
+        print('  Scope uses __slots__: %s' %
+              ('__slots__' in vars(pyscopes.Scope)))
+        project.close()
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
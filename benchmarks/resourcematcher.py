@@ -0,0 +1,65 @@
+"""Benchmark matching resource paths against ignored resource patterns
+
+It compares `rope.base.resources._ResourceMatcher.does_match_path()`
+(a single combined regular expression and a cache of the results)
+with matching each of the patterns in turn, as it was done before,
+on 100000 generated paths and a long list of patterns.  Run it from
+the root of the source tree::
+
+  PYTHONPATH=. python benchmarks/resourcematcher.py
+
+"""
+import random
+import time
+
+from rope.base import resources
+
+
+PATTERNS = ['*.pyc', '*~', '.ropeproject', '.hg', '.svn', '_svn', '.git',
+            '.tox', '.venv', 'venv', 'env', 'build', 'dist', '*.egg-info',
+            '__pycache__', 'node_modules', '.mypy_cache', '.pytest_cache',
+            '*.so', '*.o', '*.orig', '*.rej', '*.swp', '.DS_Store',
+            'docs//_build', 'htmlcov', '.coverage', '*.log', 'tmp', '.idea']
+
+
+def generate_paths(count, seed=0):
+    rand = random.Random(seed)
+    folders = ['pkg%d' % index for index in range(20)] + \
+        ['build', '.git', 'docs', '__pycache__']
+    extensions = ['.py', '.py', '.py', '.pyc', '.txt', '.so']
+    result = []
+    for index in range(count):
+        parts = [rand.choice(folders) for depth in range(rand.randint(1, 4))]
+        parts.append('mod%d%s' % (index, rand.choice(extensions)))
+        result.append('/'.join(parts))
+    return result
+
+
+def each_pattern_match(compiled_patterns, path):
+    for pattern in compiled_patterns:
+        if pattern.match(path):
+            return True
+    return False
+
+
+def main(count=100000):
+    paths = generate_paths(count)
+    matcher = resources._ResourceMatcher()
+    matcher.set_patterns(PATTERNS)
+    compiled_patterns = matcher.compiled_patterns
+    print('%d paths, %d patterns:' % (len(paths), len(PATTERNS)))
+    start = time.time()
+    expected = [each_pattern_match(compiled_patterns, path)
+                for path in paths]
+    print('  each pattern: %.3f s, %d matched' %
+          (time.time() - start, sum(expected)))
+    for title in ('combined pattern', 'cached results'):
+        start = time.time()
+        result = [matcher.does_match_path(path) for path in paths]
+        print('  %s: %.3f s, %d matched' %
+              (title, time.time() - start, sum(result)))
+        assert result == expected
+
+
+if __name__ == '__main__':
+    main()
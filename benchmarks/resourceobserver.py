@@ -0,0 +1,55 @@
+"""Benchmark folder operations of `FilteredResourceObserver`
+
+It tracks 50000 resources (in 500 folders) and times moving, validating
+and removing a folder that contains 100 of them.  Run it from the
+root of the source tree::
+
+  PYTHONPATH=. python benchmarks/resourceobserver.py
+
+"""
+import os
+import shutil
+import tempfile
+import timeit
+
+import rope.base.project
+from rope.base import resourceobserver
+
+
+FOLDERS = 500
+FILES = 100
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        project = rope.base.project.Project(root, ropefolder=None)
+        observer = resourceobserver.FilteredResourceObserver(
+            resourceobserver.ResourceObserver())
+        for i in range(FOLDERS):
+            for j in range(FILES):
+                observer.add_resource(
+                    project.get_file('pkg%d/mod%d.py' % (i, j)))
+        folder = project.get_folder('pkg%d' % (FOLDERS // 2))
+        new_folder = project.get_folder('newpkg')
+        for path in (folder.real_path, new_folder.real_path):
+            os.mkdir(path)
+            for j in range(FILES):
+                open(os.path.join(path, 'mod%d.py' % j), 'w').close()
+        print('tracked resources: %d' % len(observer.resources))
+        _report('moving a folder',
+                lambda: observer.resource_moved(folder, new_folder))
+        _report('validating a folder', lambda: observer.validate(folder))
+        _report('removing a folder',
+                lambda: observer.resource_removed(folder))
+    finally:
+        shutil.rmtree(root)
+
+
+def _report(name, function, number=10):
+    seconds = min(timeit.repeat(function, repeat=3, number=number))
+    print('%s: %.3f ms' % (name, seconds * 1000 / number))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark finding the changed lines of a module for automatic SOA
+
+It compares `rope.base.pycore._TextChangeDetector` with the
+`difflib.Differ` based version it replaced, on generated modules with
+a few changed and inserted lines and on modules generated again with
+different constants.  Run it from the root of the source
+tree::
+
+  PYTHONPATH=. python benchmarks/textchangedetector.py
+
+"""
+import difflib
+import random
+import time
+
+from rope.base import pycore
+
+
+def differ_changed_lines(old, new):
+    result = []
+    lineno = 0
+    for line in difflib.Differ().compare(old.splitlines(True),
+                                         new.splitlines(True)):
+        if line.startswith(' '):
+            lineno += 1
+        elif line.startswith('-'):
+            lineno += 1
+            result.append(lineno)
+    return result
+
+
+def generate_module(functions, factor=10):
+    lines = []
+    for i in range(functions):
+        lines.append('def function%d(arg):\n' % i)
+        lines.append('    value = arg * %d\n' % (i % factor))
+        lines.append('    if value:\n')
+        lines.append('        return value\n')
+        lines.append('    return None\n')
+        lines.append('\n')
+    return lines
+
+
+def change_module(lines, count, seed=0):
+    rand = random.Random(seed)
+    lines = list(lines)
+    for i in range(count):
+        index = rand.randrange(len(lines))
+        if i % 2:
+            lines[index] = '    value = None\n'
+        else:
+            lines.insert(index, '    print(value)\n')
+    return lines
+
+
+def main():
+    for functions in (200, 2000):
+        old = generate_module(functions)
+        _compare('%d lines, 20 changes' % len(old), old,
+                 change_module(old, 20))
+    for functions in (100, 400, 1000):
+        old = generate_module(functions)
+        _compare('%d lines, regenerated' % len(old), old,
+                 generate_module(functions, 7))
+
+
+def _compare(title, old, new):
+    old_text = ''.join(old)
+    new_text = ''.join(new)
+    print(title + ':')
+    start = time.time()
+    expected = differ_changed_lines(new_text, old_text)
+    print('  difflib.Differ: %.3f s, %d changed lines' %
+          (time.time() - start, len(expected)))
+    start = time.time()
+    detector = pycore._TextChangeDetector(new_text, old_text)
+    print('  _TextChangeDetector: %.3f s, %d changed lines' %
+          (time.time() - start, len(detector.lines)))
+
+
+if __name__ == '__main__':
+    main()
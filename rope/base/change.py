@@ -1,9 +1,11 @@
 import datetime
 import difflib
+import hashlib
 import os
 import time
 
 import rope.base.fscommands
+import rope.base.utils.pycompat as pycompat
 from rope.base import taskhandle, exceptions, utils
 
 
@@ -37,6 +39,13 @@ class Change(object):
         """Return the list of resources that will be changed"""
         return []
 
+    def compact(self):
+        """Keep less information about this change in memory
+
+        `History` calls it when this change is no longer the last one
+        done or undone.
+        """
+
     @property
     @utils.saveit
     def _operations(self):
@@ -114,6 +123,10 @@ class ChangeSet(Change):
             result.update(change.get_changed_resources())
         return result
 
+    def compact(self):
+        for change in self.changes:
+            change.compact()
+
 
 def _handle_job_set(function):
     """A decorator for handling `taskhandle.JobSet`\s
@@ -135,33 +148,109 @@ class ChangeContents(Change):
 
     * `resource`: The `rope.base.resources.File` to change
     * `new_contents`: What to write in the file
+
+    After `compact()` is called, only the differences between the
+    old and new contents are kept; the contents that are in the file
+    are read from it when needed.  The differences are computed from
+    the contents once and are also what is saved in the history.  If
+    the file does not have either contents (it has been changed by
+    later changes or outside of rope), the contents cannot be made
+    and performing or undoing this change raises
+    `exceptions.HistoryError`.
+
     """
 
     def __init__(self, resource, new_contents, old_contents=None):
         self.resource = resource
-        # IDEA: Only saving diffs; possible problems when undo/redoing
-        self.new_contents = new_contents
-        self.old_contents = old_contents
+        # `None` when compacted
+        self._contents = {'new': new_contents, 'old': old_contents}
+        # the digests and the differences of the contents; `False` if
+        # they are larger than the contents
+        self._delta = None
 
     @_handle_job_set
     def do(self):
-        if self.old_contents is None:
-            self.old_contents = self.resource.read()
-        self._operations.write_file(self.resource, self.new_contents)
+        if self._contents is not None and self._contents['old'] is None:
+            self._contents['old'] = self.resource.read()
+        self._write('new')
 
     @_handle_job_set
     def undo(self):
-        if self.old_contents is None:
+        if self._contents is not None and self._contents['old'] is None:
             raise exceptions.HistoryError(
                 'Undoing a change that is not performed yet!')
-        self._operations.write_file(self.resource, self.old_contents)
+        self._write('old')
+
+    def _write(self, side):
+        self._expand()
+        self._operations.write_file(self.resource, self._contents[side])
+
+    def compact(self):
+        # the full contents of moved files are kept; it is the file at
+        # the old location that is read when making them
+        if self._contents is not None and \
+           os.path.isfile(self.resource.real_path) and self._get_delta():
+            self._contents = None
+
+    def _get_delta(self):
+        """Return the digests and the differences of the contents
+
+        `None` is returned if the change is not performed yet or if
+        the differences are larger than the new contents.
+        """
+        if self._delta is None and self._contents is not None and \
+           self._contents['old'] is not None:
+            new, old = self._contents['new'], self._contents['old']
+            delta = _diff(old, new)
+            self._delta = False
+            if _delta_size(delta) < len(new):
+                self._delta = ({'new': _digest(new), 'old': _digest(old)},
+                               delta)
+        return self._delta or None
+
+    def _expand(self):
+        if self._contents is None:
+            self._contents = {'new': self._get_contents('new'),
+                              'old': self._get_contents('old')}
+
+    def _get_contents(self, side):
+        if self._contents is not None:
+            return self._contents[side]
+        digests, delta = self._delta
+        if not os.path.isfile(self.resource.real_path):
+            raise exceptions.HistoryError(
+                'File <%s> does not exist' % self.resource.path)
+        current = self.resource.read()
+        digest = _digest(current)
+        if digest == digests[side]:
+            return current
+        if digest == digests['new' if side == 'old' else 'old']:
+            return _patch(current, delta, side)
+        raise exceptions.HistoryError(
+            'File <%s> has been changed after this change' %
+            self.resource.path)
+
+    def _set_contents(self, side, contents):
+        self._expand()
+        self._contents[side] = contents
+        self._delta = None
+
+    new_contents = property(
+        lambda self: self._get_contents('new'),
+        lambda self, contents: self._set_contents('new', contents))
+    old_contents = property(
+        lambda self: self._get_contents('old'),
+        lambda self, contents: self._set_contents('old', contents))
 
     def __str__(self):
         return 'Change <%s>' % self.resource.path
 
     def get_description(self):
-        new = self.new_contents
-        old = self.old_contents
+        try:
+            new = self.new_contents
+            old = self.old_contents
+        except exceptions.HistoryError:
+            return self._get_delta_description()
         if old is None:
             if self.resource.exists():
                 old = self.resource.read()
@@ -172,10 +261,74 @@ class ChangeContents(Change):
             'a/' + self.resource.path, 'b/' + self.resource.path)
         return ''.join(list(result))
 
+    def _get_delta_description(self):
+        # the contents cannot be made; describing the changed lines only
+        result = ['--- a/%s\n' % self.resource.path,
+                  '+++ b/%s\n' % self.resource.path]
+        for i1, i2, j1, j2, old_text, new_text in self._delta[1]:
+            result.append('@@ -%s +%s @@\n' %
+                          (_unified_range(i1, i2), _unified_range(j1, j2)))
+            result.extend('-' + line for line in old_text.splitlines(True))
+            result.extend('+' + line for line in new_text.splitlines(True))
+        return ''.join(result)
+
     def get_changed_resources(self):
         return [self.resource]
 
 
+def _diff(old, new):
+    """Return the lines that differ in `old` and `new`
+
+    The result is a list of ``(i1, i2, j1, j2, old_text, new_text)``
+    tuples; the lines ``i1:i2`` of `old` are `old_text` and the lines
+    ``j1:j2`` of `new` are `new_text`.  Either contents can be made
+    from the other using `_patch()`.
+    """
+    old_lines = old.splitlines(True)
+    new_lines = new.splitlines(True)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+    return [(i1, i2, j1, j2, ''.join(old_lines[i1:i2]),
+             ''.join(new_lines[j1:j2]))
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+            if tag != 'equal']
+
+
+def _patch(contents, delta, side):
+    """Make the `side` (``'old'`` or ``'new'``) contents of `delta`"""
+    lines = contents.splitlines(True)
+    result = []
+    last = 0
+    for i1, i2, j1, j2, old_text, new_text in delta:
+        if side == 'new':
+            start, end, text = i1, i2, new_text
+        else:
+            start, end, text = j1, j2, old_text
+        result.extend(lines[last:start])
+        result.append(text)
+        last = end
+    result.extend(lines[last:])
+    return ''.join(result)
+
+
+def _unified_range(start, end):
+    """Format lines ``start:end`` as `difflib.unified_diff()` does"""
+    if end - start == 1:
+        return '%d' % (start + 1)
+    if start == end:
+        return '%d,0' % start
+    return '%d,%d' % (start + 1, end - start)
+
+
+def _delta_size(delta):
+    return sum(len(item[4]) + len(item[5]) + 32 for item in delta)
+
+
+def _digest(contents):
+    if isinstance(contents, pycompat.str):
+        contents = contents.encode('utf-8')
+    return hashlib.md5(contents).hexdigest()
+
+
 class MoveResource(Change):
     """Move a resource to a new location
 
@@ -393,6 +546,9 @@ class ChangeToData(object):
         return (description, changes, change.time)
 
     def convertChangeContents(self, change):
+        delta = change._get_delta()
+        if delta is not None:
+            return (change.resource.path, None, None, delta)
         return (change.resource.path, change.new_contents, change.old_contents)
 
     def convertMoveResource(self, change):
@@ -423,9 +579,14 @@ class DataToChange(object):
             result.add_change(self(child))
         return result
 
-    def makeChangeContents(self, path, new_contents, old_contents):
+    def makeChangeContents(self, path, new_contents, old_contents,
+                           delta=None):
         resource = self.project.get_file(path)
-        return ChangeContents(resource, new_contents, old_contents)
+        result = ChangeContents(resource, new_contents, old_contents)
+        if delta is not None:
+            result._contents = None
+            result._delta = delta
+        return result
 
     def makeMoveResource(self, old_path, new_path):
         resource = self.project.get_file(old_path)
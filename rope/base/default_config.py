@@ -40,18 +40,96 @@ def set_prefs(prefs):
     prefs['save_objectdb'] = True
     prefs['compress_objectdb'] = False
 
+    # How rope saves object information: `'pickle'` loads and writes
+    # all of it at once while `'sqlite'` loads the information of each
+    # file when needed and writes only what has changed (and imports
+    # the information saved with `'pickle'` the first time).
+    # `compress_objectdb` is used only by `'pickle'`.
+    prefs['objectdb_backend'] = 'pickle'
+
     # If `True`, rope analyzes each module when it is being saved.
     prefs['automatic_soa'] = True
+    # If `True`, saving modules does not wait for analyzing them; they
+    # are queued and analyzed when `PyCore.perform_deferred_soa()` is
+    # called (when the editor is idle, for instance) or when the
+    # project is closed.
+    prefs['defer_automatic_soa'] = False
     # The depth of calls to follow in static object analysis
     prefs['soa_followed_calls'] = 0
 
+    # If `True`, rope keeps an index of the names used in each python
+    # file in the project and skips the files that do not contain a
+    # name when searching for its occurrences (renames, for instance).
+    prefs['use_name_index'] = False
+    # If `True`, the modification time and size of files are checked
+    # before trusting their index entries.  Otherwise the index relies
+    # on rope being notified of changes (see `Project.validate()`).
+    prefs['validate_name_index'] = False
+
+    # The number of processes used for searching the files of the
+    # project in renames and when finding occurrences.  Only the
+    # files saved on disk are searched by the extra processes.
+    prefs['search_processes'] = 1
+
+    # If `True`, the global names of python files are saved in the
+    # project's rope folder so that generating the autoimport cache
+    # does not parse unchanged files again.
+    prefs['use_structure_cache'] = False
+
+    # If `True`, rope watches the files of the project (using inotify,
+    # on Linux) for changes made by other programs.  The changes are
+    # reported when `Project.validate()` is called, without checking
+    # all of the files.
+    prefs['use_watcher'] = False
+
+    # The maximum number of modules rope keeps in memory; the least
+    # recently used modules are dropped (and analyzed again when
+    # needed) when there are more.  `0` means no limit.
+    prefs['max_cached_modules'] = 0
+
+    # Like `max_cached_modules` but limits the total size of the
+    # sources of the cached modules, in characters.  The memory used
+    # by a module is usually a few tens of times its source.  `0`
+    # means no limit.
+    prefs['max_cached_modules_size'] = 0
+
+    # If `True`, the listings of the folders of the project are cached
+    # and the files and folders in them are not checked again until
+    # rope changes them or `Project.validate()` is called.  Changes
+    # made by other programs are not seen before that, unless
+    # `use_watcher` is set.
+    prefs['cache_folder_listings'] = False
+
     # If `False` when running modules or unit tests "dynamic object
     # analysis" is turned off.  This makes them much faster.
     prefs['perform_doa'] = True
 
-    # Rope can check the validity of its object DB when running.
+    # How function calls are followed in "dynamic object analysis".
+    # With ``'profile'``, only function calls and returns are reported
+    # to rope (using `sys.setprofile()` or `sys.monitoring` in python
+    # 3.12+); ``'trace'`` uses `sys.settrace()`, which is called for
+    # every line and so is much slower.
+    prefs['doa_tracer'] = 'profile'
+
+    # For running long programs with "dynamic object analysis", it can
+    # record only some of the calls.  `doa_max_calls` is the maximum
+    # number of calls recorded for each function, `doa_sample_rate`
+    # is the probability of recording a call and, when the number of
+    # distinct calls recorded reaches `doa_max_signatures`, calls are
+    # no longer followed.  Zero means no limit.
+    prefs['doa_max_calls'] = 0
+    prefs['doa_sample_rate'] = 1.0
+    prefs['doa_max_signatures'] = 0
+
+    # Rope can check the validity of its object DB when running.  The
+    # information of each file is validated when it is first used.
     prefs['validate_objectdb'] = True
 
+    # If `True`, the files in the object DB are checked in a background
+    # thread when the project is opened, rather than when they are
+    # first used.
+    prefs['validate_objectdb_in_background'] = False
+
     # How many undos to hold?
     prefs['max_history_items'] = 32
 
@@ -1,7 +1,8 @@
 import rope.base.builtins
 import rope.base.pynames
 import rope.base.pyobjects
-from rope.base import ast, astutils, exceptions, pyobjects, arguments, worder
+from rope.base import (ast, astutils, exceptions, pyobjects, arguments,
+                       worder, utils)
 from rope.base.utils import pycompat
 
 
@@ -28,6 +29,58 @@ def eval_node(scope, node):
 
 
 def eval_node2(scope, node):
+    """Evaluate a `ast.AST` node and return the primary and the PyName
+
+    The results are cached per scope and node until the concluded
+    data of the module of `scope` are forgotten or the parameters
+    of the functions containing `scope` are set again.
+    """
+    evaluated = _get_evaluated(scope, node)
+    if evaluated is None:
+        return _eval_node2(scope, node)
+    pycore = scope.pycore
+    versions = _get_parameter_versions(scope)
+    if scope in evaluated and evaluated[scope][0] == versions:
+        pycore.evaluation_hits += 1
+        return evaluated[scope][1]
+    pycore.evaluation_misses += 1
+    recursions = utils.prevented_recursions()
+    result = _eval_node2(scope, node)
+    # results affected by prevented recursions or failures are not
+    # cached; they may change once the inference that is in progress
+    # finishes
+    if result[1] is not None and \
+       recursions == utils.prevented_recursions():
+        evaluated[scope] = (versions, result)
+    return result
+
+
+def _get_parameter_versions(scope):
+    # the parameters of functions are set for each call site whose
+    # returned object is inferred; the results in their scopes (and
+    # in the scopes inside them) depend on the parameters
+    result = []
+    while scope is not None:
+        if isinstance(scope, rope.base.pyscopes.FunctionScope):
+            result.append(scope.pyobject.parameters_version)
+        scope = scope.parent
+    return tuple(result)
+
+
+def _get_evaluated(scope, node):
+    if isinstance(scope, rope.base.pyscopes.TemporaryScope):
+        return None
+    module = scope.pyobject.get_module()
+    if not isinstance(module, (pyobjects.PyModule, pyobjects.PyPackage)):
+        return None
+    module_evaluated = module._get_evaluated()
+    try:
+        return module_evaluated.setdefault(node, {})
+    except TypeError:
+        return None
+
+
+def _eval_node2(scope, node):
     evaluator = StatementEvaluator(scope)
     ast.walk(node, evaluator)
     return evaluator.old_result, evaluator.result
@@ -1,28 +1,39 @@
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
 from rope.base import exceptions, change, taskhandle
 
 
 class History(object):
-    """A class that holds project history"""
+    """A class that holds project history
+
+    When ``save_history`` project config is set, the history is saved
+    in a journal in the project's rope folder.  Each change is
+    appended to it once, when it is done, and the changes are loaded
+    only when they are needed (undone, for instance).
+
+    """
 
     def __init__(self, project, maxundos=None):
         self.project = project
         self._undo_list = []
         self._redo_list = []
         self._maxundos = maxundos
+        self._journal = _Journal(project, self.compress)
         self._load_history()
         self.project.data_files.add_write_hook(self.write)
         self.current_change = None
 
     def _load_history(self):
         if self.save:
-            result = self.project.data_files.read_data(
-                'history', compress=self.compress, import_=True)
-            if result is not None:
-                to_change = change.DataToChange(self.project)
-                for data in result[0]:
-                    self._undo_list.append(to_change(data))
-                for data in result[1]:
-                    self._redo_list.append(to_change(data))
+            self._journal.load(self._undo_list, self._redo_list)
+            self._remove_extra_items()
+
+    def _save_lists(self):
+        if self.save:
+            self._journal.save(self.undo_list, self.redo_list)
 
     def do(self, changes, task_handle=taskhandle.NullTaskHandle()):
         """Perform the change and add it to the `self.undo_list`
@@ -37,9 +48,10 @@ class History(object):
         finally:
             self.current_change = None
         if self._is_change_interesting(changes):
-            self.undo_list.append(changes)
+            self._push(self.undo_list, changes)
             self._remove_extra_items()
         del self.redo_list[:]
+        self._save_lists()
 
     def _remove_extra_items(self):
         if len(self.undo_list) > self.max_undos:
@@ -75,6 +87,7 @@ class History(object):
         result = self.redo_list[-len(dependencies):]
         if drop:
             del self.redo_list[-len(dependencies):]
+        self._save_lists()
         return result
 
     def redo(self, change=None, task_handle=taskhandle.NullTaskHandle()):
@@ -94,6 +107,7 @@ class History(object):
         dependencies = self._find_dependencies(self.redo_list, change)
         self._move_front(self.redo_list, dependencies)
         self._perform_redos(len(dependencies), task_handle)
+        self._save_lists()
         return self.undo_list[-len(dependencies):]
 
     def _move_front(self, change_list, changes):
@@ -114,7 +128,7 @@ class History(object):
                 self.current_change.undo(job_set)
             finally:
                 self.current_change = None
-            self.redo_list.append(self.undo_list.pop())
+            self._push(self.redo_list, self.undo_list.pop())
 
     def _perform_redos(self, count, task_handle):
         for i in range(count):
@@ -125,7 +139,13 @@ class History(object):
                 self.current_change.do(job_set)
             finally:
                 self.current_change = None
-            self.undo_list.append(self.redo_list.pop())
+            self._push(self.undo_list, self.redo_list.pop())
+
+    def _push(self, change_list, changes):
+        # only the last changes keep all of their information
+        if change_list:
+            change_list[-1].compact()
+        change_list.append(changes)
 
     def contents_before_current_change(self, file):
         if self.current_change is None:
@@ -151,13 +171,9 @@ class History(object):
 
     def write(self):
         if self.save:
-            data = []
-            to_data = change.ChangeToData()
             self._remove_extra_items()
-            data.append([to_data(change_) for change_ in self.undo_list])
-            data.append([to_data(change_) for change_ in self.redo_list])
-            self.project.data_files.write_data('history', data,
-                                               compress=self.compress)
+            self._save_lists()
+            self._journal.compact(self.undo_list, self.redo_list)
 
     def get_file_undo_list(self, resource):
         result = []
@@ -204,6 +220,7 @@ class History(object):
         """Forget all undo and redo information"""
         del self.undo_list[:]
         del self.redo_list[:]
+        self._save_lists()
 
 
 class _FindChangeDependencies(object):
@@ -233,3 +250,240 @@ class _FindChangeDependencies(object):
                 if changed.is_folder() and changed.contains(resource):
                     return True
         return False
+
+
+class _Journal(object):
+    """An append-only journal of history changes
+
+    The journal is a sequence of pickled records.  A ``'change'``
+    record holds the id of a change and, for `ChangeSet`\s, its
+    description, time and changed resources; it is followed by the
+    pickled data of the change (see `change.ChangeToData`), whose
+    length it records so that it can be skipped when loading.  A
+    ``'lists'`` record holds the ids of the changes in the undo and
+    redo lists.  The journal is rewritten when most of its records
+    are no longer needed.
+
+    """
+
+    def __init__(self, project, compress=False, name='history.journal'):
+        self.project = project
+        self.compress = compress
+        self.name = name
+        self.ids = {}
+        self.offsets = {}
+        self.next_id = 0
+        self.lists = None
+        self.records = 0
+        self.size = 0
+        # whether the journal on disk can be appended to
+        self.synced = False
+
+    def load(self, undo_list, redo_list):
+        input = self._open('rb')
+        if input is None:
+            self.synced = not self._load_old_history(undo_list, redo_list)
+            return
+        changes = {}
+        self.synced = True
+        try:
+            while True:
+                record = pickle.load(input)
+                if record[0] == 'change':
+                    id, meta, length = record[1:]
+                    offset = input.tell()
+                    changes[id] = self._create_change(id, meta, input)
+                    self.offsets[id] = (offset, length)
+                    self.next_id = max(self.next_id, id + 1)
+                    input.seek(offset + length)
+                else:
+                    self.lists = record[1:]
+                self.records += 1
+                self.size = input.tell()
+        except EOFError:
+            pass
+        except Exception:
+            # a partially written record; rewriting the journal
+            self.synced = False
+        finally:
+            input.close()
+        if self.lists is not None:
+            for id in self.lists[0]:
+                undo_list.append(changes[id])
+            for id in self.lists[1]:
+                redo_list.append(changes[id])
+            self.ids = dict((changes[id], id)
+                            for id in self.lists[0] + self.lists[1])
+
+    def _load_old_history(self, undo_list, redo_list):
+        result = self.project.data_files.read_data(
+            'history', compress=self.compress, import_=True)
+        if result is not None:
+            to_change = change.DataToChange(self.project)
+            for data in result[0]:
+                undo_list.append(to_change(data))
+            for data in result[1]:
+                redo_list.append(to_change(data))
+            return True
+        return False
+
+    def _create_change(self, id, meta, input):
+        if meta is None:
+            return change.DataToChange(self.project)(pickle.load(input))
+        return _JournaledChangeSet(self, id, *meta)
+
+    def save(self, undo_list, redo_list):
+        """Append the records needed for the new state of the lists"""
+        live = undo_list + redo_list
+        if not self.synced or self._needs_compaction(live):
+            self.compact(undo_list, redo_list)
+            return
+        new_changes = [change_ for change_ in live
+                       if change_ not in self.ids]
+        for change_ in new_changes:
+            self.ids[change_] = self.next_id
+            self.next_id += 1
+        lists = (self._get_ids(undo_list), self._get_ids(redo_list))
+        if lists == self.lists:
+            return
+        output = self._open('ab')
+        if output is None:
+            return
+        try:
+            for change_ in new_changes:
+                self._write_change(output, change_)
+            self._write_record(output, ('lists',) + lists)
+        finally:
+            output.close()
+        self.lists = lists
+        self.ids = dict((change_, self.ids[change_]) for change_ in live)
+
+    def compact(self, undo_list, redo_list):
+        """Rewrite the journal keeping only the changes in the lists"""
+        live = undo_list + redo_list
+        if self.synced and not self._needs_compaction(live):
+            return
+        bodies = [self._get_body(change_) for change_ in live]
+        ids = {}
+        for change_ in live:
+            if change_ not in self.ids:
+                self.ids[change_] = self.next_id
+                self.next_id += 1
+            ids[change_] = self.ids[change_]
+        output = self._open('wb', self.name + '.tmp')
+        if output is None:
+            return
+        self.ids = ids
+        self.offsets.clear()
+        self.records = 0
+        self.size = 0
+        try:
+            for change_, body in zip(live, bodies):
+                self._write_change(output, change_, body)
+            self.lists = (self._get_ids(undo_list), self._get_ids(redo_list))
+            self._write_record(output, ('lists',) + self.lists)
+        finally:
+            output.close()
+        data_files = self.project.data_files
+        data_files.move_data(self.name + '.tmp', self.name, self.compress)
+        data_files.remove_data('history', self.compress)
+        self.synced = True
+
+    def _needs_compaction(self, live):
+        return self.records > 2 * len(live) + 16
+
+    def read_change(self, id):
+        if id not in self.offsets:
+            raise exceptions.HistoryError(
+                'Change is no longer in the history journal')
+        offset, length = self.offsets[id]
+        input = self._open('rb')
+        try:
+            input.seek(offset)
+            return change.DataToChange(self.project)(pickle.load(input))
+        finally:
+            input.close()
+
+    def _get_body(self, change_):
+        if isinstance(change_, _JournaledChangeSet) and \
+           not change_.loaded and change_.id in self.offsets:
+            offset, length = self.offsets[change_.id]
+            input = self._open('rb')
+            try:
+                input.seek(offset)
+                return input.read(length)
+            finally:
+                input.close()
+        return pickle.dumps(change.ChangeToData()(change_), 2)
+
+    def _write_change(self, output, change_, body=None):
+        if body is None:
+            body = self._get_body(change_)
+        id = self.ids[change_]
+        if isinstance(change_, _JournaledChangeSet):
+            change_.id = id
+        self._write_record(output, ('change', id, _get_meta(change_),
+                                    len(body)))
+        self.offsets[id] = (self.size, len(body))
+        output.write(body)
+        self.size += len(body)
+
+    def _write_record(self, output, record):
+        data = pickle.dumps(record, 2)
+        output.write(data)
+        self.records += 1
+        self.size += len(data)
+
+    def _get_ids(self, change_list):
+        return [self.ids[change_] for change_ in change_list]
+
+    def _open(self, mode, name=None):
+        return self.project.data_files.open_data(
+            name or self.name, mode, compress=self.compress)
+
+
+def _get_meta(change_):
+    if isinstance(change_, change.ChangeSet):
+        resources = [(resource.path, resource.is_folder())
+                     for resource in change_.get_changed_resources()
+                     if resource is not None]
+        return (change_.description, change_.time, resources)
+
+
+class _JournaledChangeSet(change.ChangeSet):
+    """A `ChangeSet` whose changes are read from the journal when needed
+    """
+
+    def __init__(self, journal, id, description, time, resources):
+        self.journal = journal
+        self.id = id
+        self.description = description
+        self.time = time
+        self.resources = resources
+        self._changes = None
+
+    @property
+    def loaded(self):
+        return self._changes is not None
+
+    @property
+    def changes(self):
+        if self._changes is None:
+            self._changes = self.journal.read_change(self.id).changes
+        return self._changes
+
+    def compact(self):
+        if self._changes is not None:
+            super(_JournaledChangeSet, self).compact()
+
+    def get_changed_resources(self):
+        if self._changes is not None:
+            return super(_JournaledChangeSet, self).get_changed_resources()
+        project = self.journal.project
+        result = set()
+        for path, is_folder in self.resources:
+            if is_folder:
+                result.add(project.get_folder(path))
+            else:
+                result.add(project.get_file(path))
+        return result
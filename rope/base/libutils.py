@@ -3,7 +3,9 @@ import os.path
 
 import rope.base.project
 import rope.base.pycore
+from rope.base import parallel
 from rope.base import pyobjectsdef
+from rope.base import resourceobserver
 from rope.base import utils
 from rope.base import taskhandle
 
@@ -56,7 +58,9 @@ def report_change(project, path, old_content):
         return
     for observer in list(project.observers):
         observer.resource_changed(resource)
-    if project.pycore.automatic_soa:
+    if project.pycore.deferred_soa is not None:
+        project.pycore.deferred_soa.add(resource, old_content)
+    elif project.pycore.automatic_soa:
         rope.base.pycore.perform_soa_on_changed_scopes(project, resource,
                                                        old_content)
 
@@ -69,17 +73,124 @@ def analyze_module(project, resource):
     project.pycore.analyze_module(resource)
 
 
-def analyze_modules(project, task_handle=taskhandle.NullTaskHandle()):
+def analyze_modules(project, task_handle=taskhandle.NullTaskHandle(),
+                    processes=None, resume=False):
     """Perform static object analysis on all python files in the project
 
     Note that this might be really time consuming.
+
+    `processes` overrides ``search_processes`` project config; with
+    more than one process, the modules are analyzed in worker
+    processes and the information they collect is added to the
+    objectdb of `project`.  Workers start with the objectdb saved on
+    disk, so they do not see the information collected by each other.
+
+    When ``save_objectdb`` project config is set, the objectdb and the
+    list of analyzed modules are saved as the analysis goes on.  If
+    `resume` is `True`, the modules that were analyzed by a previous
+    (interrupted) call and have not changed since are skipped.
+
     """
+    progress = _AnalysisProgress(project)
     resources = project.get_python_files()
+    if resume:
+        resources = [resource for resource in resources
+                     if not progress.is_analyzed(resource)]
+    else:
+        progress.clear()
     job_set = task_handle.create_jobset('Analyzing Modules', len(resources))
-    for resource in resources:
-        job_set.started_job(resource.path)
+    processes = parallel.get_processes(project, processes)
+    try:
+        if processes > 1 and len(resources) > 1:
+            objectdb = project.pycore.object_info.objectdb
+            for resource, data in parallel.map_resources(
+                    project, resources, _create_analysis_task, (),
+                    processes, job_set):
+                for kind, args in data:
+                    if kind == 'callinfo':
+                        objectdb.add_callinfo(*args)
+                    else:
+                        objectdb.add_pername(*args)
+                progress.analyzed(resource)
+            project.pycore.forget_changed_data()
+        else:
+            for resource in resources:
+                job_set.started_job(resource.path)
+                analyze_module(project, resource)
+                progress.analyzed(resource)
+                job_set.finished_job()
+    finally:
+        progress.save()
+
+
+def _create_analysis_task(project):
+    recorder = _DataRecorder()
+    project.pycore.object_info.objectdb.add_data_observer(recorder)
+
+    def analyze(resource):
+        recorder.data = []
         analyze_module(project, resource)
-        job_set.finished_job()
+        return recorder.data
+    return analyze
+
+
+class _DataRecorder(object):
+
+    def __init__(self):
+        self.data = []
+
+    def callinfo_added(self, path, key, args, returned):
+        self.data.append(('callinfo', (path, key, args, returned)))
+
+    def pername_added(self, path, key, name, value):
+        self.data.append(('pername', (path, key, name, value)))
+
+
+class _AnalysisProgress(object):
+    """The modules analyzed by `analyze_modules()`
+
+    They are saved with the objectdb, so the saved list never has
+    modules whose information is not saved.  Writing a pickled
+    objectdb rewrites all of it; to keep the total cost linear, they
+    are saved after `interval` modules and then each time the number
+    of analyzed modules doubles.
+    """
+
+    def __init__(self, project, interval=100):
+        self.project = project
+        self.enabled = project.prefs.get('save_objectdb', False)
+        self.timekeeper = resourceobserver.ChangeIndicator()
+        self.modules = {}
+        self.unsaved = 0
+        self.count = 0
+        self.next_save = interval
+        if self.enabled:
+            self.modules = project.data_files.read_data('soa_progress') or {}
+
+    def is_analyzed(self, resource):
+        try:
+            indicator = self.timekeeper.get_indicator(resource)
+        except OSError:
+            return False
+        return self.modules.get(resource.path) == indicator
+
+    def analyzed(self, resource):
+        self.modules[resource.path] = self.timekeeper.get_indicator(resource)
+        self.unsaved += 1
+        self.count += 1
+        if self.count >= self.next_save:
+            self.save()
+            self.next_save = 2 * self.count
+
+    def clear(self):
+        self.modules.clear()
+        self.unsaved = 1
+
+    def save(self):
+        if self.enabled and self.unsaved:
+            self.project.pycore.object_info.objectdb.write()
+            self.project.data_files.write_data('soa_progress', self.modules)
+            self.unsaved = 0
 
 
 def get_string_module(project, code, resource=None, force_errors=False):
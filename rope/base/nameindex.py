@@ -0,0 +1,188 @@
+"""A persistent index of the identifiers used in project files
+
+`NameIndex` maps each identifier to the python files containing it.
+`rope.refactor.occurrences.Finder`
+consults it to skip files that cannot contain the name it searches
+for, without reading them.  It is enabled using the ``use_name_index``
+project config and is saved in the project's rope folder.
+
+The index is updated through resource observers.  The entries of the
+files whose modification time or size have changed while the project
+was closed are dropped when the index is loaded.  Changes made by
+other processes afterwards are detected by `Project.validate()` or,
+when the ``validate_name_index`` config is set, by checking each file
+before trusting its entry.
+
+"""
+import re
+
+from rope.base import exceptions, resourceobserver, taskhandle
+
+
+class NameIndex(object):
+    """Maps identifiers to the project files that contain them"""
+
+    def __init__(self, project, validate=None):
+        self.project = project
+        if validate is None:
+            validate = project.prefs.get('validate_name_index', False)
+        self.validate_entries = validate
+        self.timekeeper = resourceobserver.ChangeIndicator()
+        self.files = {}
+        self.names = {}
+        self._modified = False
+        self._load_files()
+        observer = resourceobserver.ResourceObserver(
+            changed=self._resource_changed, moved=self._resource_moved,
+            created=self._resource_changed, removed=self._resource_moved,
+            validate=self.validate)
+        self.project.add_observer(observer)
+        self.project.data_files.add_write_hook(self.write)
+
+    def may_contain(self, resource, name):
+        """Return `False` if `name` surely does not occur in `resource`
+
+        Only the files that are tracked by the index can be ruled
+        out; for the others `True` is returned.
+
+        """
+        if not _is_identifier(name) or not self._is_indexable(resource):
+            return True
+        entry = self._get_entry(resource)
+        if entry is None:
+            return True
+        return name in entry[1]
+
+    def filter_resources(self, name, resources):
+        """Return the members of `resources` that may contain `name`"""
+        return [resource for resource in resources
+                if self.may_contain(resource, name)]
+
+    def get_resources(self, name):
+        """Return the indexed files that contain `name`"""
+        return [self.project.get_file(path)
+                for path in sorted(self.names.get(name, ()))]
+
+    def rebuild(self, task_handle=taskhandle.NullTaskHandle()):
+        """Forget the index and build it again for all python files"""
+        self.files.clear()
+        self.names.clear()
+        self._modified = True
+        resources = self.project.get_python_files()
+        job_set = task_handle.create_jobset('Indexing names', len(resources))
+        for resource in resources:
+            job_set.started_job(resource.path)
+            self._index_file(resource)
+            job_set.finished_job()
+
+    def validate(self, folder):
+        """Update the entries of the files in `folder`
+
+        Removed files are forgotten and the files whose modification
+        time or size have changed are indexed again.
+
+        """
+        for path in list(self.files):
+            resource = self.project.get_file(path)
+            if resource != folder and not folder.contains(resource):
+                continue
+            if not resource.exists():
+                self._remove_file(path)
+            elif self._is_stale(resource, self.files[path]):
+                self._index_file(resource)
+
+    def write(self):
+        if self._modified:
+            self.project.data_files.write_data('nameindex', self.files)
+            self._modified = False
+
+    def _load_files(self):
+        result = self.project.data_files.read_data('nameindex')
+        if result is None:
+            return
+        for path, entry in result.items():
+            resource = self.project.get_file(path)
+            if resource.exists() and not self._is_stale(resource, entry):
+                self.files[path] = entry
+                self._add_names(path, entry[1])
+        self._modified = len(self.files) != len(result)
+
+    def _get_entry(self, resource):
+        entry = self.files.get(resource.path)
+        if entry is None or \
+           self.validate_entries and self._is_stale(resource, entry):
+            entry = self._index_file(resource)
+        return entry
+
+    def _index_file(self, resource):
+        self._remove_file(resource.path)
+        try:
+            indicator = self.timekeeper.get_indicator(resource)
+            source = resource.read()
+        except (IOError, OSError, exceptions.ModuleDecodeError):
+            return None
+        names = set(word for word in _identifier_pattern.findall(source)
+                    if not word[0].isdigit())
+        self.files[resource.path] = (indicator, names)
+        self._add_names(resource.path, names)
+        self._modified = True
+        return self.files[resource.path]
+
+    def _add_names(self, path, names):
+        for name in names:
+            self.names.setdefault(name, set()).add(path)
+
+    def _remove_file(self, path):
+        if path not in self.files:
+            return
+        for name in self.files.pop(path)[1]:
+            paths = self.names[name]
+            paths.discard(path)
+            if not paths:
+                del self.names[name]
+        self._modified = True
+
+    def _is_stale(self, resource, entry):
+        try:
+            return entry[0] != self.timekeeper.get_indicator(resource)
+        except OSError:
+            return True
+
+    def _is_indexable(self, resource):
+        return resource.project == self.project and \
+            self.project.pycore.is_python_file(resource)
+
+    def _resource_changed(self, resource):
+        if self._is_indexable(resource):
+            self._index_file(resource)
+
+    def _resource_moved(self, resource, new_resource=None):
+        if resource.is_folder():
+            for path in list(self.files):
+                if resource.contains(self.project.get_file(path)):
+                    self._move_file(
+                        path, new_resource, path[len(resource.path):])
+        else:
+            self._remove_file(resource.path)
+            if new_resource is not None and self._is_indexable(new_resource):
+                self._index_file(new_resource)
+
+    def _move_file(self, path, new_folder, suffix):
+        entry = self.files.get(path)
+        self._remove_file(path)
+        if new_folder is not None and entry is not None:
+            new_path = (new_folder.path + suffix).lstrip('/')
+            self.files[new_path] = entry
+            self._add_names(new_path, entry[1])
+
+    def __str__(self):
+        return 'NameIndex holds %d files and %d names' % \
+               (len(self.files), len(self.names))
+
+
+_identifier_pattern = re.compile(r'\w+', re.UNICODE)
+
+
+def _is_identifier(name):
+    match = _identifier_pattern.match(name)
+    return match is not None and match.end() == len(name)
@@ -40,10 +40,11 @@ class PythonFileRunner(object):
     """A class for running python project files"""
 
     def __init__(self, pycore, file_, args=None, stdin=None,
-                 stdout=None, analyze_data=None):
+                 stdout=None, analyze_data=None, analyze_batch=None):
         self.pycore = pycore
         self.file = file_
         self.analyze_data = analyze_data
+        self.analyze_batch = analyze_batch
         self.observers = []
         self.args = args
         self.stdin = stdin
@@ -64,9 +65,10 @@ class PythonFileRunner(object):
         if self.receiver:
             send_info = self.receiver.get_send_info()
         args = [sys.executable, runmod_path, send_info,
-                self.pycore.project.address, self.file.real_path]
+                self.pycore.project.address, self._get_options(),
+                self.file.real_path]
         if self.analyze_data is None:
-            del args[1:4]
+            del args[1:5]
         if self.args is not None:
             args.extend(self.args)
         self.process = subprocess.Popen(
@@ -74,6 +76,14 @@ class PythonFileRunner(object):
             cwd=os.path.split(file_path)[0], stdin=self.stdin,
             stdout=self.stdout, stderr=self.stdout, close_fds=os.name != 'nt')
 
+    def _get_options(self):
+        prefs = self.pycore.project.prefs
+        return 'tracer=%s,max_calls=%d,sample_rate=%r,max_signatures=%d' % (
+            prefs.get('doa_tracer', 'profile'),
+            prefs.get('doa_max_calls', 0),
+            float(prefs.get('doa_sample_rate', 1)),
+            prefs.get('doa_max_signatures', 0))
+
     def _init_data_receiving(self):
         if self.analyze_data is None:
             return
@@ -90,14 +100,31 @@ class PythonFileRunner(object):
         self.receiving_thread.start()
 
     def _receive_information(self):
-        #temp = open('/dev/shm/info', 'wb')
-        for data in self.receiver.receive_data():
-            self.analyze_data(data)
-            #temp.write(str(data) + '\n')
-        #temp.close()
+        for batch in self.receiver.receive_batches():
+            if self.analyze_batch is not None:
+                self.analyze_batch(batch)
+            else:
+                for data in batch:
+                    self.analyze_data(data)
         for observer in self.observers:
             observer()
 
+    def get_stats(self):
+        """Return a `dict` describing the data received from the process
+
+        ``sent`` is the number of data sent, ``deduplicated`` is the
+        number of data not sent because they were sent before and
+        ``frames`` is the number of batches the data were sent in.
+        ``skipped`` is the number of calls not recorded because of
+        the sampling configs (``doa_max_calls``, ``doa_sample_rate``
+        and ``doa_max_signatures``).
+        They are available only after the process finishes.
+
+        """
+        if self.receiver is None:
+            return {}
+        return dict(self.receiver.stats)
+
     def wait_process(self):
         """Wait for the process to finish"""
         self.process.wait()
@@ -127,7 +154,25 @@ class PythonFileRunner(object):
 
 class _MessageReceiver(object):
 
+    def __init__(self):
+        self.stats = {}
+
     def receive_data(self):
+        for batch in self.receive_batches():
+            for data in batch:
+                yield data
+
+    def receive_batches(self):
+        """Yield the lists of data sent by `runmod`"""
+        for message in self._receive_messages():
+            if isinstance(message, list):
+                yield message
+            elif isinstance(message, dict):
+                self.stats.update(message)
+            else:
+                yield [message]
+
+    def _receive_messages(self):
         pass
 
     def get_send_info(self):
@@ -137,6 +182,7 @@ class _MessageReceiver(object):
 class _SocketReceiver(_MessageReceiver):
 
     def __init__(self):
+        super(_SocketReceiver, self).__init__()
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.data_port = 3037
         self.key = os.urandom(32)
@@ -153,7 +199,7 @@ class _SocketReceiver(_MessageReceiver):
         return '%d:%s' % (self.data_port,
                           base64.b64encode(self.key).decode('utf-8'))
 
-    def receive_data(self):
+    def _receive_messages(self):
         conn, addr = self.server_socket.accept()
         self.server_socket.close()
         my_file = conn.makefile('rb')
@@ -197,6 +243,7 @@ class _SocketReceiver(_MessageReceiver):
 class _FIFOReceiver(_MessageReceiver):
 
     def __init__(self):
+        super(_FIFOReceiver, self).__init__()
         # XXX: this is insecure and might cause race conditions
         self.file_name = self._get_file_name()
         os.mkfifo(self.file_name)
@@ -211,7 +258,7 @@ class _FIFOReceiver(_MessageReceiver):
     def get_send_info(self):
         return self.file_name
 
-    def receive_data(self):
+    def _receive_messages(self):
         my_file = open(self.file_name, 'rb')
         while True:
             try:
@@ -1,4 +1,7 @@
 from __future__ import print_function
+import collections
+import os
+import threading
 try:
     from collections import MutableMapping
 except ImportError:
@@ -11,22 +14,65 @@ class ObjectDB(object):
         self.db = db
         self.validation = validation
         self.observers = []
+        self.data_observers = []
         self.files = db.files
+        self.pruned_files = 0
+        self.pruned_scopes = 0
+        self._unvalidated = set()
+        # invalid files found by `validate_in_background()`
+        self._invalid = collections.deque()
 
     def validate_files(self):
         for file in list(self.files):
             if not self.validation.is_file_valid(file):
-                del self.files[file]
-                self._file_removed(file)
+                self._remove_file(file)
+        self._unvalidated.clear()
 
     def validate_file(self, file):
+        self._unvalidated.discard(file)
         if file not in self.files:
             return
         for key in list(self.files[file]):
             if not self.validation.is_scope_valid(file, key):
                 del self.files[file][key]
+                self.pruned_scopes += 1
+
+    def validate_lazily(self):
+        """Validate the information of each file when it is first read
+
+        Unlike `validate_files()`, nothing is checked now; the first
+        time the information of a file is asked for, the file and its
+        scopes are validated (see `validate_file()`) and the file list
+        observers are informed using their `validated()` method.
+
+        """
+        self._unvalidated = set(self.files)
+
+    def validate_in_background(self):
+        """Look for the files that no longer exist in a new thread
+
+        Only the files that are not validated yet are checked.  Their
+        addresses are computed here and the new thread only checks
+        whether they exist, without using the project; the invalid
+        files it finds are removed the next time the objectdb is used.
+        The thread is returned.
+
+        """
+        real_paths = [(path, self.validation.get_real_path(path))
+                      for path in self._unvalidated]
+        thread = threading.Thread(target=self._find_invalid_files,
+                                  args=(real_paths,))
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def get_unvalidated_files(self):
+        return list(self._unvalidated)
 
     def file_moved(self, file, newfile):
+        if file in self._unvalidated:
+            self._unvalidated.remove(file)
+            self._unvalidated.add(newfile)
         if file not in self.files:
             return
         self.files.rename(file, newfile)
@@ -37,18 +83,21 @@ class ObjectDB(object):
         return self.files.keys()
 
     def get_returned(self, path, key, args):
+        self._validate_lazily(path)
         scope_info = self._get_scope_info(path, key, readonly=True)
         result = scope_info.get_returned(args)
         if self.validation.is_value_valid(result):
             return result
 
     def get_pername(self, path, key, name):
+        self._validate_lazily(path)
         scope_info = self._get_scope_info(path, key, readonly=True)
         result = scope_info.get_per_name(name)
         if self.validation.is_value_valid(result):
             return result
 
     def get_callinfos(self, path, key):
+        self._validate_lazily(path)
         scope_info = self._get_scope_info(path, key, readonly=True)
         return scope_info.get_call_infos()
 
@@ -57,19 +106,80 @@ class ObjectDB(object):
         old_returned = scope_info.get_returned(args)
         if self.validation.is_more_valid(returned, old_returned):
             scope_info.add_call(args, returned)
+            if returned != old_returned:
+                for observer in self.data_observers:
+                    observer.callinfo_added(path, key, args, returned)
 
     def add_pername(self, path, key, name, value):
         scope_info = self._get_scope_info(path, key, readonly=False)
         old_value = scope_info.get_per_name(name)
         if self.validation.is_more_valid(value, old_value):
             scope_info.save_per_name(name, value)
+            if value != old_value:
+                for observer in self.data_observers:
+                    observer.pername_added(path, key, name, value)
 
     def add_file_list_observer(self, observer):
         self.observers.append(observer)
 
+    def add_data_observer(self, observer):
+        """Inform `observer` of the information added to the objectdb
+
+        Its `callinfo_added()` and `pername_added()` methods are
+        called with the arguments of `add_callinfo()` and
+        `add_pername()` when they change the information saved.
+
+        """
+        self.data_observers.append(observer)
+
     def write(self):
+        self._remove_invalid_files()
         self.db.write()
 
+    def get_stats(self):
+        """Return a `dict` describing the validation of the objectdb
+
+        ``pruned_files`` and ``pruned_scopes`` are the number of
+        files and scopes removed because they were invalid and
+        ``unvalidated`` is the number of files not validated yet.
+
+        """
+        return {'files': len(self.files),
+                'unvalidated': len(self._unvalidated),
+                'pruned_files': self.pruned_files,
+                'pruned_scopes': self.pruned_scopes}
+
+    def _validate_lazily(self, path):
+        self._remove_invalid_files()
+        if path in self._unvalidated:
+            if self.validation.is_file_valid(path):
+                self.validate_file(path)
+                for observer in self.observers:
+                    observer.validated(path)
+            else:
+                self._remove_file(path)
+
+    def _find_invalid_files(self, real_paths):
+        for path, real_path in real_paths:
+            if real_path is None or not os.path.exists(real_path):
+                self._invalid.append(path)
+
+    def _remove_invalid_files(self):
+        while self._invalid:
+            path = self._invalid.popleft()
+            # the file might have been created since it was checked
+            if path in self._unvalidated and \
+               not self.validation.is_file_valid(path):
+                self._remove_file(path)
+
+    def _remove_file(self, path):
+        self._unvalidated.discard(path)
+        if path in self.files:
+            self.pruned_scopes += len(self.files[path])
+            self.pruned_files += 1
+            del self.files[path]
+            self._file_removed(path)
+
     def _get_scope_info(self, path, key, readonly=True):
         if path not in self.files:
             if readonly:
@@ -177,3 +287,6 @@ class FileListObserver(object):
 
     def removed(self, path):
         pass
+
+    def validated(self, path):
+        pass
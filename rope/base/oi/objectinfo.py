@@ -1,7 +1,7 @@
 import warnings
 
 from rope.base import exceptions, resourceobserver
-from rope.base.oi import objectdb, memorydb, transform
+from rope.base.oi import objectdb, memorydb, sqlitedb, transform
 
 
 class ObjectInfoManager(object):
@@ -18,6 +18,8 @@ class ObjectInfoManager(object):
         self.to_pyobject = transform.TextualToPyObject(project)
         self.doi_to_pyobject = transform.DOITextualToPyObject(project)
         self._init_objectdb()
+        self.changes = _ChangeRecorder()
+        self.objectdb.add_data_observer(self.changes)
         if project.prefs.get('validate_objectdb', False):
             self._init_validation()
 
@@ -33,23 +35,30 @@ class ObjectInfoManager(object):
             if dbtype != 'memory' and self.project.ropefolder is not None:
                 persist = True
         self.validation = TextualValidation(self.to_pyobject)
-        db = memorydb.MemoryDB(self.project, persist=persist)
+        saved = persist
+        if saved is None:
+            saved = self.project.prefs.get('save_objectdb', False)
+        backend = self.project.prefs.get('objectdb_backend', 'pickle')
+        if backend == 'sqlite' and saved and \
+           self.project.ropefolder is not None:
+            db = sqlitedb.SQLiteDB(self.project)
+        else:
+            db = memorydb.MemoryDB(self.project, persist=persist)
         self.objectdb = objectdb.ObjectDB(db, self.validation)
 
     def _init_validation(self):
-        self.objectdb.validate_files()
+        self.objectdb.validate_lazily()
         observer = resourceobserver.ResourceObserver(
             changed=self._resource_changed, moved=self._resource_moved,
             removed=self._resource_moved)
-        files = []
-        for path in self.objectdb.get_files():
-            resource = self.to_pyobject.path_to_resource(path)
-            if resource is not None and resource.project == self.project:
-                files.append(resource)
-        self.observer = resourceobserver.FilteredResourceObserver(observer,
-                                                                  files)
+        self.observer = resourceobserver.FilteredResourceObserver(observer)
         self.objectdb.add_file_list_observer(_FileListObserver(self))
         self.project.add_observer(self.observer)
+        self.unvalidated_observer = resourceobserver.ResourceObserver(
+            moved=self._unvalidated_moved)
+        self.project.add_observer(self.unvalidated_observer)
+        if self.project.prefs.get('validate_objectdb_in_background', False):
+            self.objectdb.validate_in_background()
 
     def _resource_changed(self, resource):
         try:
@@ -66,6 +75,13 @@ class ObjectInfoManager(object):
             self.objectdb.file_moved(old, new)
             self.observer.add_resource(new_resource)
 
+    def _unvalidated_moved(self, resource, new_resource):
+        old = self.to_textual.resource_to_path(resource)
+        new = self.to_textual.resource_to_path(new_resource)
+        for path in self.objectdb.get_unvalidated_files():
+            if path == old or path.startswith(old + '/'):
+                self.objectdb.file_moved(path, new + path[len(old):])
+
     def get_returned(self, pyobject, args):
         result = self.get_exact_returned(pyobject, args)
         if result is not None:
@@ -81,6 +97,7 @@ class ObjectInfoManager(object):
             if result is None:
                 result = returned
         if result is not None:
+            self._add_dependencies(pyobject, result)
             return self.to_pyobject(result)
 
     def get_exact_returned(self, pyobject, args):
@@ -89,6 +106,7 @@ class ObjectInfoManager(object):
             returned = self.objectdb.get_returned(
                 path, key, self._args_to_textual(pyobject, args))
             if returned is not None:
+                self._add_dependencies(pyobject, returned)
                 return self.to_pyobject(returned)
 
     def _args_to_textual(self, pyfunction, args):
@@ -116,6 +134,7 @@ class ObjectInfoManager(object):
             if unknowns == 0:
                 break
         if unknowns < arg_count:
+            self._add_dependencies(pyobject, parameters)
             return [self.to_pyobject(parameter)
                     for parameter in parameters]
 
@@ -127,20 +146,33 @@ class ObjectInfoManager(object):
         for call_info in self.objectdb.get_callinfos(path, key):
             args = call_info.get_parameters()
             if len(args) > parameter_index:
+                self._add_dependencies(pyfunction, args[parameter_index])
                 parameter = self.to_pyobject(args[parameter_index])
                 if parameter is not None:
                     result.append(parameter)
         return result
 
     def doa_data_received(self, data):
+        self.doa_batch_received([data])
+
+    def doa_batch_received(self, batch):
+        """Save a list of data received from DOA
+
+        Each object is transformed only once for the whole batch.
+        """
+        transformed = {}
+
         def doi_to_normal(textual):
-            pyobject = self.doi_to_pyobject(textual)
-            return self.to_textual(pyobject)
-        function = doi_to_normal(data[0])
-        args = tuple([doi_to_normal(textual) for textual in data[1]])
-        returned = doi_to_normal(data[2])
-        if function[0] == 'defined' and len(function) == 3:
-            self._save_data(function, args, returned)
+            if textual not in transformed:
+                pyobject = self.doi_to_pyobject(textual)
+                transformed[textual] = self.to_textual(pyobject)
+            return transformed[textual]
+        for data in batch:
+            function = doi_to_normal(data[0])
+            args = tuple([doi_to_normal(textual) for textual in data[1]])
+            returned = doi_to_normal(data[2])
+            if function[0] == 'defined' and len(function) == 3:
+                self._save_data(function, args, returned)
 
     def function_called(self, pyfunction, params, returned=None):
         function_text = self.to_textual(pyfunction)
@@ -161,6 +193,7 @@ class ObjectInfoManager(object):
         if path is not None:
             result = self.objectdb.get_pername(path, key, name)
             if result is not None:
+                self._add_dependencies(scope.pyobject, result)
                 return self.to_pyobject(result)
 
     def _save_data(self, function, args, returned=('unknown',)):
@@ -180,6 +213,29 @@ class ObjectInfoManager(object):
             return path, key
         return None, None
 
+    def _add_dependencies(self, pyobject, textual):
+        """Make the module of `pyobject` depend on modules in `textual`"""
+        pymodule = pyobject.get_module()
+        module_cache = self.project.pycore.module_cache
+        for path in _get_defined_paths(textual):
+            resource = self.to_pyobject.path_to_resource(path)
+            if resource is not None:
+                module_cache.add_dependency(pymodule, resource)
+
+    def pop_changed_resources(self):
+        """Return the modules whose information has changed
+
+        The modules are forgotten; the next call returns the modules
+        changed after this one.
+        """
+        paths = self.changes.pop_paths()
+        result = set()
+        for path in paths:
+            resource = self.to_pyobject.path_to_resource(path)
+            if resource is not None:
+                result.add(resource)
+        return result
+
     def sync(self):
         self.objectdb.sync()
 
@@ -206,6 +262,13 @@ class TextualValidation(object):
     def is_file_valid(self, path):
         return self.to_pyobject.path_to_resource(path) is not None
 
+    def get_real_path(self, path):
+        """Return the address whose existence makes `path` valid
+
+        `None` is returned if `path` is never valid.
+        """
+        return self.to_pyobject.path_to_real_path(path)
+
     def is_scope_valid(self, path, key):
         if key == '':
             textual = ('defined', path)
@@ -214,6 +277,34 @@ class TextualValidation(object):
         return self.to_pyobject(textual) is not None
 
 
+class _ChangeRecorder(object):
+    """Records the files whose object information has changed"""
+
+    def __init__(self):
+        self.paths = set()
+
+    def callinfo_added(self, path, key, args, returned):
+        self.paths.add(path)
+
+    def pername_added(self, path, key, name, value):
+        self.paths.add(path)
+
+    def pop_paths(self):
+        # DOA data are saved in another thread
+        paths, self.paths = self.paths, set()
+        return paths
+
+
+def _get_defined_paths(textual):
+    if isinstance(textual, (tuple, list)):
+        if len(textual) > 1 and textual[0] == 'defined':
+            yield textual[1]
+        else:
+            for child in textual:
+                for path in _get_defined_paths(child):
+                    yield path
+
+
 class _FileListObserver(object):
 
     def __init__(self, object_info):
@@ -230,3 +321,6 @@ class _FileListObserver(object):
         resource = self.to_pyobject.path_to_resource(path)
         if resource is not None:
             self.observer.add_resource(resource)
+
+    def validated(self, path):
+        self.added(path)
@@ -9,7 +9,9 @@ def __rope_start_everything():
     import marshal
     import inspect
     import types
+    import random
     import threading
+    import time
     import rope.base.utils.pycompat as pycompat
     import base64
     import hashlib
@@ -50,6 +52,57 @@ def __rope_start_everything():
         def close(self):
             self.my_file.close()
 
+    class _BatchingSender(_MessageSender):
+        """Sends lists of data to another sender
+
+        The same data is sent only once.  A list is sent when it has
+        `size` items, when data is sent `interval` seconds after the
+        last list, and when closing.  When closing, a `dict` with the
+        number of data sent and deduplicated is sent, too.
+
+        """
+
+        def __init__(self, sender, size=1000, interval=0.1):
+            self.sender = sender
+            self.size = size
+            self.interval = interval
+            self.pending = []
+            self.seen = set()
+            self.lock = threading.RLock()
+            self.last_flush = time.time()
+            self.stats = {'sent': 0, 'deduplicated': 0, 'frames': 0}
+
+        def get_distinct(self):
+            return len(self.seen)
+
+        def send_data(self, data):
+            with self.lock:
+                try:
+                    if data in self.seen:
+                        self.stats['deduplicated'] += 1
+                        return
+                    self.seen.add(data)
+                except TypeError:
+                    pass
+                self.pending.append(data)
+                if len(self.pending) >= self.size or \
+                   time.time() - self.last_flush >= self.interval:
+                    self._flush()
+
+        def _flush(self):
+            if self.pending:
+                self.sender.send_data(self.pending)
+                self.stats['sent'] += len(self.pending)
+                self.stats['frames'] += 1
+                self.pending = []
+            self.last_flush = time.time()
+
+        def close(self):
+            with self.lock:
+                self._flush()
+                self.sender.send_data(dict(self.stats))
+                self.sender.close()
+
     def _cached(func):
         cache = {}
 
@@ -63,24 +116,95 @@ def __rope_start_everything():
 
     class _FunctionCallDataSender(object):
 
-        def __init__(self, send_info, project_root):
+        def __init__(self, send_info, project_root, tracer='trace',
+                     max_calls=0, sample_rate=1.0, max_signatures=0):
             self.project_root = project_root
+            self.tracer = tracer
+            self.max_calls = max_calls
+            self.sample_rate = sample_rate
+            self.max_signatures = max_signatures
+            self.calls = {}
+            self.skipped = 0
+            self.stopped = False
+            self.random = random.Random()
             if send_info[0].isdigit():
                 port, key = send_info.split(':', 1)
-                self.sender = _SocketSender(int(port), key)
+                sender = _SocketSender(int(port), key)
+            else:
+                sender = _FileSender(send_info)
+            self.sender = _BatchingSender(sender)
+
+            if tracer == 'profile' and hasattr(sys, 'monitoring'):
+                self.tracer = 'monitoring'
+                self._start_monitoring()
+            elif tracer == 'profile':
+                sys.setprofile(self.on_profile_event)
+                threading.setprofile(self.on_profile_event)
             else:
-                self.sender = _FileSender(send_info)
+                def global_trace(frame, event, arg):
+                    # HACK: Ignoring out->in calls
+                    # This might lose some information
+                    if not self._is_exhausted(frame.f_code) and \
+                       self._is_an_interesting_call(frame):
+                        return self.on_function_call
+                sys.settrace(global_trace)
+                threading.settrace(global_trace)
+
+        def on_profile_event(self, frame, event, arg):
+            # unlike the trace function, it is called only for calls
+            # and returns; not for every line
+            if self.stopped:
+                sys.setprofile(None)
+            elif event == 'return' and self._is_an_interesting_call(frame):
+                self.on_function_call(frame, event, arg)
+
+        def _start_monitoring(self):
+            monitoring = sys.monitoring
+            self.tool_id = monitoring.PROFILER_ID
+            monitoring.use_tool_id(self.tool_id, 'rope')
 
-            def global_trace(frame, event, arg):
-                # HACK: Ignoring out->in calls
-                # This might lose some information
+            def on_return(code, offset, retval):
+                frame = sys._getframe(1)
                 if self._is_an_interesting_call(frame):
-                    return self.on_function_call
-            sys.settrace(global_trace)
-            threading.settrace(global_trace)
+                    self.on_function_call(frame, 'return', retval)
+                if self._is_exhausted(code):
+                    return monitoring.DISABLE
+            # like the profile function, generators report their yields
+            events = monitoring.events.PY_RETURN | monitoring.events.PY_YIELD
+            monitoring.register_callback(
+                self.tool_id, monitoring.events.PY_RETURN, on_return)
+            monitoring.register_callback(
+                self.tool_id, monitoring.events.PY_YIELD, on_return)
+            monitoring.set_events(self.tool_id, events)
+
+        def _is_exhausted(self, code):
+            """Whether the calls of `code` should no longer be followed"""
+            return self.max_calls > 0 and \
+                self.calls.get(code, 0) >= self.max_calls
+
+        def _is_sampled(self, code):
+            if self.stopped or self._is_exhausted(code) or \
+               self.sample_rate < 1 and \
+               self.random.random() >= self.sample_rate:
+                self.skipped += 1
+                return False
+            if self.max_calls > 0:
+                self.calls[code] = self.calls.get(code, 0) + 1
+            return True
+
+        def _stop_tracing(self):
+            self.stopped = True
+            if self.tracer == 'monitoring':
+                sys.monitoring.set_events(self.tool_id, 0)
+            elif self.tracer == 'profile':
+                sys.setprofile(None)
+                threading.setprofile(None)
+            else:
+                sys.settrace(None)
+                threading.settrace(None)
 
         def on_function_call(self, frame, event, arg):
-            if event != 'return':
+            if event != 'return' or not self._is_sampled(frame.f_code):
                 return
             args = []
             returned = ('unknown',)
@@ -102,6 +226,9 @@ def __rope_start_everything():
                 self.sender.send_data(data)
             except (TypeError):
                 pass
+            if self.max_signatures > 0 and \
+               self.sender.get_distinct() >= self.max_signatures:
+                self._stop_tracing()
             return self.on_function_call
 
         def _is_an_interesting_call(self, frame):
@@ -115,6 +242,7 @@ def __rope_start_everything():
                 return False
             return True
 
+        @_cached
         def _is_code_inside_project(self, code):
             source = self._path(code.co_filename)
             return source is not None and os.path.exists(source) and \
@@ -204,26 +332,37 @@ def __rope_start_everything():
                 return path
 
         def close(self):
+            self._stop_tracing()
+            if self.tracer == 'monitoring':
+                sys.monitoring.free_tool_id(self.tool_id)
+            self.sender.stats['skipped'] = self.skipped
             self.sender.close()
-            sys.settrace(None)
 
     def _realpath(path):
         return os.path.realpath(os.path.abspath(os.path.expanduser(path)))
 
     send_info = sys.argv[1]
     project_root = sys.argv[2]
-    file_to_run = sys.argv[3]
+    options = dict(option.split('=', 1)
+                   for option in sys.argv[3].split(',') if option)
+    file_to_run = sys.argv[4]
     run_globals = globals()
     run_globals.update({'__name__': '__main__',
                         '__builtins__': __builtins__,
                         '__file__': file_to_run})
 
     if send_info != '-':
-        data_sender = _FunctionCallDataSender(send_info, project_root)
-    del sys.argv[1:4]
-    pycompat.execfile(file_to_run, run_globals)
-    if send_info != '-':
-        data_sender.close()
+        data_sender = _FunctionCallDataSender(
+            send_info, project_root, options.get('tracer', 'trace'),
+            int(options.get('max_calls', 0)),
+            float(options.get('sample_rate', 1)),
+            int(options.get('max_signatures', 0)))
+    del sys.argv[1:5]
+    try:
+        pycompat.execfile(file_to_run, run_globals)
+    finally:
+        if send_info != '-':
+            data_sender.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,244 @@
+"""An objectdb backend using sqlite
+
+Unlike `rope.base.oi.memorydb.MemoryDB`, which loads and saves the
+whole objectdb at once, `SQLiteDB` loads the information of each file
+when it is first used and, when the project is saved, writes only the
+scopes that have changed.  It is used when ``objectdb_backend``
+project config is ``'sqlite'``.
+
+The first time it is used in a project, the information saved by
+`MemoryDB` is imported.
+
+"""
+import os
+import sqlite3
+import threading
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from rope.base import utils
+from rope.base.oi import objectdb
+
+
+def _locked(func):
+    """Call `func` holding the lock of the database"""
+    def call(self, *args, **kwds):
+        with self._lock:
+            return func(self, *args, **kwds)
+    return call
+
+
+class SQLiteDB(objectdb.FileDict):
+
+    def __init__(self, project, filename='objectdb.sqlite'):
+        self.project = project
+        self.filename = filename
+        self.files = self
+        self._loaded = {}
+        # DOA data is received and the objectdb is validated in other
+        # threads; the connection is used holding this lock
+        self._lock = threading.RLock()
+        self.project.data_files.add_write_hook(self.write)
+
+    @property
+    @utils.saveit
+    def connection(self):
+        folder = self.project.ropefolder.real_path
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        path = os.path.join(folder, self.filename)
+        exists = os.path.exists(path)
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY)')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS scopes (path TEXT, key TEXT, '
+            'data BLOB, PRIMARY KEY (path, key))')
+        if not exists:
+            self._import_memorydb(connection)
+        connection.commit()
+        return connection
+
+    def _import_memorydb(self, connection):
+        compress = self.project.prefs.get('compress_objectdb', False)
+        files = self.project.data_files.read_data(
+            'objectdb', compress=compress, import_=True)
+        for path, scopes in (files or {}).items():
+            connection.execute('INSERT INTO files VALUES (?)', (path,))
+            for key, scope_info in scopes.items():
+                connection.execute('INSERT INTO scopes VALUES (?, ?, ?)',
+                                   (path, key, _dumps(scope_info)))
+
+    @_locked
+    def keys(self):
+        return [row[0] for row in
+                self.connection.execute('SELECT path FROM files')]
+
+    def __iter__(self):
+        for path in self.keys():
+            yield path
+
+    @_locked
+    def __len__(self):
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def __setitem__(self):
+        raise NotImplementedError()
+
+    @_locked
+    def __contains__(self, key):
+        if key in self._loaded:
+            return True
+        return self.connection.execute(
+            'SELECT 1 FROM files WHERE path = ?', (key,)).fetchone() \
+            is not None
+
+    @_locked
+    def __getitem__(self, key):
+        if key not in self._loaded:
+            if key not in self:
+                raise KeyError(key)
+            rows = self.connection.execute(
+                'SELECT key, data FROM scopes WHERE path = ?', (key,))
+            self._loaded[key] = FileInfo(self, key, dict(rows))
+        return self._loaded[key]
+
+    @_locked
+    def create(self, path):
+        if path in self:
+            del self[path]
+        self.connection.execute('INSERT INTO files VALUES (?)', (path,))
+        self._loaded[path] = FileInfo(self, path, {})
+
+    @_locked
+    def rename(self, file, newfile):
+        if file not in self:
+            return
+        self._flush()
+        if newfile in self:
+            del self[newfile]
+        for table in ('files', 'scopes'):
+            self.connection.execute(
+                'UPDATE %s SET path = ? WHERE path = ?' % table,
+                (newfile, file))
+        file_info = self._loaded.pop(file, None)
+        if file_info is not None:
+            file_info.path = newfile
+            self._loaded[newfile] = file_info
+
+    @_locked
+    def __delitem__(self, file):
+        for table in ('files', 'scopes'):
+            self.connection.execute(
+                'DELETE FROM %s WHERE path = ?' % table, (file,))
+        self._loaded.pop(file, None)
+
+    @_locked
+    def write(self):
+        """Save the changed scopes and close the database
+
+        It is opened again when needed.
+        """
+        self._flush()
+        if hasattr(self, '_connection'):
+            self._connection.close()
+            del self._connection
+
+    @_locked
+    def _flush(self):
+        for path, file_info in list(self._loaded.items()):
+            for key, scope_info in list(file_info.scopes.items()):
+                if isinstance(scope_info, ScopeInfo) and scope_info.modified:
+                    self._write_scope(path, key, scope_info)
+                    scope_info.modified = False
+        if hasattr(self, '_connection'):
+            self._connection.commit()
+
+    @_locked
+    def _write_scope(self, path, key, scope_info):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO scopes VALUES (?, ?, ?)',
+            (path, key, _dumps(scope_info)))
+
+    @_locked
+    def _remove_scope(self, path, key):
+        self.connection.execute(
+            'DELETE FROM scopes WHERE path = ? AND key = ?', (path, key))
+
+
+class FileInfo(objectdb.FileInfo):
+    """The scopes of a file
+
+    The scopes are unpickled when they are first used.
+    """
+
+    def __init__(self, db, path, scopes):
+        self.db = db
+        self.path = path
+        self.scopes = scopes
+
+    def create_scope(self, key):
+        self.scopes[key] = ScopeInfo()
+
+    def keys(self):
+        return self.scopes.keys()
+
+    def __contains__(self, key):
+        return key in self.scopes
+
+    def __getitem__(self, key):
+        scope_info = self.scopes[key]
+        if not isinstance(scope_info, ScopeInfo):
+            scope_info = ScopeInfo(*pickle.loads(bytes(scope_info)))
+            scope_info.modified = False
+            self.scopes[key] = scope_info
+        return scope_info
+
+    def __delitem__(self, key):
+        del self.scopes[key]
+        self.db._remove_scope(self.path, key)
+
+    def __iter__(self):
+        for s in self.scopes:
+            yield s
+
+    def __len__(self):
+        return len(self.scopes)
+
+    def __setitem__(self):
+        raise NotImplementedError()
+
+
+class ScopeInfo(objectdb.ScopeInfo):
+
+    def __init__(self, call_info=None, per_name=None):
+        self.call_info = call_info if call_info is not None else {}
+        self.per_name = per_name if per_name is not None else {}
+        self.modified = True
+
+    def get_per_name(self, name):
+        return self.per_name.get(name, None)
+
+    def save_per_name(self, name, value):
+        self.per_name[name] = value
+        self.modified = True
+
+    def get_returned(self, parameters):
+        return self.call_info.get(parameters, None)
+
+    def get_call_infos(self):
+        for args, returned in self.call_info.items():
+            yield objectdb.CallInfo(args, returned)
+
+    def add_call(self, parameters, returned):
+        self.call_info[parameters] = returned
+        self.modified = True
+
+
+def _dumps(scope_info):
+    data = pickle.dumps((scope_info.call_info, scope_info.per_name), 2)
+    return sqlite3.Binary(data)
@@ -217,6 +217,21 @@ class TextualToPyObject(object):
         except exceptions.ResourceNotFoundError:
             return None
 
+    def path_to_real_path(self, path):
+        """Return the address `path_to_resource()` looks for
+
+        Unlike `path_to_resource()`, the project is not consulted;
+        `None` is returned for the paths that are never accepted.
+
+        """
+        root = self.project.address
+        if not os.path.isabs(path):
+            return self.project._get_resource_path(path)
+        if path == root or path.startswith(root + os.sep):
+            return None
+        import rope.base.project
+        return rope.base.project.get_no_project()._get_resource_path(path)
+
 
 class DOITextualToPyObject(TextualToPyObject):
     """For transforming textual form to `PyObject`
@@ -0,0 +1,101 @@
+"""Running per-file tasks in a pool of processes
+
+Whole-project refactorings repeat an independent task for each file.
+`map_resources()` runs such tasks in worker processes.  Each worker
+opens its own copy of the project, without ever writing it, and
+creates the task by calling a module-level function.  Only resource
+paths and results are passed between processes; the results should
+be picklable.
+
+Note that the workers see the files and the object information saved
+on disk; nothing that lives in the memory of the calling process.
+
+"""
+import multiprocessing
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import rope.base.project
+from rope.base import taskhandle
+
+
+def get_processes(project, processes=None):
+    """Return the number of processes to use for `project`
+
+    `processes` overrides the value of ``search_processes`` project
+    config.
+
+    """
+    if processes is None:
+        processes = project.prefs.get('search_processes', 1)
+    return max(1, processes or 1)
+
+
+def is_picklable(*args):
+    """Tell whether `args` can be passed to worker processes"""
+    try:
+        pickle.dumps(args, 2)
+        return True
+    except Exception:
+        return False
+
+
+def map_resources(project, resources, create_task, args=(), processes=2,
+                  job_set=taskhandle.NullJobSet()):
+    """Yield ``(resource, result)`` tuples for `resources` in order
+
+    `create_task` is a module-level function; each worker calls it
+    as ``create_task(project, *args)`` once and calls the returned
+    function with each resource it processes.  `job_set` is informed
+    as results arrive and stopping its task handle terminates the
+    workers.
+
+    """
+    resources = list(resources)
+    paths = [resource.path for resource in resources]
+    chunksize = max(1, len(paths) // (processes * 8))
+    pool = multiprocessing.Pool(
+        processes, _init_worker,
+        (project.address, project._ropefolder_name,
+         _get_prefs(project), create_task, args))
+    try:
+        results = pool.imap(_run_task, paths, chunksize)
+        for resource, result in zip(resources, results):
+            job_set.started_job(resource.path)
+            yield resource, result
+            job_set.finished_job()
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _get_prefs(project):
+    prefs = {}
+    for key, value in project.prefs.prefs.items():
+        if is_picklable(value):
+            prefs[key] = value
+    if getattr(project, 'ignored', None) is not None:
+        prefs['ignored_resources'] = list(project.ignored.patterns)
+    # workers should never write the project's data files
+    prefs.update({'save_objectdb': False, 'save_history': False,
+                  'automatic_soa': False, 'validate_objectdb': False})
+    return prefs
+
+
+_task = None
+_project = None
+
+
+def _init_worker(address, ropefolder, prefs, create_task, args):
+    global _project, _task
+    _project = rope.base.project.Project(address, ropefolder=ropefolder,
+                                         **prefs)
+    _task = create_task(_project, *args)
+
+
+def _run_task(path):
+    return _task(_project.get_resource(path))
@@ -7,6 +7,7 @@ import rope.base.fscommands
 import rope.base.resourceobserver as resourceobserver
 import rope.base.utils.pycompat as pycompat
 from rope.base import exceptions, taskhandle, prefs, history, pycore, utils
+from rope.base import nameindex, structurecache, watcher
 from rope.base.exceptions import ModuleNotFoundError
 from rope.base.resources import File, Folder, _ResourceMatcher
 
@@ -24,6 +25,14 @@ class _Project(object):
         self.prefs = prefs.Prefs()
         self.data_files = _DataFiles(self)
         self._custom_source_folders = []
+        self._source_folders = None
+        self.directory_cache = None
+        self.add_observer(resourceobserver.ResourceObserver(
+            moved=self._source_folders_changed,
+            created=self._source_folders_changed,
+            removed=self._source_folders_changed,
+            validate=self._source_folders_changed))
+        self.module_finder = _ModuleFinder(self)
 
     def get_resource(self, resource_name):
         """Get a resource in a project.
@@ -48,6 +57,19 @@ class _Project(object):
             raise exceptions.ResourceNotFoundError('Unknown resource '
                                                    + resource_name)
 
+    def _get_children(self, folder):
+        try:
+            children = os.listdir(folder.real_path)
+        except OSError:
+            return []
+        result = []
+        for name in children:
+            try:
+                result.append(folder.get_child(name))
+            except exceptions.ResourceNotFoundError:
+                pass
+        return result
+
     def get_module(self, name, folder=None):
         """Returns a `PyObject` if the module was found."""
         # check if this is a builtin module
@@ -69,18 +91,42 @@ class _Project(object):
                 pass
         return result
 
-    # INFO: It was decided not to cache source folders, since:
-    #  - Does not take much time when the root folder contains
-    #    packages, that is most of the time
-    #  - We need a separate resource observer; `self.observer`
-    #    does not get notified about module and folder creations
     def get_source_folders(self):
-        """Returns project source folders"""
+        """Returns project source folders
+
+        Source folders are cached.  They are found again after
+        folders or python files are created, moved or removed, after
+        the project is validated or after `refresh_source_folders()`
+        is called.
+
+        """
         if self.root is None:
             return []
-        result = list(self._custom_source_folders)
-        result.extend(self.pycore._find_source_folders(self.root))
-        return result
+        if self._source_folders is None:
+            result = list(self._custom_source_folders)
+            result.extend(self.pycore._find_source_folders(self.root))
+            self._source_folders = result
+        return list(self._source_folders)
+
+    def refresh_source_folders(self):
+        """Forget the cached source folders
+
+        Use it when source folders might have changed without rope
+        being notified; for instance when a package is created by
+        another process and the project is not validated.  Cached
+        folder listings and found modules are forgotten, too.
+
+        """
+        self._source_folders = None
+        if self.directory_cache is not None:
+            self.directory_cache.forget()
+        self.module_finder.forget()
+
+    def _source_folders_changed(self, resource, new_resource=None):
+        for changed in (resource, new_resource):
+            if changed is not None and \
+               (changed.is_folder() or changed.name.endswith('.py')):
+                self._source_folders = None
 
     def validate(self, folder):
         """Validate files and folders contained in this folder
@@ -138,21 +184,10 @@ class _Project(object):
     def find_module(self, modname, folder=None):
         """Returns a resource corresponding to the given module
 
-        returns None if it can not be found
+        returns None if it can not be found.  The results are cached;
+        see `_ModuleFinder`.
         """
-        for src in self.get_source_folders():
-            module = _find_module_in_folder(src, modname)
-            if module is not None:
-                return module
-        for src in self.get_python_path_folders():
-            module = _find_module_in_folder(src, modname)
-            if module is not None:
-                return module
-        if folder is not None:
-            module = _find_module_in_folder(folder, modname)
-            if module is not None:
-                return module
-        return None
+        return self.module_finder.find_module(modname, folder)
 
     def find_relative_module(self, modname, folder, level):
         for i in range(level - 1):
@@ -178,6 +213,27 @@ class _Project(object):
     def pycore(self):
         return pycore.PyCore(self)
 
+    @property
+    @utils.saveit
+    def name_index(self):
+        """The `nameindex.NameIndex` of this project or `None`
+
+        It is `None` unless ``use_name_index`` project config is set.
+        """
+        if self.prefs.get('use_name_index', False):
+            return nameindex.NameIndex(self)
+
+    @property
+    @utils.saveit
+    def structure_cache(self):
+        """The `structurecache.StructureCache` of this project or `None`
+
+        It is `None` unless ``use_structure_cache`` project config is
+        set.
+        """
+        if self.prefs.get('use_structure_cache', False):
+            return structurecache.StructureCache(self)
+
     def close(self):
         warnings.warn('Cannot close a NoProject',
                       DeprecationWarning, stacklevel=2)
@@ -228,6 +284,36 @@ class Project(_Project):
         for path in self.prefs.get('source_folders', []):
             folder = self.get_resource(path)
             self._custom_source_folders.append(folder)
+        self.refresh_source_folders()
+
+    def get_resource(self, resource_name):
+        if self.directory_cache is None or \
+           not _is_normal_path(resource_name):
+            return super(Project, self).get_resource(resource_name)
+        parent, _, name = resource_name.rpartition('/')
+        listing = self.directory_cache.get_listing(parent)
+        if listing is None or name not in listing:
+            raise exceptions.ResourceNotFoundError(
+                'Resource <%s> does not exist' % resource_name)
+        if listing[name]:
+            return Folder(self, resource_name)
+        return File(self, resource_name)
+
+    def _get_children(self, folder):
+        if self.directory_cache is None or \
+           folder.path and not _is_normal_path(folder.path):
+            return super(Project, self)._get_children(folder)
+        listing = self.directory_cache.get_listing(folder.path)
+        if listing is None:
+            return []
+        result = []
+        for name, is_folder in listing.items():
+            path = folder._get_child_path(name)
+            if is_folder:
+                result.append(Folder(self, path))
+            else:
+                result.append(File(self, path))
+        return result
 
     def get_files(self):
         return self.file_list.get_files()
@@ -280,8 +366,13 @@ class Project(_Project):
         return inspect.getsource(rope.base.default_config)
 
     def _init_other_parts(self):
+        if self.prefs.get('cache_folder_listings', False):
+            self.directory_cache = _DirectoryCache(self)
         # Forcing the creation of `self.pycore` to register observers
         self.pycore
+        self.name_index
+        self.structure_cache
+        self.watcher
 
     def is_ignored(self, resource):
         return self.ignored.does_match(resource)
@@ -292,8 +383,25 @@ class Project(_Project):
 
     def close(self):
         """Closes project open resources"""
+        if hasattr(self, '_pycore'):
+            self._perform_deferred_soa()
+        if getattr(self, '_watcher', None) is not None:
+            self._watcher.close()
+        if hasattr(self, '_watcher'):
+            del self._watcher
         self.data_files.write()
 
+    def _perform_deferred_soa(self):
+        # closing should not fail and skip writing the data files; the
+        # module whose analysis fails is no longer queued
+        deferred_soa = self.pycore.deferred_soa
+        while deferred_soa is not None and deferred_soa.pending:
+            try:
+                deferred_soa.perform()
+            except Exception as e:
+                warnings.warn('Cannot analyze a module: %s' % e,
+                              RuntimeWarning, stacklevel=3)
+
     def set(self, key, value):
         """Set the `key` preference to `value`"""
         self.prefs.set(key, value)
@@ -304,10 +412,33 @@ class Project(_Project):
             return self.get_folder(self._ropefolder_name)
 
     def validate(self, folder=None):
+        """Validate files and folders contained in this folder
+
+        When the project is watched (see `watcher`), `folder` is
+        ignored: the changes the watcher reports anywhere in the
+        project are validated and, if some changes might have been
+        missed, the whole project is validated.
+
+        """
         if folder is None:
             folder = self.root
+        if self.watcher is not None:
+            if self.watcher.process_events():
+                return
+            folder = self.root
         super(Project, self).validate(folder)
 
+    @property
+    @utils.saveit
+    def watcher(self):
+        """The `watcher.Watcher` of this project or `None`
+
+        It is `None` unless ``use_watcher`` project config is set and
+        the platform supports it.
+        """
+        if self.prefs.get('use_watcher', False) and watcher.is_supported():
+            return watcher.Watcher(self)
+
     root = property(lambda self: self.get_resource(''))
     address = property(lambda self: self._address)
 
@@ -346,34 +477,220 @@ def get_no_project():
 
 
 class _FileListCacher(object):
+    """Caches the files of a project
+
+    Files are listed using `os.scandir()` and ignored folders are not
+    visited.  When resources are created, moved or removed, only the
+    affected files are added or removed; changed and validated folders
+    are listed again (lazily, for the root folder).
+
+    """
 
     def __init__(self, project):
         self.project = project
         self.files = None
+        self.folders = None
+        self.shared = False
         rawobserver = resourceobserver.ResourceObserver(
-            self._changed, self._invalid, self._invalid,
-            self._invalid, self._invalid)
+            self._changed, self._moved, self._created,
+            self._removed, self._changed)
         self.project.add_observer(rawobserver)
 
     def get_files(self):
         if self.files is None:
             self.files = set()
+            self.folders = set([''])
             self._add_files(self.project.root)
+        # the returned set is copied before being changed
+        self.shared = True
         return self.files
 
     def _add_files(self, folder):
-        for child in folder.get_children():
+        try:
+            entries = pycompat.scandir(folder.real_path)
+        except OSError:
+            return
+        for entry in entries:
+            path = folder._get_child_path(entry.name)
+            if entry.is_dir():
+                child = Folder(self.project, path)
+            elif entry.is_file():
+                child = File(self.project, path)
+            else:
+                continue
+            # `entry.is_symlink()` saves checking symbolic links again
+            if entry.is_symlink() or \
+               self.project.ignored.does_match_path(path):
+                continue
             if child.is_folder():
+                self.folders.add(path)
                 self._add_files(child)
-            elif not self.project.is_ignored(child):
+            else:
                 self.files.add(child)
 
-    def _changed(self, resource):
+    def _add(self, resource):
+        if resource.parent.path not in self.folders or \
+           not resource.exists() or self.project.is_ignored(resource):
+            return
         if resource.is_folder():
+            self.folders.add(resource.path)
+            self._add_files(resource)
+        else:
+            self.files.add(resource)
+
+    def _remove(self, resource):
+        if not resource.is_folder():
+            self.files.discard(resource)
+            return
+        prefix = resource.path + '/'
+        self.folders = set(folder for folder in self.folders
+                           if not folder.startswith(prefix) and
+                           folder != resource.path)
+        self.files = set(file_ for file_ in self.files
+                         if not file_.path.startswith(prefix))
+        self.shared = False
+
+    def _is_listed(self):
+        if self.files is None:
+            return False
+        if self.shared:
+            self.files = set(self.files)
+            self.shared = False
+        return True
+
+    def _changed(self, resource):
+        if not resource.path:
             self.files = None
+        elif resource.is_folder() and self._is_listed():
+            self._remove(resource)
+            self._add(resource)
 
-    def _invalid(self, resource, new_resource=None):
-        self.files = None
+    def _moved(self, resource, new_resource):
+        if self._is_listed():
+            self._remove(resource)
+            self._add(new_resource)
+
+    def _created(self, resource):
+        if self._is_listed():
+            self._add(resource)
+
+    def _removed(self, resource):
+        if self._is_listed():
+            self._remove(resource)
+
+
+class _DirectoryCache(object):
+    """Caches the listings of the folders of a project
+
+    Listings are read using `os.scandir()`.  They are forgotten when
+    the folders or their children are created, moved or removed and
+    when the folders are validated.  See `Project.get_resource()`.
+
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.listings = {}
+        rawobserver = resourceobserver.ResourceObserver(
+            moved=self._moved, created=self.forget,
+            removed=self.forget, validate=self.forget)
+        self.project.add_observer(rawobserver)
+
+    def get_listing(self, path):
+        """Return the children of the folder at `path`
+
+        It is a `dict` that maps the names of the children to whether
+        they are folders, or `None` if `path` is not a folder.
+        """
+        try:
+            return self.listings[path]
+        except KeyError:
+            listing = self._read_listing(path)
+            self.listings[path] = listing
+            return listing
+
+    def _read_listing(self, path):
+        try:
+            entries = pycompat.scandir(self.project._get_resource_path(path))
+        except OSError:
+            return None
+        result = {}
+        for entry in entries:
+            if entry.is_dir():
+                result[entry.name] = True
+            elif entry.is_file():
+                result[entry.name] = False
+        return result
+
+    def _moved(self, resource, new_resource):
+        self.forget(resource)
+        self.forget(new_resource)
+
+    def forget(self, resource=None):
+        """Forget the listings of `resource`, its parent and children
+
+        All listings are forgotten if `resource` is `None`.
+        """
+        path = resource.path if resource is not None else ''
+        if not path:
+            self.listings.clear()
+            return
+        self.listings.pop(resource.parent.path, None)
+        for cached in list(self.listings):
+            if cached == path or cached.startswith(path + '/'):
+                self.listings.pop(cached, None)
+
+
+class _ModuleFinder(object):
+    """Finds and caches the resources of modules
+
+    The resources found for module names, and the module names for
+    which nothing was found, are remembered until a resource is
+    created, moved or removed, the project is validated, source
+    folders are refreshed or the python path (``python_path`` config
+    and `sys.path`) changes.
+
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.modules = {}
+        self.python_path = None
+        self.python_path_folders = None
+        rawobserver = resourceobserver.ResourceObserver(
+            moved=self.forget, created=self.forget,
+            removed=self.forget, validate=self.forget)
+        self.project.add_observer(rawobserver)
+
+    def find_module(self, modname, folder=None):
+        self._check_python_path()
+        key = (modname, folder)
+        if key not in self.modules:
+            self.modules[key] = self._find_module(modname, folder)
+        return self.modules[key]
+
+    def _find_module(self, modname, folder):
+        source_folders = self.project.get_source_folders()
+        for src in source_folders + self.python_path_folders:
+            module = _find_module_in_folder(src, modname)
+            if module is not None:
+                return module
+        if folder is not None:
+            return _find_module_in_folder(folder, modname)
+        return None
+
+    def _check_python_path(self):
+        python_path = tuple(self.project.prefs.get('python_path', []) +
+                            sys.path)
+        if python_path != self.python_path:
+            self.modules.clear()
+            self.python_path = python_path
+            self.python_path_folders = self.project.get_python_path_folders()
+
+    def forget(self, resource=None, new_resource=None):
+        """Forget the found modules"""
+        self.modules.clear()
+        self.python_path = None
 
 
 class _DataFiles(object):
@@ -417,6 +734,39 @@ class _DataFiles(object):
             finally:
                 output.close()
 
+    def open_data(self, name, mode='rb', compress=False):
+        """Open a data file; `None` is returned if there is none
+
+        Unlike `read_data()` and `write_data()` the caller is
+        responsible for reading and writing the file (appending to
+        it, for instance).
+        """
+        if self.project.ropefolder is not None:
+            compress = compress and self._can_compress()
+            file = self._get_file(name, compress)
+            if 'r' in mode and not file.exists():
+                return None
+            if not file.parent.exists():
+                os.makedirs(file.parent.real_path)
+            return self._get_opener(compress)(file.real_path, mode)
+
+    def move_data(self, name, new_name, compress=False):
+        """Replace `new_name` data file with `name`"""
+        if self.project.ropefolder is not None:
+            compress = compress and self._can_compress()
+            path = self._get_file(name, compress).real_path
+            new_path = self._get_file(new_name, compress).real_path
+            if os.name == 'nt' and os.path.exists(new_path):
+                os.remove(new_path)
+            os.rename(path, new_path)
+
+    def remove_data(self, name, compress=False):
+        if self.project.ropefolder is not None:
+            compress = compress and self._can_compress()
+            file = self._get_file(name, compress)
+            if file.exists():
+                os.remove(file.real_path)
+
     def add_write_hook(self, hook):
         self.hooks.append(hook)
 
@@ -474,6 +824,16 @@ def _realpath(path):
     return os.path.realpath(os.path.abspath(os.path.expanduser(path)))
 
 
+def _is_normal_path(path):
+    """Whether `path` is a normalized path of a resource other than root"""
+    if os.sep != '/' and os.sep in path:
+        return False
+    for part in path.split('/'):
+        if part in ('', '.', '..'):
+            return False
+    return True
+
+
 def _find_module_in_folder(folder, modname):
     module = folder
     packages = modname.split('.')
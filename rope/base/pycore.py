@@ -1,7 +1,10 @@
 import bisect
+import collections
 import difflib
 import sys
+import time
 import warnings
+import weakref
 
 import rope.base.libutils
 import rope.base.resourceobserver
@@ -27,6 +30,8 @@ class PyCore(object):
         self.module_cache = _ModuleCache(self)
         self.extension_cache = _ExtensionCache(self)
         self.object_info = rope.base.oi.objectinfo.ObjectInfoManager(project)
+        self.evaluation_hits = 0
+        self.evaluation_misses = 0
         self._init_python_files()
         self._init_automatic_soa()
 
@@ -46,8 +51,11 @@ class PyCore(object):
         self.project.add_observer(self.observer)
 
     def _init_automatic_soa(self):
+        self.deferred_soa = None
         if not self.automatic_soa:
             return
+        if self.project.prefs.get('defer_automatic_soa', False):
+            self.deferred_soa = _DeferredSOA(self.project)
         callback = self._file_changed_for_soa
         observer = rope.base.resourceobserver.ResourceObserver(
             changed=callback, moved=callback, removed=callback)
@@ -61,9 +69,33 @@ class PyCore(object):
     def _file_changed_for_soa(self, resource, new_resource=None):
         old_contents = self.project.history.\
             contents_before_current_change(resource)
-        if old_contents is not None:
+        if old_contents is None:
+            return
+        if self.deferred_soa is not None:
+            self.deferred_soa.add(resource, old_contents)
+        else:
             perform_soa_on_changed_scopes(self.project, resource, old_contents)
 
+    def perform_deferred_soa(self, timeout=None):
+        """Perform the automatic SOA deferred for changed modules
+
+        When ``defer_automatic_soa`` project config is set, changed
+        modules are not analyzed when they are saved but queued.  This
+        method analyzes the queued modules (it can be called when the
+        editor is idle, for instance), spending at most about
+        `timeout` seconds, and tells whether no module is left.  The
+        exceptions raised while analyzing are raised here.
+
+        """
+        if self.deferred_soa is None:
+            return True
+        return self.deferred_soa.perform(timeout)
+
+    def cancel_deferred_soa(self):
+        """Do not analyze the modules queued for automatic SOA"""
+        if self.deferred_soa is not None:
+            self.deferred_soa.cancel()
+
     def is_python_file(self, resource):
         if resource.is_folder():
             return False
@@ -128,11 +160,6 @@ class PyCore(object):
     def find_relative_module(self, modname, folder, level):
         return self.project.find_relative_module(modname, folder, level)
 
-    # INFO: It was decided not to cache source folders, since:
-    #  - Does not take much time when the root folder contains
-    #    packages, that is most of the time
-    #  - We need a separate resource observer; `self.observer`
-    #    does not get notified about module and folder creations
     @utils.deprecated('Use `project.get_source_folders` instead')
     def get_source_folders(self):
         """Returns project source folders"""
@@ -176,11 +203,12 @@ class PyCore(object):
         perform_doa = self.project.prefs.get('perform_doi', True)
         perform_doa = self.project.prefs.get('perform_doa', perform_doa)
         receiver = self.object_info.doa_data_received
+        batch_receiver = self.object_info.doa_batch_received
         if not perform_doa:
-            receiver = None
+            receiver = batch_receiver = None
         runner = rope.base.oi.doa.PythonFileRunner(
-            self, resource, args, stdin, stdout, receiver)
-        runner.add_finishing_observer(self.module_cache.forget_all_data)
+            self, resource, args, stdin, stdout, receiver, batch_receiver)
+        runner.add_finishing_observer(self.forget_changed_data)
         runner.run()
         return runner
 
@@ -205,9 +233,42 @@ class PyCore(object):
         if followed_calls is None:
             followed_calls = self.project.prefs.get('soa_followed_calls', 0)
         pymodule = self.resource_to_pyobject(resource)
-        self.module_cache.forget_all_data()
         rope.base.oi.soa.analyze_module(
             self, pymodule, should_analyze, search_subscopes, followed_calls)
+        self.forget_changed_data()
+
+    def forget_changed_data(self):
+        """Forget the data concluded from changed object information
+
+        The concluded data of the modules whose object information
+        has changed (by static or dynamic object analysis, for
+        instance) and of the modules that depend on them are
+        forgotten.
+
+        """
+        for resource in self.object_info.pop_changed_resources():
+            self.module_cache.forget_data(resource)
+
+    def get_module_cache_stats(self):
+        """Return a `dict` of module cache statistics
+
+        See `_ModuleCache.get_stats()`.
+        """
+        return self.module_cache.get_stats()
+
+    def get_evaluation_stats(self):
+        """Return a `dict` of node evaluation cache statistics
+
+        ``hits`` and ``misses`` count the requests for evaluating the
+        nodes of the modules and ``hit_rate`` is the ratio of hits to
+        requests.  See `rope.base.evaluate.eval_node2()`.
+
+        """
+        requests = self.evaluation_hits + self.evaluation_misses
+        return {'hits': self.evaluation_hits,
+                'misses': self.evaluation_misses,
+                'hit_rate': float(self.evaluation_hits) / requests
+                if requests else 0.0}
 
     def get_classes(self, task_handle=taskhandle.NullTaskHandle()):
         warnings.warn('`PyCore.get_classes()` is deprecated',
@@ -231,22 +292,118 @@ class PyCore(object):
 
 
 class _ModuleCache(object):
+    """Holds the `PyModule`\s of the project
+
+    When a module changes, the concluded data of the modules that
+    depend on it are forgotten.  Dependencies are recorded whenever
+    a cached module resolves one of its imports (including star
+    imports and package children) and when object information
+    referring to other modules is used for its objects.
+
+    The number of cached modules and the total size of their sources
+    can be limited using ``max_cached_modules`` and
+    ``max_cached_modules_size`` project configs.  When exceeded, the
+    least recently used modules are dropped (and the concluded data of
+    the modules depending on them are forgotten); they are created
+    again when asked for, unless they are still used (a refactoring
+    might hold their pynames and compare them by identity, for
+    instance).  In that case the same modules are cached again.
+
+    """
 
     def __init__(self, pycore):
         self.pycore = pycore
-        self.module_map = {}
+        self.module_map = collections.OrderedDict()
+        # weak references to the evicted modules; still observed
+        self.evicted = {}
+        self.dependents = {}
+        self.dependencies = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.invalidated_modules = 0
+        self.last_invalidated = 0
         self.pycore.cache_observers.append(self._invalidate_resource)
         self.observer = self.pycore.observer
 
     def _invalidate_resource(self, resource):
-        if resource in self.module_map:
-            self.forget_all_data()
+        if resource in self.evicted:
+            del self.evicted[resource]
             self.observer.remove_resource(resource)
-            del self.module_map[resource]
+        if resource in self.module_map:
+            invalidated = self._remove_module(resource)
+            self.invalidations += 1
+            self.invalidated_modules += invalidated
+            self.last_invalidated = invalidated
+
+    def _remove_module(self, resource):
+        invalidated = self.forget_data(resource)
+        self.observer.remove_resource(resource)
+        self.size -= _get_module_size(self.module_map.pop(resource))
+        self.dependents.pop(resource, None)
+        return invalidated
+
+    def forget_data(self, resource):
+        """Forget the concluded data of a module and its dependents
+
+        It returns the number of modules whose data were forgotten.
+        """
+        if resource not in self.module_map:
+            return 0
+        dependents = self._get_dependents(resource)
+        for dependent in dependents:
+            self.module_map[dependent]._forget_concluded_data()
+            self._remove_dependencies(dependent)
+        return len(dependents)
+
+    def _get_dependents(self, resource):
+        result = set([resource])
+        pending = [resource]
+        while pending:
+            for dependent in self.dependents.get(pending.pop(), ()):
+                if dependent not in result and dependent in self.module_map:
+                    result.add(dependent)
+                    pending.append(dependent)
+        return result
+
+    def add_dependency(self, pymodule, imported):
+        """Record that the data of `pymodule` depend on `imported`
+
+        `imported` is either a module or the `Resource` of one.
+        """
+        resource = pymodule.get_resource()
+        imported_resource = imported
+        if not isinstance(imported, rope.base.resources.Resource):
+            imported_resource = imported.get_resource()
+        if resource is None or imported_resource is None or \
+           resource == imported_resource or \
+           self.module_map.get(resource) is not pymodule:
+            return
+        self.dependents.setdefault(imported_resource, set()).add(resource)
+        self.dependencies.setdefault(resource, set()).add(imported_resource)
+
+    def _remove_dependencies(self, resource):
+        for imported in self.dependencies.pop(resource, ()):
+            dependents = self.dependents.get(imported)
+            if dependents is not None:
+                dependents.discard(resource)
 
     def get_pymodule(self, resource, force_errors=False):
         if resource in self.module_map:
-            return self.module_map[resource]
+            self.hits += 1
+            # moving it to the end; the most recently used
+            result = self.module_map.pop(resource)
+            self.module_map[resource] = result
+            return result
+        if resource in self.evicted:
+            result = self.evicted.pop(resource)()
+            if result is not None:
+                self.hits += 1
+                self._add_module(resource, result)
+                return result
+        self.misses += 1
         if resource.is_folder():
             result = PyPackage(self.pycore, resource,
                                force_errors=force_errors)
@@ -255,18 +412,84 @@ class _ModuleCache(object):
                               force_errors=force_errors)
             if result.has_errors:
                 return result
-        self.module_map[resource] = result
         self.observer.add_resource(resource)
+        self._add_module(resource, result)
         return result
 
+    def _add_module(self, resource, pymodule):
+        self.module_map[resource] = pymodule
+        self.size += _get_module_size(pymodule)
+        self._evict(resource)
+
+    def _evict(self, keep):
+        prefs = self.pycore.project.prefs
+        max_modules = prefs.get('max_cached_modules', 0)
+        max_size = prefs.get('max_cached_modules_size', 0)
+        evicted = False
+        while len(self.module_map) > 1 and \
+                (max_modules and len(self.module_map) > max_modules or
+                 max_size and self.size > max_size):
+            resource = next(iter(self.module_map))
+            if resource == keep:
+                break
+            self._evict_module(resource)
+            evicted = True
+        if evicted:
+            self._forget_unused_evicted()
+
+    def _evict_module(self, resource):
+        self.forget_data(resource)
+        pymodule = self.module_map.pop(resource)
+        self.size -= _get_module_size(pymodule)
+        self.dependents.pop(resource, None)
+        self.evicted[resource] = weakref.ref(pymodule)
+        self.evictions += 1
+
+    def _forget_unused_evicted(self):
+        for resource, ref in list(self.evicted.items()):
+            if ref() is None:
+                del self.evicted[resource]
+                self.observer.remove_resource(resource)
+
     def forget_all_data(self):
         for pymodule in self.module_map.values():
             pymodule._forget_concluded_data()
+        self.dependents.clear()
+        self.dependencies.clear()
+
+    def get_stats(self):
+        """Return a `dict` describing the state of this cache
+
+        ``modules`` is the number of cached modules and ``size`` is
+        the total size of their sources.  ``hits`` and ``misses``
+        count module requests, ``hit_rate`` is the ratio of hits to
+        requests and ``evictions`` is the number of modules dropped
+        because of the limits of the cache.  ``invalidations`` is the
+        number of module changes, ``invalidated_modules`` is the
+        number of modules invalidated because of them and
+        ``last_invalidated`` is the number of modules invalidated by
+        the last change.
+
+        """
+        requests = self.hits + self.misses
+        return {'modules': len(self.module_map),
+                'size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': float(self.hits) / requests if requests else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'invalidated_modules': self.invalidated_modules,
+                'last_invalidated': self.last_invalidated}
 
     def __str__(self):
         return 'PyCore caches %d PyModules\n' % len(self.module_map)
 
 
+def _get_module_size(pymodule):
+    return len(getattr(pymodule, 'source_code', None) or '')
+
+
 class _ExtensionCache(object):
 
     def __init__(self, pycore):
@@ -304,6 +527,38 @@ def perform_soa_on_changed_scopes(project, resource, old_contents):
             pass
 
 
+class _DeferredSOA(object):
+    """Queues the modules changed for automatic SOA
+
+    The queued modules are analyzed when `perform()` is called, in the
+    calling thread; rope objects are not thread-safe.  The changes
+    made to a module before it is analyzed are analyzed together.
+    """
+
+    def __init__(self, project):
+        self.project = project
+        self.pending = collections.OrderedDict()
+
+    def add(self, resource, old_contents):
+        # the contents before the first change are kept
+        if resource not in self.pending:
+            self.pending[resource] = old_contents
+
+    def perform(self, timeout=None):
+        if timeout is not None:
+            deadline = time.time() + timeout
+        while self.pending:
+            if timeout is not None and time.time() >= deadline:
+                return False
+            resource, old_contents = self.pending.popitem(last=False)
+            perform_soa_on_changed_scopes(self.project, resource,
+                                          old_contents)
+        return True
+
+    def cancel(self):
+        self.pending.clear()
+
+
 class _TextChangeDetector(object):
 
     def __init__(self, old, new):
@@ -312,16 +567,8 @@ class _TextChangeDetector(object):
         self._set_diffs()
 
     def _set_diffs(self):
-        differ = difflib.Differ()
-        self.lines = []
-        lineno = 0
-        for line in differ.compare(self.old.splitlines(True),
-                                   self.new.splitlines(True)):
-            if line.startswith(' '):
-                lineno += 1
-            elif line.startswith('-'):
-                lineno += 1
-                self.lines.append(lineno)
+        self.lines = [index + 1 for index in _get_changed_lines(
+            self.old.splitlines(True), self.new.splitlines(True))]
 
     def is_changed(self, start, end):
         """Tell whether any of start till end lines have changed
@@ -344,3 +591,94 @@ class _TextChangeDetector(object):
         left = bisect.bisect_left(self.lines, start)
         right = bisect.bisect_right(self.lines, end)
         return left, right
+
+
+def _get_changed_lines(lines1, lines2):
+    """Return the sorted indices of `lines1` not matched in `lines2`
+
+    It uses patience diff: after skipping common leading and trailing
+    lines, the lines that appear once in both lists are matched (in
+    the longest increasing order) and the lines between them are
+    compared the same way.  Small ranges without such lines are
+    compared using `difflib.SequenceMatcher`; in larger ones, all
+    lines are considered changed.
+
+    """
+    result = []
+    pending = [(0, len(lines1), 0, len(lines2))]
+    while pending:
+        start1, end1, start2, end2 = pending.pop()
+        while start1 < end1 and start2 < end2 and \
+                lines1[start1] == lines2[start2]:
+            start1 += 1
+            start2 += 1
+        while start1 < end1 and start2 < end2 and \
+                lines1[end1 - 1] == lines2[end2 - 1]:
+            end1 -= 1
+            end2 -= 1
+        matches = _get_unique_matches(lines1, start1, end1,
+                                      lines2, start2, end2)
+        if not matches:
+            result.extend(_get_unmatched_lines(lines1, start1, end1,
+                                               lines2, start2, end2))
+            continue
+        for index1, index2 in matches:
+            pending.append((start1, index1, start2, index2))
+            start1 = index1 + 1
+            start2 = index2 + 1
+        pending.append((start1, end1, start2, end2))
+    result.sort()
+    return result
+
+
+def _get_unique_matches(lines1, start1, end1, lines2, start2, end2):
+    """Match the lines that appear once in both ranges
+
+    The longest list of matches that are in the same order in both
+    ranges is returned.
+    """
+    first = {}
+    for index in range(start1, end1):
+        line = lines1[index]
+        first[line] = None if line in first else index
+    second = {}
+    for index in range(start2, end2):
+        line = lines2[index]
+        if first.get(line) is not None:
+            second[line] = None if line in second else index
+    pairs = sorted((first[line], index)
+                   for line, index in second.items() if index is not None)
+    # the longest increasing subsequence of the second indices
+    tails = []
+    tail_indices = []
+    previous = []
+    for position, (index1, index2) in enumerate(pairs):
+        slot = bisect.bisect_left(tails, index2)
+        if slot == len(tails):
+            tails.append(index2)
+            tail_indices.append(position)
+        else:
+            tails[slot] = index2
+            tail_indices[slot] = position
+        previous.append(tail_indices[slot - 1] if slot > 0 else None)
+    result = []
+    position = tail_indices[-1] if tail_indices else None
+    while position is not None:
+        result.append(pairs[position])
+        position = previous[position]
+    result.reverse()
+    return result
+
+
+def _get_unmatched_lines(lines1, start1, end1, lines2, start2, end2,
+                         limit=10000):
+    if (end1 - start1) * (end2 - start2) > limit:
+        return range(start1, end1)
+    matcher = difflib.SequenceMatcher(None, lines1[start1:end1],
+                                      lines2[start2:end2], autojunk=False)
+    result = []
+    index = 0
+    for block in matcher.get_matching_blocks():
+        result.extend(range(start1 + index, start1 + block[0]))
+        index = block[0] + block[2]
+    return result
@@ -1,3 +1,5 @@
+import weakref
+
 from rope.base.fscommands import _decode_data
 from rope.base import ast, exceptions, utils
 
@@ -285,12 +287,24 @@ class _PyModule(PyDefinedObject, AbstractModule):
         self.concluded_data = []
         AbstractModule.__init__(self)
         PyDefinedObject.__init__(self, pycore, ast_node, None)
+        self.evaluated = self._get_concluded_data()
 
     def _get_concluded_data(self):
         new_data = _ConcludedData()
         self.concluded_data.append(new_data)
         return new_data
 
+    def _get_evaluated(self):
+        """Return the evaluated nodes of this module
+
+        It maps AST nodes to dicts that map scopes to the results of
+        `rope.base.evaluate.eval_node2()`.  It is forgotten with the
+        other concluded data of this module.
+        """
+        if self.evaluated.get() is None:
+            self.evaluated.set(weakref.WeakKeyDictionary())
+        return self.evaluated.get()
+
     def _forget_concluded_data(self):
         for data in self.concluded_data:
             data._invalidate()
@@ -25,6 +25,8 @@ class PyFunction(pyobjects.PyFunction):
             self._infer_parameters, self.get_module()._get_concluded_data())
         self.returned = pynames._Inferred(self._infer_returned)
         self.parameter_pynames = None
+        # incremented when the parameter objects are set
+        self.parameters_version = 0
 
     def _create_structural_attributes(self):
         return {}
@@ -55,6 +57,7 @@ class PyFunction(pyobjects.PyFunction):
         if pyobjects is not None:
             self._handle_special_args(pyobjects)
         self.parameter_pyobjects.set(pyobjects)
+        self.parameters_version += 1
 
     def get_parameters(self):
         if self.parameter_pynames is None:
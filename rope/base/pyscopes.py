@@ -6,6 +6,11 @@ from rope.base import ast, exceptions, utils
 
 class Scope(object):
 
+    # `utils.saveit()` stores the values of the saved methods in
+    # ``_<method>`` attributes
+    __slots__ = ('pycore', 'pyobject', 'parent', '_get_scopes',
+                 '_get_logical_end')
+
     def __init__(self, pycore, pyobject, parent_scope):
         self.pycore = pycore
         self.pyobject = pyobject
@@ -146,6 +151,9 @@ class GlobalScope(Scope):
 
 class FunctionScope(Scope):
 
+    __slots__ = ('names', 'returned_asts', 'is_generator', 'defineds',
+                 'visitor')
+
     def __init__(self, pycore, pyobject, visitor):
         super(FunctionScope, self).__init__(pycore, pyobject,
                                             pyobject.parent.get_scope())
@@ -201,6 +209,8 @@ class FunctionScope(Scope):
 
 class ClassScope(Scope):
 
+    __slots__ = ()
+
     def __init__(self, pycore, pyobject):
         super(ClassScope, self).__init__(pycore, pyobject,
                                          pyobject.parent.get_scope())
@@ -296,6 +306,8 @@ class TemporaryScope(Scope):
     parent scopes.
     """
 
+    __slots__ = ('names',)
+
     def __init__(self, pycore, parent_scope, names):
         super(TemporaryScope, self).__init__(
             pycore, parent_scope.pyobject, parent_scope)
@@ -1,3 +1,4 @@
+import bisect
 import os
 
 
@@ -83,7 +84,7 @@ class FilteredResourceObserver(object):
     def __init__(self, resource_observer, initial_resources=None,
                  timekeeper=None):
         self.observer = resource_observer
-        self.resources = {}
+        self.resources = _ResourceDict()
         if timekeeper is not None:
             self.timekeeper = timekeeper
         else:
@@ -126,11 +127,10 @@ class FilteredResourceObserver(object):
         if new_resource in self.resources:
             changes.add_created(new_resource)
         if resource.is_folder():
-            for file in list(self.resources):
-                if resource.contains(file):
-                    new_file = self._calculate_new_resource(
-                        resource, new_resource, file)
-                    changes.add_removed(file, new_file)
+            for file in self.resources.get_contents(resource):
+                new_file = self._calculate_new_resource(
+                    resource, new_resource, file)
+                changes.add_removed(file, new_file)
         if self._is_parent_changed(resource):
             changes.add_changed(resource.parent)
         if new_resource is not None:
@@ -194,9 +194,8 @@ class FilteredResourceObserver(object):
            self.resources[resource] is None:
             creations.add(resource)
         if resource.is_folder():
-            for file in self.resources:
-                if file.exists() and resource.contains(file) and \
-                   self.resources[file] is None:
+            for file in self.resources.get_contents(resource):
+                if file.exists() and self.resources[file] is None:
                     creations.add(file)
         return creations
 
@@ -205,10 +204,9 @@ class FilteredResourceObserver(object):
         if resource in self.resources and not resource.exists():
             all_moved.add(resource)
         if resource.is_folder():
-            for file in self.resources:
-                if resource.contains(file):
-                    if not file.exists():
-                        all_moved.add(file)
+            for file in self.resources.get_contents(resource):
+                if not file.exists():
+                    all_moved.add(file)
         moved = set(all_moved)
         for folder in [file for file in all_moved if file.is_folder()]:
             if folder in moved:
@@ -222,10 +220,9 @@ class FilteredResourceObserver(object):
         if resource in self.resources and self._is_changed(resource):
             changed.add(resource)
         if resource.is_folder():
-            for file in self.resources:
-                if file.exists() and resource.contains(file):
-                    if self._is_changed(file):
-                        changed.add(file)
+            for file in self.resources.get_contents(resource):
+                if file.exists() and self._is_changed(file):
+                    changed.add(file)
         return changed
 
     def _is_changed(self, resource):
@@ -241,6 +238,57 @@ class FilteredResourceObserver(object):
         return resource.project.get_resource(new_main.path + diff)
 
 
+class _ResourceDict(dict):
+    """A `dict` of resources that can list the contents of folders
+
+    The paths of the keys are kept sorted; the resources inside a
+    folder are found by bisecting on its path.
+    """
+
+    def __init__(self):
+        super(_ResourceDict, self).__init__()
+        self.paths = []
+        self.by_path = {}
+
+    def __setitem__(self, resource, value):
+        if resource not in self:
+            path = resource.path
+            if path not in self.by_path:
+                bisect.insort(self.paths, path)
+                self.by_path[path] = []
+            self.by_path[path].append(resource)
+        super(_ResourceDict, self).__setitem__(resource, value)
+
+    def __delitem__(self, resource):
+        super(_ResourceDict, self).__delitem__(resource)
+        path = resource.path
+        resources = self.by_path[path]
+        resources.remove(resource)
+        if not resources:
+            del self.by_path[path]
+            del self.paths[bisect.bisect_left(self.paths, path)]
+
+    def clear(self):
+        super(_ResourceDict, self).clear()
+        del self.paths[:]
+        self.by_path.clear()
+
+    def get_contents(self, folder):
+        """Return the resources that `folder` contains"""
+        if folder.path == '':
+            start, end = 0, len(self.paths)
+        else:
+            # '0' is the character after '/'
+            start = bisect.bisect_left(self.paths, folder.path + '/')
+            end = bisect.bisect_left(self.paths, folder.path + '0', start)
+        result = []
+        for path in self.paths[start:end]:
+            for resource in self.by_path[path]:
+                if resource != folder:
+                    result.append(resource)
+        return result
+
+
 class ChangeIndicator(object):
 
     def get_indicator(self, resource):
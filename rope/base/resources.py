@@ -146,18 +146,10 @@ class Folder(Resource):
 
     def get_children(self):
         """Return the children of this folder"""
-        try:
-            children = os.listdir(self.real_path)
-        except OSError:
-            return []
         result = []
-        for name in children:
-            try:
-                child = self.get_child(name)
-            except exceptions.ResourceNotFoundError:
-                continue
+        for child in self.project._get_children(self):
             if not self.project.is_ignored(child):
-                result.append(self.get_child(name))
+                result.append(child)
         return result
 
     def create_file(self, file_name):
@@ -210,6 +202,8 @@ class _ResourceMatcher(object):
     def __init__(self):
         self.patterns = []
         self._compiled_patterns = []
+        self._compiled_pattern = None
+        self._matched_paths = {}
 
     def set_patterns(self, patterns):
         """Specify which resources to match
@@ -219,24 +213,67 @@ class _ResourceMatcher(object):
 
         """
         self._compiled_patterns = None
+        self._compiled_pattern = None
+        self._matched_paths = {}
         self.patterns = patterns
 
-    def _add_pattern(self, pattern):
-        re_pattern = pattern.replace('.', '\\.').\
+    def _get_re_pattern(self, pattern):
+        return pattern.replace('.', '\\.').\
             replace('*', '[^/]*').replace('?', '[^/]').\
-            replace('//', '/(.*/)?')
-        re_pattern = '^(.*/)?' + re_pattern + '(/.*)?$'
+            replace('//', '/(?:.*/)?')
+
+    def _add_pattern(self, pattern):
+        re_pattern = self._get_re_pattern(pattern)
+        re_pattern = '^(?:.*/)?' + re_pattern + '(?:/.*)?$'
         self.compiled_patterns.append(re.compile(re_pattern))
 
     def does_match(self, resource):
-        for pattern in self.compiled_patterns:
-            if pattern.match(resource.path):
-                return True
+        if self.does_match_path(resource.path):
+            return True
         path = os.path.join(resource.project.address,
                             *resource.path.split('/'))
-        if os.path.islink(path):
-            return True
-        return False
+        return os.path.islink(path)
+
+    def does_match_path(self, path):
+        """Whether the resource path `path` matches the patterns
+
+        Unlike `does_match()`, symbolic links are not checked.  The
+        results are cached until the patterns change.
+        """
+        try:
+            return self._matched_paths[path]
+        except KeyError:
+            pass
+        if self.compiled_pattern is not None:
+            result = self.compiled_pattern.match(path) is not None
+        else:
+            result = False
+            for pattern in self.compiled_patterns:
+                if pattern.match(path):
+                    result = True
+                    break
+        self._matched_paths[path] = result
+        return result
+
+    @property
+    def compiled_pattern(self):
+        """All of the patterns compiled into a single regular expression
+
+        It is `None` if there are no patterns or they cannot be
+        combined; `compiled_patterns` are used then.
+        """
+        if self._compiled_pattern is None:
+            self._compiled_pattern = False
+            re_patterns = ['(?:%s)' % self._get_re_pattern(pattern)
+                           for pattern in self.patterns]
+            try:
+                if re_patterns:
+                    self._compiled_pattern = re.compile(
+                        '^(?:.*/)?(?:' + '|'.join(re_patterns) + ')(?:/.*)?$')
+            except (re.error, AssertionError, OverflowError):
+                # too many groups, for instance
+                pass
+        return self._compiled_pattern or None
 
     @property
     def compiled_patterns(self):
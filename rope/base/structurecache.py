@@ -0,0 +1,123 @@
+"""A persistent cache of the global names of project modules
+
+`StructureCache` keeps the global names of each python file and what
+kind of names they are.  They are saved in the project's rope folder
+so that a new `Project` can list them (when generating the autoimport
+cache, which is what uses them) without parsing unchanged modules.
+`PyModule`\s are not created from it; they still parse their source.
+It is enabled using the ``use_structure_cache`` project config.
+
+An entry is trusted if the modification time and size of its file
+(or, when these have changed, the hash of its contents) are the same
+as when it was computed.  The whole cache is dropped when used by
+another version of python.
+
+"""
+import hashlib
+import sys
+
+from rope.base import pynames, pyobjects, resourceobserver
+
+
+class StructureCache(object):
+    """Holds the structure of the python files of a project"""
+
+    def __init__(self, project):
+        self.project = project
+        self.timekeeper = resourceobserver.ChangeIndicator()
+        self.files = {}
+        self._modified = False
+        self._load_files()
+        observer = resourceobserver.ResourceObserver(
+            changed=self._forget, moved=self._forget, removed=self._forget)
+        self.project.add_observer(observer)
+        self.project.data_files.add_write_hook(self.write)
+
+    def get_global_names(self, resource):
+        """Return the global names of `resource` module
+
+        The result maps the names to their kinds; one of ``'class'``,
+        ``'function'``, ``'assigned'``, ``'module'`` (imported
+        modules), ``'imported'`` (names imported from other modules)
+        and ``'other'``.
+
+        The names are computed from the `PyModule` of `resource` when
+        the cache has no valid entry for it; so
+        `rope.base.exceptions.ModuleSyntaxError` might be raised.
+
+        """
+        entry = self.files.get(resource.path)
+        if entry is not None and self._is_valid(resource, entry):
+            return entry[2]
+        indicator = self.timekeeper.get_indicator(resource)
+        digest = _get_digest(resource)
+        names = get_global_names(self.project.get_pymodule(resource))
+        self.files[resource.path] = (indicator, digest, names)
+        self._modified = True
+        return names
+
+    def write(self):
+        if self._modified:
+            self.project.data_files.write_data(
+                'structures', (_python_version(), self.files))
+            self._modified = False
+
+    def _load_files(self):
+        result = self.project.data_files.read_data('structures')
+        if result is not None and result[0] == _python_version():
+            self.files = result[1]
+
+    def _is_valid(self, resource, entry):
+        try:
+            indicator = self.timekeeper.get_indicator(resource)
+            if entry[0] == indicator:
+                return True
+            if entry[1] != _get_digest(resource):
+                return False
+        except (IOError, OSError):
+            return False
+        self.files[resource.path] = (indicator,) + entry[1:]
+        self._modified = True
+        return True
+
+    def _forget(self, resource, new_resource=None):
+        for path in list(self.files):
+            if path == resource.path or \
+               resource.is_folder() and \
+               resource.contains(self.project.get_file(path)):
+                del self.files[path]
+                self._modified = True
+
+    def __str__(self):
+        return 'StructureCache holds %d files' % len(self.files)
+
+
+def get_global_names(pymodule):
+    """Return the global names of `pymodule`
+
+    See `StructureCache.get_global_names()`.
+    """
+    return dict((name, _get_kind(pyname)) for name, pyname
+                in pymodule._get_structural_attributes().items())
+
+
+def _get_kind(pyname):
+    if isinstance(pyname, pynames.DefinedName):
+        if isinstance(pyname.get_object(), pyobjects.AbstractClass):
+            return 'class'
+        return 'function'
+    if isinstance(pyname, pynames.AssignedName):
+        return 'assigned'
+    if isinstance(pyname, pynames.ImportedModule):
+        return 'module'
+    if isinstance(pyname, pynames.ImportedName):
+        return 'imported'
+    return 'other'
+
+
+def _get_digest(resource):
+    return hashlib.md5(resource.read_bytes()).hexdigest()
+
+
+def _python_version():
+    return tuple(sys.version_info[:2])
@@ -1,4 +1,5 @@
 import sys
+import threading
 import warnings
 
 
@@ -16,6 +17,24 @@ def saveit(func):
 cacheit = saveit
 
 
+class _PreventedRecursions(threading.local):
+
+    count = 0
+
+
+_prevented_recursions = _PreventedRecursions()
+
+
+def prevented_recursions():
+    """Return the number of recursions prevented by `prevent_recursion`
+
+    Results computed while this number changes might depend on the
+    defaults returned in those recursions and should not be cached.
+    The number is counted separately in each thread.
+    """
+    return _prevented_recursions.count
+
+
 def prevent_recursion(default):
     """A decorator that returns the return value of `default` in recursions"""
     def decorator(func):
@@ -23,6 +42,7 @@ def prevent_recursion(default):
 
         def newfunc(self, *args, **kwds):
             if getattr(self, name, False):
+                _prevented_recursions.count += 1
                 return default()
             setattr(self, name, True)
             try:
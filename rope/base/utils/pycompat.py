@@ -1,3 +1,4 @@
+import os
 import sys
 import _ast
 # from rope.base import ast
@@ -43,3 +44,27 @@ else:  # PY2
 
     def get_ast_with_items(node):
         return [node]
+
+
+try:
+    scandir = os.scandir
+except AttributeError:  # PY2 and PY34
+
+    class _DirEntry(object):
+        """A minimal `os.DirEntry` for pythons without `os.scandir()`"""
+
+        def __init__(self, folder, name):
+            self.name = name
+            self.path = os.path.join(folder, name)
+
+        def is_dir(self):
+            return os.path.isdir(self.path)
+
+        def is_file(self):
+            return os.path.isfile(self.path)
+
+        def is_symlink(self):
+            return os.path.islink(self.path)
+
+    def scandir(path):
+        return [_DirEntry(path, name) for name in os.listdir(path)]
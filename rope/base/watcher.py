@@ -0,0 +1,277 @@
+"""Watching project files for changes made by other processes
+
+On Linux, `Watcher` uses inotify (through `ctypes`) to learn about the
+files and folders that are changed, created, moved or removed in a
+project and reports them to the project's resource observers.  Unlike
+`Project.validate()`, it does not need to check every resource that
+rope is interested in.
+
+`Watcher.process_events()` should be called from the thread that uses
+the project; editors can call it when `Watcher.fileno()` becomes
+readable or, more simply, before using the project.  When the
+``use_watcher`` project config is set, `Project.validate()` calls it
+and only walks the project when some changes might have been missed.
+
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+
+from rope.base import resourceobserver
+
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | \
+    IN_CREATE | IN_DELETE | IN_ONLYDIR | IN_DONT_FOLLOW | IN_EXCL_UNLINK
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def is_supported():
+    """Return `True` if `Watcher` can be used on this system"""
+    return _get_libc() is not None
+
+
+def _get_libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                           use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, 'inotify_init1'):
+        return None
+    return libc
+
+
+class Watcher(object):
+    """Reports the changes made to project files by other processes"""
+
+    def __init__(self, project):
+        self.project = project
+        self.libc = _get_libc()
+        if self.libc is None:
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'Cannot initialize inotify')
+        self.folders = {}
+        self.timekeeper = resourceobserver.ChangeIndicator()
+        self.expected = {}
+        # whether some changes might have been missed
+        self.missed = True
+        self._watch_tree(project.root)
+        self.observer = resourceobserver.ResourceObserver(
+            changed=self._rope_changed, moved=self._rope_moved,
+            created=self._rope_changed, removed=self._rope_changed)
+        project.add_observer(self.observer)
+
+    def fileno(self):
+        """The file descriptor that becomes readable when events arrive"""
+        return self.fd
+
+    def process_events(self, timeout=0):
+        """Report the changes made since the last call to observers
+
+        It waits at most `timeout` seconds for the first event.  It
+        returns `False` if some changes might not have been reported
+        (before the first call, for instance); `Project.validate()`
+        should be used then.
+
+        """
+        if self.fd is None:
+            return False
+        events = self._read_events(timeout)
+        moved_from = {}
+        reports = []
+        for wd, mask, cookie, name in events:
+            if mask & IN_Q_OVERFLOW:
+                self.missed = True
+                continue
+            if mask & IN_IGNORED:
+                self._forget_watch(wd)
+                continue
+            if wd not in self.folders:
+                continue
+            path = _join(self.folders[wd], name)
+            is_folder = bool(mask & IN_ISDIR)
+            if mask & IN_MOVED_FROM:
+                moved_from[cookie] = (path, is_folder)
+            elif mask & IN_MOVED_TO and cookie in moved_from:
+                old_path = moved_from.pop(cookie)[0]
+                reports.append(('moved', old_path, path, is_folder))
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                reports.append(('created', path, None, is_folder))
+            elif mask & IN_DELETE:
+                reports.append(('removed', path, None, is_folder))
+            elif mask & (IN_MODIFY | IN_CLOSE_WRITE):
+                reports.append(('changed', path, None, is_folder))
+        for path, is_folder in moved_from.values():
+            reports.append(('removed', path, None, is_folder))
+        self._report(reports)
+        self.expected.clear()
+        result = not self.missed
+        self.missed = False
+        return result
+
+    def close(self):
+        """Stop watching the project"""
+        if self.fd is not None:
+            self.project.remove_observer(self.observer)
+            os.close(self.fd)
+            self.fd = None
+            self.folders.clear()
+
+    def _read_events(self, timeout):
+        result = []
+        while select.select([self.fd], [], [], timeout)[0]:
+            timeout = 0
+            try:
+                data = os.read(self.fd, 65536)
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    break
+                raise
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = \
+                    _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                result.append((wd, mask, cookie, name.decode(
+                    sys.getfilesystemencoding() or 'utf-8')))
+        return result
+
+    def _report(self, reports):
+        seen = set()
+        for kind, path, new_path, is_folder in reports:
+            if (kind, path, new_path) in seen:
+                continue
+            seen.add((kind, path, new_path))
+            resource = self._get_resource(path, is_folder)
+            if self.project.is_ignored(resource):
+                continue
+            report = self._is_unexpected(path, new_path)
+            if kind == 'moved':
+                if is_folder:
+                    self._move_watches(path, new_path)
+                if report:
+                    self._notify('resource_moved', resource,
+                                 self._get_resource(new_path, is_folder))
+            elif kind == 'removed':
+                if is_folder:
+                    self._move_watches(path, None)
+                if report:
+                    self._notify('resource_removed', resource)
+            elif kind == 'created':
+                if report:
+                    self._notify('resource_created', resource)
+                if is_folder:
+                    self._watch_tree(resource, report)
+            elif report and not is_folder:
+                self._notify('resource_changed', resource)
+
+    def _notify(self, method, *args):
+        for observer in list(self.project.observers):
+            if observer is not self.observer:
+                getattr(observer, method)(*args)
+
+    def _is_unexpected(self, path, new_path=None):
+        """Whether the change has not been made (and reported) by rope"""
+        for path_ in (path, new_path):
+            if path_ is not None and \
+               self.expected.get(path_, False) != self._get_indicator(path_):
+                return True
+        return False
+
+    def _get_resource(self, path, is_folder):
+        if is_folder:
+            return self.project.get_folder(path)
+        return self.project.get_file(path)
+
+    def _get_indicator(self, path):
+        try:
+            return self.timekeeper.get_indicator(
+                self.project.get_file(path))
+        except OSError:
+            return None
+
+    def _watch_tree(self, folder, report=False):
+        for root, dirs, files in os.walk(folder.real_path):
+            path = _relative_path(self.project.address, root)
+            if path and self.project.is_ignored(
+                    self.project.get_folder(path)):
+                del dirs[:]
+                continue
+            self._add_watch(root, path)
+            if report and root != folder.real_path:
+                self._notify('resource_created',
+                             self.project.get_folder(path))
+            if report:
+                for name in files:
+                    self._notify('resource_created',
+                                 self.project.get_file(_join(path, name)))
+
+    def _add_watch(self, real_path, path):
+        if not isinstance(real_path, bytes):
+            real_path = real_path.encode(
+                sys.getfilesystemencoding() or 'utf-8')
+        wd = self.libc.inotify_add_watch(self.fd, real_path, _WATCH_MASK)
+        if wd < 0:
+            # the folder is removed or there are too many watches
+            self.missed = True
+        else:
+            self.folders[wd] = path
+
+    def _move_watches(self, path, new_path):
+        for wd, folder in list(self.folders.items()):
+            if folder == path or folder.startswith(path + '/'):
+                if new_path is None:
+                    self.libc.inotify_rm_watch(self.fd, wd)
+                    del self.folders[wd]
+                else:
+                    self.folders[wd] = new_path + folder[len(path):]
+
+    def _forget_watch(self, wd):
+        self.folders.pop(wd, None)
+
+    def _rope_changed(self, resource):
+        self.expected[resource.path] = self._get_indicator(resource.path)
+
+    def _rope_moved(self, resource, new_resource):
+        self._rope_changed(resource)
+        self._rope_changed(new_resource)
+
+
+def _join(folder, name):
+    if not folder:
+        return name
+    if not name:
+        return folder
+    return folder + '/' + name
+
+
+def _relative_path(root, path):
+    path = os.path.relpath(path, root)
+    if path == os.curdir:
+        return ''
+    return path.replace(os.sep, '/')
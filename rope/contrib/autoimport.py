@@ -151,9 +151,14 @@ class AutoImport(object):
     def update_resource(self, resource, underlined=None):
         """Update the cache for global names in `resource`"""
         try:
-            pymodule = self.project.get_pymodule(resource)
             modname = self._module_name(resource)
-            self._add_names(pymodule, modname, underlined)
+            structure_cache = getattr(self.project, 'structure_cache', None)
+            if structure_cache is not None:
+                names = structure_cache.get_global_names(resource)
+                self._add_global_names(names, modname, underlined)
+            else:
+                pymodule = self.project.get_pymodule(resource)
+                self._add_names(pymodule, modname, underlined)
         except exceptions.ModuleSyntaxError:
             pass
 
@@ -188,6 +193,17 @@ class AutoImport(object):
                 globals.append(name)
         self.names[modname] = globals
 
+    def _add_global_names(self, names, modname, underlined):
+        if underlined is None:
+            underlined = self.underlined
+        globals = []
+        for name, kind in names.items():
+            if not underlined and name.startswith('_'):
+                continue
+            if kind in ('class', 'function', 'assigned'):
+                globals.append(name)
+        self.names[modname] = globals
+
     def _write(self):
         self.project.data_files.write_data('globalnames', self.names)
 
@@ -1,23 +1,37 @@
 import rope.base.codeanalyze
 import rope.base.evaluate
 import rope.base.pyobjects
-from rope.base import taskhandle, exceptions, worder
+from rope.base import taskhandle, exceptions, worder, parallel
 from rope.contrib import fixsyntax
 from rope.refactor import occurrences
 
 
 def find_occurrences(project, resource, offset, unsure=False, resources=None,
                      in_hierarchy=False,
-                     task_handle=taskhandle.NullTaskHandle()):
+                     task_handle=taskhandle.NullTaskHandle(), processes=None):
     """Return a list of `Location`\s
 
     If `unsure` is `True`, possible matches are returned, too.  You
     can use `Location.unsure` to see which are unsure occurrences.
     `resources` can be a list of `rope.base.resource.File`\s that
     should be searched for occurrences; if `None` all python files
-    in the project are searched.
+    in the project are searched.  `processes` overrides the value of
+    ``search_processes`` project config (see `rope.base.parallel`).
 
     """
+    finder = _create_occurrences_finder(project, resource, offset,
+                                        unsure, in_hierarchy)
+    if resources is None:
+        resources = project.get_python_files()
+    job_set = task_handle.create_jobset('Finding Occurrences',
+                                        count=len(resources))
+    return _find_locations(
+        finder, resources, job_set, processes, _create_occurrences_task,
+        (resource.path, offset, unsure, in_hierarchy))
+
+
+def _create_occurrences_finder(project, resource, offset,
+                               unsure, in_hierarchy):
     name = worder.get_name_at(resource, offset)
     this_pymodule = project.get_pymodule(resource)
     primary, pyname = rope.base.evaluate.eval_location2(
@@ -25,23 +39,31 @@ def find_occurrences(project, resource, offset, unsure=False, resources=None,
 
     def is_match(occurrence):
         return unsure
-    finder = occurrences.create_finder(
+    return occurrences.create_finder(
         project, name, pyname, unsure=is_match,
         in_hierarchy=in_hierarchy, instance=primary)
-    if resources is None:
-        resources = project.get_python_files()
-    job_set = task_handle.create_jobset('Finding Occurrences',
-                                        count=len(resources))
-    return _find_locations(finder, resources, job_set)
 
 
 def find_implementations(project, resource, offset, resources=None,
-                         task_handle=taskhandle.NullTaskHandle()):
+                         task_handle=taskhandle.NullTaskHandle(),
+                         processes=None):
     """Find the places a given method is overridden.
 
     Finds the places a method is implemented.  Returns a list of
-    `Location`\s.
+    `Location`\s.  `processes` overrides the value of
+    ``search_processes`` project config.
     """
+    finder = _create_implementations_finder(project, resource, offset)
+    if resources is None:
+        resources = project.get_python_files()
+    job_set = task_handle.create_jobset('Finding Implementations',
+                                        count=len(resources))
+    return _find_locations(
+        finder, resources, job_set, processes,
+        _create_implementations_task, (resource.path, offset))
+
+
+def _create_implementations_finder(project, resource, offset):
     name = worder.get_name_at(resource, offset)
     this_pymodule = project.get_pymodule(resource)
     pyname = rope.base.evaluate.eval_location(this_pymodule, offset)
@@ -62,12 +84,7 @@ def find_implementations(project, resource, offset, resources=None,
             return False
     filters = [is_defined, not_self,
                occurrences.InHierarchyFilter(pyname, True)]
-    finder = occurrences.Finder(project, name, filters=filters)
-    if resources is None:
-        resources = project.get_python_files()
-    job_set = task_handle.create_jobset('Finding Implementations',
-                                        count=len(resources))
-    return _find_locations(finder, resources, job_set)
+    return occurrences.Finder(project, name, filters=filters)
 
 
 def find_definition(project, code, offset, resource=None, maxfixes=1):
@@ -104,11 +121,51 @@ class Location(object):
         self.lineno = occurrence.lineno
 
 
-def _find_locations(finder, resources, job_set):
+def _find_locations(finder, resources, job_set, processes=None,
+                    create_task=None, args=()):
     result = []
+    processes = parallel.get_processes(finder.project, processes)
+    if processes > 1 and len(resources) > 1:
+        for resource, locations in parallel.map_resources(
+                finder.project, resources, create_task, args,
+                processes, job_set):
+            for region, unsure, lineno in locations:
+                result.append(_SavedLocation(resource, region,
+                                             unsure, lineno))
+        return result
     for resource in resources:
         job_set.started_job(resource.path)
         for occurrence in finder.find_occurrences(resource):
             result.append(Location(occurrence))
         job_set.finished_job()
     return result
+
+
+class _SavedLocation(Location):
+
+    def __init__(self, resource, region, unsure, lineno):
+        self.resource = resource
+        self.region = region
+        self.offset = region[0]
+        self.unsure = unsure
+        self.lineno = lineno
+
+
+def _create_occurrences_task(project, path, offset, unsure, in_hierarchy):
+    finder = _create_occurrences_finder(project, project.get_resource(path),
+                                        offset, unsure, in_hierarchy)
+    return lambda resource: _find_saved_locations(finder, resource)
+
+
+def _create_implementations_task(project, path, offset):
+    finder = _create_implementations_finder(
+        project, project.get_resource(path), offset)
+    return lambda resource: _find_saved_locations(finder, resource)
+
+
+def _find_saved_locations(finder, resource):
+    result = []
+    for occurrence in finder.find_occurrences(resource):
+        location = Location(occurrence)
+        result.append((location.region, location.unsure, location.lineno))
+    return result
@@ -299,6 +299,8 @@ class _ChangeCallsInModule(object):
         self.call_changer = call_changer
 
     def get_changed_module(self):
+        if not self.occurrence_finder.may_occur_in(self.resource):
+            return None
         word_finder = worder.Worder(self.source)
         change_collector = codeanalyze.ChangeCollector(self.source)
         for occurrence in self.occurrence_finder.find_occurrences(
@@ -350,3 +352,6 @@ class _MultipleFinders(object):
         all_occurrences.sort(key=lambda x: x.get_primary_range())
         return all_occurrences
 
+    def may_occur_in(self, resource):
+        return any(finder.may_occur_in(resource) for finder in self.finders)
+
@@ -70,6 +70,8 @@ class Finder(object):
 
     def find_occurrences(self, resource=None, pymodule=None):
         """Generate `Occurrence` instances"""
+        if resource is not None and not self.may_occur_in(resource):
+            return
         tools = _OccurrenceToolsCreator(self.project, resource=resource,
                                         pymodule=pymodule, docs=self.docs)
         for offset in self._textual_finder.find_offsets(tools.source_code):
@@ -82,6 +84,18 @@ class Finder(object):
                     yield occurrence
                 break
 
+    def may_occur_in(self, resource):
+        """Return `False` if the name surely does not occur in `resource`
+
+        The project's name index is used, if there is one; it saves
+        reading the files that do not contain the name at all.
+
+        """
+        name_index = getattr(self.project, 'name_index', None)
+        if name_index is None:
+            return True
+        return name_index.may_contain(resource, self.name)
+
 
 def create_finder(project, name, pyname, only_calls=False, imports=True,
                   unsure=None, docs=False, instance=None, in_hierarchy=False,
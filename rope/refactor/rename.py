@@ -1,7 +1,7 @@
 import warnings
 
 from rope.base import (exceptions, pyobjects, pynames, taskhandle,
-                       evaluate, worder, codeanalyze, libutils)
+                       evaluate, worder, codeanalyze, libutils, parallel)
 from rope.base.change import ChangeSet, ChangeContents, MoveResource
 from rope.refactor import occurrences
 
@@ -18,6 +18,7 @@ class Rename(object):
         """If `offset` is None, the `resource` itself will be renamed"""
         self.project = project
         self.resource = resource
+        self.offset = offset
         if offset is not None:
             self.old_name = worder.get_name_at(self.resource, offset)
             this_pymodule = self.project.get_pymodule(self.resource)
@@ -44,7 +45,7 @@ class Rename(object):
 
     def get_changes(self, new_name, in_file=None, in_hierarchy=False,
                     unsure=None, docs=False, resources=None,
-                    task_handle=taskhandle.NullTaskHandle()):
+                    task_handle=taskhandle.NullTaskHandle(), processes=None):
         """Get the changes needed for this refactoring
 
         Parameters:
@@ -64,6 +65,10 @@ class Rename(object):
           will be applied to all python files.
         - `in_file`: this argument has been deprecated; use
           `resources` instead.
+        - `processes`: the number of processes used for searching
+          the resources; it overrides ``search_processes`` project
+          config.  See `rope.base.parallel`; `unsure` should be
+          picklable for using more than one process.
 
         """
         if unsure in (True, False):
@@ -86,24 +91,42 @@ class Rename(object):
             resources = self.project.get_python_files()
         changes = ChangeSet('Renaming <%s> to <%s>' %
                             (self.old_name, new_name))
-        finder = occurrences.create_finder(
-            self.project, self.old_name, self.old_pyname, unsure=unsure,
-            docs=docs, instance=self.old_instance,
-            in_hierarchy=in_hierarchy and self.is_method())
         job_set = task_handle.create_jobset('Collecting Changes',
                                             len(resources))
-        for file_ in resources:
-            job_set.started_job(file_.path)
-            new_content = rename_in_module(finder, new_name, resource=file_)
+        for file_, new_content in self._rename_in_resources(
+                resources, new_name, unsure, docs, in_hierarchy,
+                job_set, parallel.get_processes(self.project, processes)):
             if new_content is not None:
                 changes.add_change(ChangeContents(file_, new_content))
-            job_set.finished_job()
         if self._is_renaming_a_module():
             resource = self.old_pyname.get_object().get_resource()
             if self._is_allowed_to_move(resources, resource):
                 self._rename_module(resource, new_name, changes)
         return changes
 
+    def _rename_in_resources(self, resources, new_name, unsure, docs,
+                             in_hierarchy, job_set, processes):
+        args = (self.resource.path, self.offset, new_name,
+                unsure, docs, in_hierarchy)
+        if processes > 1 and len(resources) > 1 and \
+           parallel.is_picklable(*args):
+            for result in parallel.map_resources(
+                    self.project, resources, _create_rename_task, args,
+                    processes, job_set):
+                yield result
+            return
+        finder = self._create_finder(unsure, docs, in_hierarchy)
+        for file_ in resources:
+            job_set.started_job(file_.path)
+            yield file_, rename_in_module(finder, new_name, resource=file_)
+            job_set.finished_job()
+
+    def _create_finder(self, unsure, docs, in_hierarchy):
+        return occurrences.create_finder(
+            self.project, self.old_name, self.old_pyname, unsure=unsure,
+            docs=docs, instance=self.old_instance,
+            in_hierarchy=in_hierarchy and self.is_method())
+
     def _is_allowed_to_move(self, resources, resource):
         if resource.is_folder():
             try:
@@ -188,6 +211,8 @@ def rename_in_module(occurrences_finder, new_name, resource=None,
                      reads=True, writes=True):
     """Returns the changed source or `None` if there is no changes"""
     if resource is not None:
+        if not occurrences_finder.may_occur_in(resource):
+            return None
         source_code = resource.read()
     else:
         source_code = pymodule.source_code
@@ -207,6 +232,16 @@ def rename_in_module(occurrences_finder, new_name, resource=None,
     return change_collector.get_changed()
 
 
+def _create_rename_task(project, path, offset, new_name,
+                        unsure, docs, in_hierarchy):
+    renamer = Rename(project, project.get_resource(path), offset)
+    finder = renamer._create_finder(unsure, docs, in_hierarchy)
+
+    def rename_resource(resource):
+        return rename_in_module(finder, new_name, resource=resource)
+    return rename_resource
+
+
 def _is_local(pyname):
     module, lineno = pyname.get_definition_location()
     if lineno is None:
@@ -16,6 +16,9 @@ import ropetest.advanced_oi_test
 import ropetest.runmodtest
 import ropetest.builtinstest
 import ropetest.historytest
+import ropetest.nameindextest
+import ropetest.structurecachetest
+import ropetest.watchertest
 import ropetest.simplifytest
 
 import ropetest.contrib
@@ -36,6 +39,9 @@ def suite():
     result.addTests(ropetest.runmodtest.suite())
     result.addTests(ropetest.builtinstest.suite())
     result.addTests(ropetest.historytest.suite())
+    result.addTests(ropetest.nameindextest.suite())
+    result.addTests(ropetest.structurecachetest.suite())
+    result.addTests(ropetest.watchertest.suite())
     result.addTests(ropetest.simplifytest.suite())
 
     result.addTests(ropetest.refactor.suite())
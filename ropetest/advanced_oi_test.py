@@ -5,8 +5,18 @@ try:
 except ImportError:
     import unittest
 
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+
 import rope.base.libutils
 import rope.base.oi
+import rope.base.project
+import rope.base.pycore
+import rope.base.taskhandle
+from rope.base.change import ChangeContents
 from rope.base.utils import pycompat
 from ropetest import testutils
 
@@ -32,6 +42,53 @@ class DynamicOITest(unittest.TestCase):
         self.assertEquals(pymod['a_func'].get_object(),
                           pymod['a_var'].get_object())
 
+    def test_simple_dti_using_the_trace_function(self):
+        self.project.prefs['doa_tracer'] = 'trace'
+        mod = testutils.create_module(self.project, 'mod')
+        code = 'def a_func(arg):\n    return eval("arg")\n' \
+               'a_var = a_func(a_func)\n'
+        mod.write(code)
+        self.pycore.run_module(mod).wait_process()
+        pymod = self.project.get_pymodule(mod)
+        self.assertEquals(pymod['a_func'].get_object(),
+                          pymod['a_var'].get_object())
+
+    def test_sending_the_same_data_once(self):
+        mod = testutils.create_module(self.project, 'mod')
+        code = 'def a_func(arg):\n    return arg\n' \
+               'for i in range(10):\n    a_var = a_func(a_func)\n'
+        mod.write(code)
+        runner = self.pycore.run_module(mod)
+        runner.wait_process()
+        self.assertEquals(9, runner.get_stats()['deduplicated'])
+        pymod = self.project.get_pymodule(mod)
+        self.assertEquals(pymod['a_func'].get_object(),
+                          pymod['a_var'].get_object())
+
+    def test_limiting_the_calls_recorded_for_each_function(self):
+        self.project.prefs['doa_max_calls'] = 2
+        mod = testutils.create_module(self.project, 'mod')
+        code = 'def a_func(arg):\n    return arg\n' \
+               'for i in range(10):\n    a_var = a_func(i)\n'
+        mod.write(code)
+        runner = self.pycore.run_module(mod)
+        runner.wait_process()
+        self.assertEquals(8, runner.get_stats()['skipped'])
+
+    def test_stopping_after_enough_signatures(self):
+        self.project.prefs['doa_max_signatures'] = 1
+        mod = testutils.create_module(self.project, 'mod')
+        code = 'def a_func(arg):\n    return arg\n' \
+               'a_func(a_func)\na_func([])\na_func(1)\n'
+        mod.write(code)
+        runner = self.pycore.run_module(mod)
+        runner.wait_process()
+        self.assertEquals(1, runner.get_stats()['sent'])
+        pymod = self.project.get_pymodule(mod)
+        scope = pymod['a_func'].get_object().get_scope()
+        self.assertEquals(pymod['a_func'].get_object(),
+                          scope['arg'].get_object())
+
     def test_module_dti(self):
         mod1 = testutils.create_module(self.project, 'mod1')
         mod2 = testutils.create_module(self.project, 'mod2')
@@ -706,6 +763,77 @@ class NewStaticOITest(unittest.TestCase):
         p_type = f_scope['p'].get_object().get_type()
         self.assertEquals(c_class, p_type)
 
+    def test_deferred_automatic_soa(self):
+        self.project.prefs['automatic_soa'] = True
+        self.project.prefs['defer_automatic_soa'] = True
+        self.pycore._init_automatic_soa()
+        code = 'class C(object):\n    pass\ndef f(p):\n    pass\nf(C())\n'
+        self.project.do(ChangeContents(self.mod, code))
+        self.assertTrue(self.pycore.perform_deferred_soa(10))
+        pymod = self.project.get_pymodule(self.mod)
+        c_class = pymod['C'].get_object()
+        f_scope = pymod['f'].get_object().get_scope()
+        p_type = f_scope['p'].get_object().get_type()
+        self.assertEquals(c_class, p_type)
+
+    def test_coalescing_changes_for_deferred_soa(self):
+        self.project.prefs['automatic_soa'] = True
+        self.project.prefs['defer_automatic_soa'] = True
+        self.pycore._init_automatic_soa()
+        deferred_soa = self.pycore.deferred_soa
+        deferred_soa.add(self.mod, 'old\n')
+        deferred_soa.add(self.mod, 'newer\n')
+        self.assertEquals([(self.mod, 'old\n')],
+                          list(deferred_soa.pending.items()))
+        self.pycore.cancel_deferred_soa()
+        self.assertTrue(self.pycore.perform_deferred_soa(10))
+
+    def test_deferring_soa_until_it_is_performed(self):
+        self.project.prefs['automatic_soa'] = True
+        self.project.prefs['defer_automatic_soa'] = True
+        self.pycore._init_automatic_soa()
+        code = 'class C(object):\n    pass\ndef f(p):\n    pass\nf(C())\n'
+        self.project.do(ChangeContents(self.mod, code))
+        self.assertEquals([self.mod], list(self.pycore.deferred_soa.pending))
+        self.assertFalse(self.pycore.perform_deferred_soa(0))
+        self.assertTrue(self.pycore.perform_deferred_soa())
+        self.assertEquals([], list(self.pycore.deferred_soa.pending))
+
+    def test_performing_deferred_soa_when_closing_project(self):
+        self.project.prefs['automatic_soa'] = True
+        self.project.prefs['defer_automatic_soa'] = True
+        self.pycore._init_automatic_soa()
+        code = 'class C(object):\n    pass\ndef f(p):\n    pass\nf(C())\n'
+        self.project.do(ChangeContents(self.mod, code))
+        self.project.close()
+        self.assertEquals([], list(self.pycore.deferred_soa.pending))
+        pymod = self.project.get_pymodule(self.mod)
+        c_class = pymod['C'].get_object()
+        f_scope = pymod['f'].get_object().get_scope()
+        p_type = f_scope['p'].get_object().get_type()
+        self.assertEquals(c_class, p_type)
+
+    def test_closing_project_when_deferred_soa_fails(self):
+        self.project.prefs['automatic_soa'] = True
+        self.project.prefs['defer_automatic_soa'] = True
+        self.pycore._init_automatic_soa()
+        self.pycore.deferred_soa.add(self.mod, 'old\n')
+        written = []
+        self.project.data_files.add_write_hook(lambda: written.append(True))
+        perform_soa = rope.base.pycore.perform_soa_on_changed_scopes
+
+        def failing_perform_soa(project, resource, old_contents):
+            raise ValueError()
+        rope.base.pycore.perform_soa_on_changed_scopes = failing_perform_soa
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                self.project.close()
+        finally:
+            rope.base.pycore.perform_soa_on_changed_scopes = perform_soa
+        self.assertEquals(1, len(caught))
+        self.assertEquals([True], written)
+
     def test_report_libutils_and_analyze_all_modules(self):
         code = 'class C(object):\n    pass\ndef f(p):\n    pass\nf(C())\n'
         self.mod.write(code)
@@ -716,6 +844,93 @@ class NewStaticOITest(unittest.TestCase):
         p_type = f_scope['p'].get_object().get_type()
         self.assertEquals(c_class, p_type)
 
+    def test_updating_inferred_objects_after_analyzing_modules(self):
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod2.write('import mod\nmod.f(mod.C())\n')
+        self.mod.write('class C(object):\n    pass\ndef f(p):\n    pass\n')
+        pymod = self.project.get_pymodule(self.mod)
+        f_scope = pymod['f'].get_object().get_scope()
+        self.assertNotEquals(pymod['C'].get_object(),
+                             f_scope['p'].get_object().get_type())
+        self.pycore.analyze_module(mod2)
+        self.assertEquals(pymod['C'].get_object(),
+                          f_scope['p'].get_object().get_type())
+
+    def test_keeping_unrelated_inferred_objects_when_analyzing(self):
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod2.write('class C(object):\n    pass\na_var = C()\n')
+        self.mod.write('def f(p):\n    pass\nf(1)\n')
+        pymod2 = self.project.get_pymodule(mod2)
+        a_var = pymod2['a_var'].get_object()
+        self.pycore.analyze_module(self.mod)
+        self.assertTrue(a_var is pymod2['a_var'].get_object())
+
+    def test_analyzing_all_modules_in_parallel(self):
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod2.write('import mod\nmod.f(mod.C())\n')
+        self.mod.write('class C(object):\n    pass\ndef f(p):\n    pass\n')
+        rope.base.libutils.analyze_modules(self.project, processes=2)
+        pymod = self.project.get_pymodule(self.mod)
+        c_class = pymod['C'].get_object()
+        f_scope = pymod['f'].get_object().get_scope()
+        p_type = f_scope['p'].get_object().get_type()
+        self.assertEquals(c_class, p_type)
+
+    def test_resuming_the_analysis_of_all_modules(self):
+        self.project.prefs['save_objectdb'] = True
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod2.write('import mod\nmod.f(mod.C())\n')
+        self.mod.write('class C(object):\n    pass\ndef f(p):\n    pass\n')
+        rope.base.libutils.analyze_modules(self.project)
+        mod2.write('import mod\nmod.f(mod.C())\nmod.f(1)\n')
+        handle = rope.base.taskhandle.TaskHandle()
+        rope.base.libutils.analyze_modules(self.project, handle, resume=True)
+        self.assertEquals(1, handle.get_jobsets()[0].count)
+
+    def test_resuming_the_analysis_after_a_crash(self):
+        self.project.prefs['save_objectdb'] = True
+        code = 'class C(object):\n    pass\ndef f(p):\n    pass\nf(C())\n'
+        for index in range(8):
+            testutils.create_module(self.project, 'mod%d' % index).write(code)
+        ropefolder = self.project.ropefolder.real_path
+        snapshot = os.path.join(tempfile.mkdtemp(), 'snapshot')
+        analyze_module = rope.base.libutils.analyze_module
+        progress_class = rope.base.libutils._AnalysisProgress
+        analyzed = []
+
+        def crashing_analyze_module(project, resource):
+            if len(analyzed) == 6:
+                # what is on disk when the process is killed
+                shutil.copytree(ropefolder, snapshot)
+                raise _Crash()
+            analyzed.append(resource)
+            analyze_module(project, resource)
+        rope.base.libutils.analyze_module = crashing_analyze_module
+        rope.base.libutils._AnalysisProgress = \
+            lambda project: progress_class(project, interval=2)
+        try:
+            self.assertRaises(_Crash, rope.base.libutils.analyze_modules,
+                              self.project)
+        finally:
+            rope.base.libutils.analyze_module = analyze_module
+            rope.base.libutils._AnalysisProgress = progress_class
+        shutil.rmtree(ropefolder)
+        shutil.copytree(snapshot, ropefolder)
+        shutil.rmtree(os.path.dirname(snapshot))
+        project = rope.base.project.Project(self.project.address,
+                                            save_objectdb=True)
+        try:
+            handle = rope.base.taskhandle.TaskHandle()
+            rope.base.libutils.analyze_modules(project, handle, resume=True)
+            # four modules were saved at the checkpoints before crashing
+            self.assertEquals(len(project.get_python_files()) - 4,
+                              handle.get_jobsets()[0].count)
+            files = project.pycore.object_info.objectdb.get_files()
+            for index in range(8):
+                self.assertTrue('mod%d.py' % index in files)
+        finally:
+            project.close()
+
     def test_validation_problems_for_objectdb_retrievals(self):
         mod1 = testutils.create_module(self.project, 'mod1')
         mod2 = testutils.create_module(self.project, 'mod2')
@@ -733,6 +948,42 @@ class NewStaticOITest(unittest.TestCase):
         self.assertNotEquals(c_class, var_pyname.get_object().get_type(),
                              'Class `C` no more exists')
 
+    def test_moving_files_not_validated_yet(self):
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod2.write('class C(object):\n    pass\n')
+        self.mod.write('import mod2\ndef f(p):\n    pass\nf(mod2.C())\n')
+        self.pycore.analyze_module(self.mod)
+        object_info = self.pycore.object_info
+        object_info.objectdb.validate_lazily()
+        object_info.observer.clear_resources()
+        self.mod.move('newmod.py')
+        self.assertTrue('newmod.py' in
+                        object_info.objectdb.get_unvalidated_files())
+        pymod = self.project.get_module('newmod')
+        c_class = self.project.get_pymodule(mod2)['C'].get_object()
+        f_scope = pymod['f'].get_object().get_scope()
+        self.assertEquals(c_class, f_scope['p'].get_object().get_type())
+        self.assertFalse('newmod.py' in
+                         object_info.objectdb.get_unvalidated_files())
+
+    def test_validating_objectdb_in_background(self):
+        self.mod.write('def f(p):\n    pass\nf(1)\n')
+        self.pycore.analyze_module(self.mod)
+        objectdb = self.pycore.object_info.objectdb
+        objectdb.validate_lazily()
+        os.remove(self.mod.real_path)
+        threads = []
+        get_resource = self.project.get_resource
+
+        def recording_get_resource(name):
+            threads.append(threading.current_thread())
+            return get_resource(name)
+        self.project.get_resource = recording_get_resource
+        objectdb.validate_in_background().join()
+        self.assertEquals([], threads)
+        objectdb.write()
+        self.assertFalse('mod.py' in objectdb.get_files())
+
     def test_validation_problems_for_changing_builtin_types(self):
         mod1 = testutils.create_module(self.project, 'mod1')
         mod1.write('l = []\nl.append("")\n')
@@ -768,6 +1019,10 @@ class NewStaticOITest(unittest.TestCase):
         self.assertEquals(a_class, x_var)
 
 
+class _Crash(Exception):
+    pass
+
+
 def suite():
     result = unittest.TestSuite()
     result.addTests(unittest.makeSuite(DynamicOITest))
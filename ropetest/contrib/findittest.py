@@ -65,6 +65,31 @@ class FindItTest(unittest.TestCase):
         self.assertEquals(1, len(result1))
         self.assertEquals(2, len(result2))
 
+    def test_finding_occurrences_in_more_than_one_process(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod1.write('a_var = 1\n')
+        mod2.write('import mod1\nmy_var = mod1.a_var\n')
+        result = find_occurrences(self.project, mod1, 1,
+                                  resources=[mod1, mod2], processes=2)
+        self.assertEquals([(mod1, 0), (mod2, mod2.read().index('a_var'))],
+                          [(location.resource, location.offset)
+                           for location in result])
+        self.assertEquals([1, 2], [location.lineno for location in result])
+
+    def test_finding_implementations_in_more_than_one_process(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod1.write('class A(object):\n    def f(self):\n        pass\n')
+        mod2.write('import mod1\nclass B(mod1.A):\n'
+                   '    def f(self):\n        pass\n')
+        offset = mod1.read().index('f(')
+        result = find_implementations(self.project, mod1, offset,
+                                      processes=2)
+        self.assertEquals([(mod2, mod2.read().index('f('))],
+                          [(location.resource, location.offset)
+                           for location in result])
+
     def test_trivial_find_implementations(self):
         mod1 = testutils.create_module(self.project, 'mod1')
         mod1.write('class A(object):\n    def f(self):\n        pass\n')
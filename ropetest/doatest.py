@@ -75,6 +75,21 @@ class DOATest(unittest.TestCase):
         # Make sure the exploit did not run
         self.assertEqual(1, len(received_objs))
 
+    def test_receiving_batches_and_stats(self):
+        receiver = doa._SocketReceiver()
+
+        payload = b''
+        for message in (['data1', 'data2'], {'sent': 2}, ['data3']):
+            pickled_data = base64.b64encode(
+                pickle.dumps(message, pickle.HIGHEST_PROTOCOL))
+            digest = hmac.new(receiver.key, pickled_data,
+                              hashlib.sha256).digest()
+            payload += base64.b64encode(digest) + b':' + pickled_data + b'\n'
+        received_objs = self.try_CVE_2014_3539_exploit(receiver, payload)
+
+        self.assertEqual(['data1', 'data2', 'data3'], received_objs)
+        self.assertEqual({'sent': 2}, receiver.stats)
+
     def test_compare_digest_compat(self):
         self.assertTrue(doa._compat_compare_digest('', ''))
         self.assertTrue(doa._compat_compare_digest('abc', 'abc'))
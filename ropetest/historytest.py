@@ -276,6 +276,104 @@ class IsolatedHistoryTest(unittest.TestCase):
         self.assertEquals('', self.file1.read())
         self.assertEquals('2', self.file2.read())
 
+    def test_keeping_only_the_differences_of_performed_changes(self):
+        contents = ''.join('line%d\n' % i for i in range(100))
+        self.file1.write(contents)
+        change = rope.base.change.ChangeContents(
+            self.file1, contents.replace('line50', 'new_line'))
+        self.history.do(change)
+        self.assertEquals(contents, change._contents['old'])
+        self.history.do(rope.base.change.ChangeContents(self.file2, '2'))
+        self.assertTrue(change._contents is None)
+        self.assertEquals(contents, change.old_contents)
+        self.history.undo()
+        self.history.undo()
+        self.assertEquals(contents, self.file1.read())
+        self.history.redo()
+        self.assertEquals(contents.replace('line50', 'new_line'),
+                          self.file1.read())
+
+    def test_keeping_only_the_differences_of_changes_to_a_file(self):
+        contents = ''.join('line%d\n' % i for i in range(100))
+        self.file1.write(contents)
+        contents1 = contents.replace('line50', 'new_line')
+        contents2 = contents1.replace('line60', 'new_line')
+        change1 = rope.base.change.ChangeContents(self.file1, contents1)
+        self.history.do(change1)
+        self.history.do(rope.base.change.ChangeContents(self.file1,
+                                                        contents2))
+        self.assertTrue(change1._contents is None)
+        self.history.undo()
+        self.assertEquals(contents1, change1.new_contents)
+        self.history.undo()
+        self.assertEquals(contents, self.file1.read())
+        self.history.redo()
+        self.history.redo()
+        self.assertEquals(contents2, self.file1.read())
+
+    def test_keeping_contents_when_differences_are_large(self):
+        self.file1.write('1\n')
+        change = rope.base.change.ChangeContents(self.file1, '2\n')
+        self.history.do(change)
+        self.history.do(rope.base.change.ChangeContents(self.file2, '2'))
+        self.assertEquals('1\n', change._contents['old'])
+        self.history.undo()
+        self.history.undo()
+        self.assertEquals('1\n', self.file1.read())
+
+    def test_undoing_the_last_change_to_externally_changed_files(self):
+        contents = ''.join('line%d\n' % i for i in range(100))
+        self.file1.write(contents)
+        self.history.do(rope.base.change.ChangeContents(
+            self.file1, contents.replace('line50', 'new_line')))
+        with open(self.file1.real_path, 'w') as output:
+            output.write('changed\n')
+        self.history.undo()
+        self.assertEquals(contents, self.file1.read())
+
+    def test_undoing_compacted_changes_to_externally_changed_files(self):
+        contents = ''.join('line%d\n' % i for i in range(100))
+        self.file1.write(contents)
+        change = rope.base.change.ChangeContents(
+            self.file1, contents.replace('line50', 'new_line'))
+        self.history.do(change)
+        self.history.do(rope.base.change.ChangeContents(self.file2, '2'))
+        with open(self.file1.real_path, 'w') as output:
+            output.write('changed\n')
+        self.assertRaises(exceptions.HistoryError,
+                          self.history.undo, change)
+
+    def test_describing_changes_to_moved_files(self):
+        pkg = self.project.root.create_folder('pkg')
+        mod = pkg.create_file('mod.py')
+        contents = ''.join('line%d\n' % i for i in range(100))
+        mod.write(contents)
+        changes = rope.base.change.ChangeSet('moving pkg')
+        changes.add_change(rope.base.change.ChangeContents(
+            mod, contents.replace('line50', 'new_line')))
+        changes.add_change(rope.base.change.MoveResource(pkg, 'newpkg'))
+        self.history.do(changes)
+        self.assertTrue('+new_line' in
+                        self.history.undo_list[-1].get_description())
+        self.history.do(rope.base.change.ChangeContents(self.file2, '2'))
+        self.assertTrue('+new_line' in changes.get_description())
+        self.history.undo()
+        self.history.undo()
+        self.assertEquals(contents, mod.read())
+
+    def test_describing_compacted_changes_to_moved_files(self):
+        contents = ''.join('line%d\n' % i for i in range(100))
+        self.file1.write(contents)
+        change = rope.base.change.ChangeContents(
+            self.file1, contents.replace('line50', 'new_line'))
+        self.history.do(change)
+        self.history.do(rope.base.change.ChangeContents(self.file2, '2'))
+        self.history.do(rope.base.change.MoveResource(self.file1,
+                                                      'file3.txt'))
+        self.assertEquals(
+            '--- a/file1.txt\n+++ b/file1.txt\n@@ -51 +51 @@\n'
+            '-line50\n+new_line\n', change.get_description())
+
 
 class SavingHistoryTest(unittest.TestCase):
 
@@ -404,6 +502,109 @@ class SavingHistoryTest(unittest.TestCase):
         history.redo()
         self.assertTrue(myfile.exists())
 
+    def test_saving_changes_when_they_are_done(self):
+        self.project.set('save_history', True)
+        history = rope.base.history.History(self.project)
+        myfile = self.project.get_file('myfile.txt')
+        history.do(rope.base.change.CreateResource(myfile))
+
+        history = rope.base.history.History(self.project)
+        history.undo()
+        self.assertFalse(myfile.exists())
+
+    def test_loading_change_sets_when_needed(self):
+        self.project.set('save_history', True)
+        history = rope.base.history.History(self.project)
+        myfile = self.project.root.create_file('myfile.txt')
+        changes = rope.base.change.ChangeSet('changing myfile')
+        changes.add_change(rope.base.change.ChangeContents(myfile, '1'))
+        history.do(changes)
+
+        history = rope.base.history.History(self.project)
+        loaded = history.undo_list[0]
+        self.assertEquals('changing myfile', loaded.description)
+        self.assertEquals(set([myfile]), loaded.get_changed_resources())
+        self.assertFalse(loaded.loaded)
+        history.undo()
+        self.assertEquals('', myfile.read())
+
+    def test_saving_the_differences_of_changes_in_the_journal(self):
+        self.project.set('save_history', True)
+        history = rope.base.history.History(self.project)
+        myfile = self.project.root.create_file('myfile.txt')
+        contents = ''.join('line%d\n' % i for i in range(1000))
+        myfile.write(contents)
+        for i in range(10):
+            history.do(rope.base.change.ChangeContents(
+                myfile, myfile.read().replace('line%d\n' % i, '')))
+        self.assertTrue(history._journal.size < len(contents))
+        history = rope.base.history.History(self.project)
+        for i in range(10):
+            history.undo()
+        self.assertEquals(contents, myfile.read())
+
+    def test_compacting_the_journal(self):
+        self.project.set('save_history', True)
+        self.project.set('max_history_items', 2)
+        history = rope.base.history.History(self.project)
+        myfile = self.project.root.create_file('myfile.txt')
+        for i in range(30):
+            history.do(rope.base.change.ChangeContents(myfile, str(i)))
+        history.write()
+        self.assertTrue(history._journal.records <= 20)
+
+        history = rope.base.history.History(self.project)
+        self.assertEquals(2, len(history.undo_list))
+        history.undo()
+        self.assertEquals('28', myfile.read())
+
+    def test_importing_old_history_files(self):
+        myfile = self.project.root.create_file('myfile.txt')
+        self.project.set('save_history', True)
+        data = self.to_data(rope.base.change.ChangeContents(myfile, '1', ''))
+        self.project.data_files.write_data('history', [[data], []])
+        history = rope.base.history.History(self.project)
+        history.write()
+        self.assertFalse(self.project.data_files.open_data('history'))
+
+        history = rope.base.history.History(self.project)
+        myfile.write('1')
+        history.undo(history.undo_list[0])
+        self.assertEquals('', myfile.read())
+
+    def test_saving_compressed_history(self):
+        self.project.set('save_history', True)
+        self.project.set('compress_history', True)
+        history = rope.base.history.History(self.project)
+        myfile = self.project.root.create_file('myfile.txt')
+        changes = rope.base.change.ChangeSet('changing myfile')
+        changes.add_change(rope.base.change.ChangeContents(myfile, '1'))
+        history.do(changes)
+        history.undo()
+
+        history = rope.base.history.History(self.project)
+        history.redo()
+        self.assertEquals('1', myfile.read())
+
+    def test_saving_the_differences_of_changes(self):
+        self.project.set('save_history', True)
+        contents = ''.join('line%d\n' % i for i in range(100))
+        myfile = self.project.root.create_file('myfile.txt')
+        myfile.write(contents)
+        history = rope.base.history.History(self.project)
+        changes = rope.base.change.ChangeSet('changing myfile')
+        changes.add_change(rope.base.change.ChangeContents(
+            myfile, contents.replace('line50', 'new_line')))
+        history.do(changes)
+        history.undo()
+
+        history = rope.base.history.History(self.project)
+        history.redo()
+        self.assertEquals(contents.replace('line50', 'new_line'),
+                          myfile.read())
+        history.undo()
+        self.assertEquals(contents, myfile.read())
+
 
 def suite():
     result = unittest.TestSuite()
@@ -0,0 +1,150 @@
+import os
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import rope.base.nameindex
+from rope.contrib import findit
+from rope.refactor import rename
+from ropetest import testutils
+
+
+class NameIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        super(NameIndexTest, self).setUp()
+        self.project = testutils.sample_project(use_name_index=True)
+        self.index = self.project.name_index
+
+    def tearDown(self):
+        testutils.remove_project(self.project)
+        super(NameIndexTest, self).tearDown()
+
+    def test_names_in_files(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod1.write('a_var = 1\n')
+        mod2.write('another_var = 1\n')
+        self.assertTrue(self.index.may_contain(mod1, 'a_var'))
+        self.assertFalse(self.index.may_contain(mod2, 'a_var'))
+        self.assertEquals([mod1], self.index.get_resources('a_var'))
+
+    def test_not_indexing_partial_words(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var1 = 1\n')
+        self.assertFalse(self.index.may_contain(mod, 'a_var'))
+
+    def test_non_identifiers_are_not_ruled_out(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        self.assertTrue(self.index.may_contain(mod, 'a.b'))
+
+    def test_updating_changed_files(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        mod.write('b_var = 1\n')
+        self.assertFalse(self.index.may_contain(mod, 'a_var'))
+        self.assertTrue(self.index.may_contain(mod, 'b_var'))
+
+    def test_moving_files(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        mod.move('newmod.py')
+        newmod = self.project.get_file('newmod.py')
+        self.assertEquals([newmod], self.index.get_resources('a_var'))
+
+    def test_moving_folders(self):
+        pkg = testutils.create_package(self.project, 'pkg')
+        mod = testutils.create_module(self.project, 'mod', pkg)
+        mod.write('a_var = 1\n')
+        pkg.move('newpkg')
+        newmod = self.project.get_file('newpkg/mod.py')
+        self.assertEquals([newmod], self.index.get_resources('a_var'))
+
+    def test_removing_folders(self):
+        pkg = testutils.create_package(self.project, 'pkg')
+        mod = testutils.create_module(self.project, 'mod', pkg)
+        mod.write('a_var = 1\n')
+        pkg.remove()
+        self.assertEquals([], self.index.get_resources('a_var'))
+
+    def test_rebuilding(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        self.index.files.clear()
+        self.index.names.clear()
+        self.index.rebuild()
+        self.assertEquals([mod], self.index.get_resources('a_var'))
+
+    def test_validating_externally_changed_files(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        testutils.write_externally(mod, 'b_var = 1\n')
+        self.project.validate()
+        self.assertFalse(self.index.may_contain(mod, 'a_var'))
+        self.assertTrue(self.index.may_contain(mod, 'b_var'))
+
+    def test_validating_entries(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        testutils.write_externally(mod, 'b_var = 1\n')
+        self.assertFalse(self.index.may_contain(mod, 'b_var'))
+        index = rope.base.nameindex.NameIndex(self.project, validate=True)
+        self.assertTrue(index.may_contain(mod, 'b_var'))
+
+    def test_saving_the_index(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        self.project.close()
+        index = rope.base.nameindex.NameIndex(self.project)
+        self.assertEquals([mod], index.get_resources('a_var'))
+
+    def test_dropping_files_changed_while_closed(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        self.project.close()
+        testutils.write_externally(mod, 'b_var = 1\n')
+        index = rope.base.nameindex.NameIndex(self.project)
+        self.assertEquals([], index.get_resources('a_var'))
+        self.assertTrue(index.may_contain(mod, 'b_var'))
+
+    def test_dropping_files_removed_while_closed(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        self.project.close()
+        os.remove(mod.real_path)
+        index = rope.base.nameindex.NameIndex(self.project)
+        self.assertEquals([], index.get_resources('a_var'))
+
+    def test_skipping_files_in_renames(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod1.write('a_var = 1\n')
+        mod2.write('import mod1\n')
+        testutils.write_externally(mod2, 'import mod1\nprint(mod1.a_var)\n')
+        renamer = rename.Rename(self.project, mod1, 1)
+        changes = renamer.get_changes('new_var')
+        self.assertEquals([mod1], list(changes.get_changed_resources()))
+        self.project.validate()
+        changes = renamer.get_changes('new_var')
+        self.assertEquals(set([mod1, mod2]), changes.get_changed_resources())
+
+    def test_skipping_files_in_finding_occurrences(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod1.write('a_var = 1\n')
+        mod2.write('import mod1\nprint(mod1.a_var)\n')
+        result = findit.find_occurrences(self.project, mod1, 1)
+        self.assertEquals(set([mod1, mod2]),
+                          set(location.resource for location in result))
+
+
+def suite():
+    result = unittest.TestSuite()
+    result.addTests(unittest.makeSuite(NameIndexTest))
+    return result
+
+
+if __name__ == '__main__':
+    unittest.main()
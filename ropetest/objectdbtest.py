@@ -3,8 +3,10 @@ try:
 except ImportError:
     import unittest
 
+import threading
 
-from rope.base.oi import objectdb, memorydb
+import rope.base.oi.objectinfo
+from rope.base.oi import objectdb, memorydb, sqlitedb
 from ropetest import testutils
 
 
@@ -26,6 +28,10 @@ class _MockValidation(object):
     def is_file_valid(self, path):
         return path != 'invalid'
 
+    def get_real_path(self, path):
+        if path != 'invalid':
+            return __file__
+
     def is_scope_valid(self, path, key):
         return path != 'invalid' and key != 'invalid'
 
@@ -40,6 +46,9 @@ class _MockFileListObserver(object):
     def removed(self, path):
         self.log += 'removed %s ' % path
 
+    def validated(self, path):
+        self.log += 'validated %s ' % path
+
 
 class ObjectDBTest(unittest.TestCase):
 
@@ -48,7 +57,8 @@ class ObjectDBTest(unittest.TestCase):
         self.project = testutils.sample_project()
         validation = _MockValidation()
         self.dbs = [
-            objectdb.ObjectDB(memorydb.MemoryDB(self.project), validation)]
+            objectdb.ObjectDB(memorydb.MemoryDB(self.project), validation),
+            objectdb.ObjectDB(sqlitedb.SQLiteDB(self.project), validation)]
 
     def tearDown(self):
         for db in self.dbs:
@@ -153,10 +163,116 @@ class ObjectDBTest(unittest.TestCase):
         db.validate_files()
         self.assertEquals('removed invalid ', observer.log)
 
+    @_do_for_all_dbs
+    def test_validating_files_lazily(self, db):
+        db.add_callinfo('invalid', 'key', (1, 2), 3)
+        db.add_callinfo('file', 'invalid', (1, 2), 3)
+        db.add_callinfo('file', 'key', (1, 2), 3)
+        db.validate_lazily()
+        self.assertEquals(2, len(db.get_files()))
+        self.assertEquals(3, db.get_returned('file', 'key', (1, 2)))
+        self.assertEquals(None, db.get_returned('invalid', 'key', (1, 2)))
+        self.assertEquals(['file'], list(db.get_files()))
+        stats = db.get_stats()
+        self.assertEquals((1, 2), (stats['pruned_files'],
+                                   stats['pruned_scopes']))
+        self.assertEquals(0, stats['unvalidated'])
+
+    @_do_for_all_dbs
+    def test_validating_files_in_background(self, db):
+        db.add_callinfo('invalid', 'key', (1, 2), 3)
+        db.add_callinfo('file', 'key', (1, 2), 3)
+        db.validate_lazily()
+        db.validate_in_background().join()
+        db.write()
+        self.assertEquals(['file'], list(db.get_files()))
+        self.assertEquals(1, db.get_stats()['unvalidated'])
+
+
+class SQLiteDBTest(unittest.TestCase):
+
+    def setUp(self):
+        super(SQLiteDBTest, self).setUp()
+        self.project = testutils.sample_project()
+        self.validation = _MockValidation()
+
+    def tearDown(self):
+        testutils.remove_project(self.project)
+        super(SQLiteDBTest, self).tearDown()
+
+    def _open_db(self):
+        return objectdb.ObjectDB(sqlitedb.SQLiteDB(self.project),
+                                 self.validation)
+
+    def test_saving_changed_scopes(self):
+        db = self._open_db()
+        db.add_pername('file', 'key', 'name', 1)
+        db.add_callinfo('file', 'key', (1, 2), 3)
+        db.write()
+        db = self._open_db()
+        self.assertEquals(1, db.get_pername('file', 'key', 'name'))
+        self.assertEquals(3, db.get_returned('file', 'key', (1, 2)))
+
+    def test_loading_files_when_needed(self):
+        db = self._open_db()
+        db.add_pername('file1', 'key', 'name', 1)
+        db.add_pername('file2', 'key', 'name', 2)
+        db.write()
+        db = self._open_db()
+        self.assertEquals(2, db.get_pername('file2', 'key', 'name'))
+        self.assertEquals(['file2'], list(db.db._loaded))
+
+    def test_saving_removed_and_moved_files(self):
+        db = self._open_db()
+        db.add_pername('file1', 'key', 'name', 1)
+        db.add_pername('file2', 'key', 'name', 2)
+        db.write()
+        db.file_moved('file1', 'file3')
+        del db.files['file2']
+        db.write()
+        db = self._open_db()
+        self.assertEquals(['file3'], list(db.get_files()))
+        self.assertEquals(1, db.get_pername('file3', 'key', 'name'))
+
+    def test_using_the_database_in_several_threads(self):
+        db = self._open_db()
+
+        def add_and_write(index):
+            for i in range(20):
+                db.add_pername('file%d' % index, 'key', 'name%d' % i, i)
+                db.write()
+        threads = [threading.Thread(target=add_and_write, args=(index,))
+                   for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        db.write()
+        db = self._open_db()
+        for index in range(4):
+            self.assertEquals(19, db.get_pername('file%d' % index,
+                                                 'key', 'name19'))
+
+    def test_importing_pickled_objectdb(self):
+        db = objectdb.ObjectDB(memorydb.MemoryDB(self.project, persist=True),
+                               self.validation)
+        db.add_pername('file', 'key', 'name', 1)
+        db.write()
+        db = self._open_db()
+        self.assertEquals(1, db.get_pername('file', 'key', 'name'))
+
+    def test_selecting_the_backend(self):
+        self.project.prefs['objectdb_backend'] = 'sqlite'
+        self.project.prefs['save_objectdb'] = True
+        object_info = rope.base.oi.objectinfo.ObjectInfoManager(self.project)
+        self.assertTrue(isinstance(object_info.objectdb.db,
+                                   sqlitedb.SQLiteDB))
+
 
 def suite():
     result = unittest.TestSuite()
     result.addTests(unittest.makeSuite(ObjectDBTest))
+    result.addTests(unittest.makeSuite(SQLiteDBTest))
     return result
 
 
@@ -497,6 +497,37 @@ class ProjectTest(unittest.TestCase):
         finally:
             testutils.remove_project(project2)
 
+    def test_get_files_after_changing_folders(self):
+        folder = self.project.root.create_folder('folder')
+        file1 = folder.create_file('file1.txt')
+        subfolder = folder.create_folder('subfolder')
+        file2 = subfolder.create_file('file2.txt')
+        sample = self.project.get_resource(self.sample_file)
+        self.assertEquals(set([sample, file1, file2]),
+                          self.project.get_files())
+        folder.move('newfolder')
+        newfolder = self.project.get_resource('newfolder')
+        self.assertEquals(set([sample, newfolder.get_child('file1.txt'),
+                               newfolder.get_child('subfolder/file2.txt')]),
+                          self.project.get_files())
+        newfolder.get_child('subfolder').remove()
+        self.assertEquals(set([sample, newfolder.get_child('file1.txt')]),
+                          self.project.get_files())
+
+    def test_get_files_after_validating_folders(self):
+        folder = self.project.root.create_folder('folder')
+        self.assertEquals(1, len(self.project.get_files()))
+        open(os.path.join(folder.real_path, 'myfile.txt'), 'w').close()
+        self.project.validate(folder)
+        self.assertTrue(folder.get_child('myfile.txt') in
+                        self.project.get_files())
+
+    def test_not_changing_returned_files(self):
+        files = self.project.get_files()
+        self.project.root.create_file('myfile.txt')
+        self.assertEquals(1, len(files))
+        self.assertEquals(2, len(self.project.get_files()))
+
     def test_getting_empty_source_folders(self):
         self.assertEquals([], self.project.get_source_folders())
 
@@ -549,6 +580,33 @@ class ProjectTest(unittest.TestCase):
         self.assertTrue(self.project.root in source_folders and
                         src in source_folders)
 
+    def test_source_folders_after_creating_and_removing_modules(self):
+        self.assertEquals([], self.project.get_source_folders())
+        src = self.project.root.create_folder('src')
+        mod = src.create_file('mod.py')
+        self.assertEquals([src], self.project.get_source_folders())
+        mod.move('src/mod.txt')
+        self.assertEquals([], self.project.get_source_folders())
+        src.remove()
+        self.assertEquals([], self.project.get_source_folders())
+
+    def test_refreshing_source_folders(self):
+        self.assertEquals([], self.project.get_source_folders())
+        os.mkdir(os.path.join(self.project.address, 'src'))
+        open(os.path.join(self.project.address, 'src', 'mod.py'), 'w').close()
+        self.assertEquals([], self.project.get_source_folders())
+        self.assertEquals(None, self.project.find_module('mod'))
+        self.project.refresh_source_folders()
+        src = self.project.get_resource('src')
+        self.assertEquals([src], self.project.get_source_folders())
+        self.assertEquals(src.get_child('mod.py'),
+                          self.project.find_module('mod'))
+
+    def test_optional_caches_are_disabled_by_default(self):
+        self.assertTrue(self.project.name_index is None)
+        self.assertTrue(self.project.structure_cache is None)
+        self.assertTrue(self.project.watcher is None)
+
 
 class ResourceObserverTest(unittest.TestCase):
 
@@ -715,6 +773,22 @@ class ResourceObserverTest(unittest.TestCase):
         my_folder.move('new_folder')
         self.assertEquals(2, sample_observer.change_count)
 
+    def test_moving_folders_with_similarly_named_siblings(self):
+        root = self.project.root
+        my_folder = root.create_folder('folder')
+        my_file = my_folder.create_file('myfile.txt')
+        others = [root.create_folder('folder2').create_file('myfile.txt'),
+                  root.create_folder('folder-a').create_file('myfile.txt'),
+                  root.create_file('folder.txt')]
+        sample_observer = _SampleObserver()
+        self.project.add_observer(
+            FilteredResourceObserver(sample_observer, [my_file] + others))
+        my_folder.move('new_folder')
+        self.assertEquals(1, sample_observer.change_count)
+        self.assertEquals(
+            (my_file, self.project.get_file('new_folder/myfile.txt')),
+            sample_observer.last_moved)
+
     def test_contains_for_folders(self):
         folder1 = self.project.root.create_folder('folder')
         folder2 = self.project.root.create_folder('folder2')
@@ -944,6 +1018,19 @@ class RopeFolderTest(unittest.TestCase):
         myfile.create()
         self.assertEquals(0, len(self.project.get_files()))
 
+    def test_ignored_folders_and_get_files_after_changes(self):
+        self.project = testutils.sample_project(
+            ignored_resources=['ignored'], ropefolder=None)
+        self.assertEquals(0, len(self.project.get_files()))
+        ignored = self.project.root.create_folder('ignored')
+        ignored.create_file('myfile.txt')
+        folder = self.project.root.create_folder('folder')
+        folder.create_file('myfile.txt')
+        self.assertEquals(set([folder.get_child('myfile.txt')]),
+                          self.project.get_files())
+        folder.move('ignored/folder')
+        self.assertEquals(0, len(self.project.get_files()))
+
     def test_ignored_resources_and_get_files2(self):
         self.project = testutils.sample_project(
             ignored_resources=['myfile.txt'], ropefolder=None)
@@ -987,6 +1074,25 @@ class RopeFolderTest(unittest.TestCase):
         myfile = self.project.root.create_file('.hgignore')
         self.assertFalse(self.project.is_ignored(myfile))
 
+    def test_matching_many_ignored_resources(self):
+        patterns = ['*.pyc', 'build//*.txt', '.hg'] + \
+            ['f(%d)' % index for index in range(200)]
+        self.project = testutils.sample_project(ignored_resources=patterns)
+        ignored = self.project.ignored
+        self.assertTrue(ignored.does_match_path('mod.pyc'))
+        self.assertTrue(ignored.does_match_path('build/a/b/c.txt'))
+        self.assertTrue(ignored.does_match_path('pkg/.hg/store'))
+        self.assertTrue(ignored.does_match_path('pkg/f199/mod.py'))
+        self.assertFalse(ignored.does_match_path('pkg/f200/mod.py'))
+        self.assertFalse(ignored.does_match_path('.hgignore'))
+
+    def test_changing_ignored_resources_after_matching(self):
+        self.project = testutils.sample_project(ignored_resources=['*.txt'])
+        myfile = self.project.root.create_file('myfile.txt')
+        self.assertTrue(self.project.is_ignored(myfile))
+        self.project.set('ignored_resources', ['*.py'])
+        self.assertFalse(self.project.is_ignored(myfile))
+
     def test_loading_config_dot_py(self):
         self.project = testutils.sample_project(ropefolder='.ropeproject')
         config = self.project.get_file('.ropeproject/config.py')
@@ -1026,12 +1132,66 @@ class RopeFolderTest(unittest.TestCase):
         self.assertTrue(ropefolder.exists())
 
 
+class FolderListingCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        super(FolderListingCacheTest, self).setUp()
+        self.project = testutils.sample_project(cache_folder_listings=True)
+
+    def tearDown(self):
+        testutils.remove_project(self.project)
+        super(FolderListingCacheTest, self).tearDown()
+
+    def _create_externally(self, path):
+        open(os.path.join(self.project.address, path), 'w').close()
+
+    def test_getting_resources(self):
+        folder = self.project.root.create_folder('folder')
+        myfile = folder.create_file('myfile.txt')
+        self.assertEquals(folder, self.project.get_resource('folder'))
+        self.assertEquals(myfile,
+                          self.project.get_resource('folder/myfile.txt'))
+        self.assertTrue(self.project.get_resource('folder').is_folder())
+        self.assertFalse(folder.has_child('another.txt'))
+        self.assertEquals([myfile], folder.get_children())
+
+    def test_not_seeing_external_changes_before_validation(self):
+        folder = self.project.root.create_folder('folder')
+        self.assertEquals([], folder.get_children())
+        self._create_externally('folder/myfile.txt')
+        self.assertFalse(folder.has_child('myfile.txt'))
+        self.project.validate(folder)
+        self.assertTrue(folder.has_child('myfile.txt'))
+        self.assertEquals(1, len(folder.get_children()))
+
+    def test_changes_made_by_rope(self):
+        folder = self.project.root.create_folder('folder')
+        myfile = folder.create_file('myfile.txt')
+        self.assertTrue(folder.has_child('myfile.txt'))
+        folder.move('newfolder')
+        self.assertFalse(self.project.root.has_child('folder'))
+        newfolder = self.project.get_resource('newfolder')
+        self.assertTrue(newfolder.has_child('myfile.txt'))
+        newfolder.get_child('myfile.txt').remove()
+        self.assertEquals([], newfolder.get_children())
+        self.assertFalse(myfile.exists())
+
+    def test_refreshing_source_folders_forgets_listings(self):
+        self.assertEquals(None, self.project.find_module('mod'))
+        self._create_externally('mod.py')
+        self.assertEquals(None, self.project.find_module('mod'))
+        self.project.refresh_source_folders()
+        self.assertEquals(self.project.get_resource('mod.py'),
+                          self.project.find_module('mod'))
+
+
 def suite():
     result = unittest.TestSuite()
     result.addTests(unittest.makeSuite(ProjectTest))
     result.addTests(unittest.makeSuite(ResourceObserverTest))
     result.addTests(unittest.makeSuite(OutOfProjectTest))
     result.addTests(unittest.makeSuite(RopeFolderTest))
+    result.addTests(unittest.makeSuite(FolderListingCacheTest))
     return result
 
 if __name__ == '__main__':
@@ -1,4 +1,7 @@
+import os
+import shutil
 import sys
+import tempfile
 
 from rope.base.builtins import File, BuiltinClass
 
@@ -7,6 +10,7 @@ try:
 except ImportError:
     import unittest
 
+from rope.base import evaluate
 from rope.base import exceptions
 from rope.base import libutils
 from rope.base.pycore import _TextChangeDetector
@@ -80,6 +84,15 @@ class PyCoreTest(unittest.TestCase):
         var = mod_element['var']
         self.assertEqual(AssignedName, type(var))
 
+    def test_pynames_and_scopes_using_slots(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('def f(param):\n    var = param\n')
+        scope = self.project.get_module('mod')['f'].get_object().get_scope()
+        self.assertEquals([], scope.get_scopes())
+        self.assertFalse(hasattr(scope, '__dict__'))
+        self.assertFalse(hasattr(scope['var'], '__dict__'))
+        self.assertFalse(hasattr(scope['param'], '__dict__'))
+
     @testutils.only_for_versions_higher('3.6')
     def test_global_variable_with_type_annotation(self):
         mod = testutils.create_module(self.project, 'mod')
@@ -293,6 +306,32 @@ class PyCoreTest(unittest.TestCase):
         found_module = self.project.find_module('sample')
         self.assertEquals(samplepkg, found_module)
 
+    def test_finding_modules_after_creating_them(self):
+        self.assertEquals(None, self.project.find_module('samplemod'))
+        samplemod = testutils.create_module(self.project, 'samplemod')
+        self.assertEquals(samplemod, self.project.find_module('samplemod'))
+
+    def test_finding_modules_after_moving_them(self):
+        samplemod = testutils.create_module(self.project, 'samplemod')
+        self.assertEquals(samplemod, self.project.find_module('samplemod'))
+        pkg = testutils.create_package(self.project, 'pkg')
+        samplemod.move('pkg/samplemod.py')
+        self.assertEquals(None, self.project.find_module('samplemod'))
+        self.assertEquals(pkg.get_child('samplemod.py'),
+                          self.project.find_module('pkg.samplemod'))
+
+    def test_finding_modules_after_changing_python_path(self):
+        lib = tempfile.mkdtemp()
+        try:
+            open(os.path.join(lib, 'libmod.py'), 'w').close()
+            self.assertEquals(None, self.project.find_module('libmod'))
+            self.project.prefs['python_path'] = [lib]
+            libmod = self.project.find_module('libmod')
+            self.assertEquals(os.path.realpath(lib),
+                              os.path.dirname(libmod.real_path))
+        finally:
+            shutil.rmtree(lib)
+
     def test_source_folders_preference(self):
         testutils.create_package(self.project, 'pkg1')
         testutils.create_package(self.project, 'pkg1.src2')
@@ -1044,6 +1083,135 @@ class PyCoreInProjectsTest(unittest.TestCase):
         mod1.write('class A(object):\n    def func2(self):\n        pass\n')
         self.assertTrue('func2' in b_class)
 
+    def test_invalidating_only_the_importers_of_changed_modules(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod3 = testutils.create_module(self.project, 'mod3')
+        mod4 = testutils.create_module(self.project, 'mod4')
+        mod1.write('class A(object):\n    def f(self):\n        pass\n')
+        mod2.write('import mod1\nclass B(mod1.A):\n    pass\n')
+        mod3.write('from mod2 import *\nclass C(B):\n    pass\n')
+        mod4.write('class D(object):\n    pass\nd = D()\n')
+        c_class = self.project.get_module('mod3')['C'].get_object()
+        self.assertTrue('f' in c_class)
+        d_var = self.project.get_module('mod4')['d']
+        d_var.get_object()
+        mod1.write('class A(object):\n    def g(self):\n        pass\n')
+        self.assertTrue('g' in c_class)
+        stats = self.pycore.get_module_cache_stats()
+        self.assertEquals(3, stats['last_invalidated'])
+        self.assertTrue(d_var.pyobject.concluded.get() is not None)
+
+    def test_not_invalidating_unrelated_modules(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod1.write('a_var = 1\n')
+        mod2.write('b_var = 1\n')
+        self.project.get_pymodule(mod1)
+        self.project.get_pymodule(mod2)
+        mod1.write('a_var = 2\n')
+        stats = self.pycore.get_module_cache_stats()
+        self.assertEquals(1, stats['last_invalidated'])
+        self.assertEquals(1, stats['invalidations'])
+        self.assertEquals(1, stats['modules'])
+
+    def test_module_cache_stats(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        self.project.get_pymodule(mod)
+        self.project.get_pymodule(mod)
+        stats = self.pycore.get_module_cache_stats()
+        self.assertEquals(1, stats['hits'])
+        self.assertEquals(1, stats['misses'])
+        self.assertEquals(0.5, stats['hit_rate'])
+        self.assertEquals(len('a_var = 1\n'), stats['size'])
+
+    def test_caching_evaluated_nodes(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('class A(object):\n    pass\na_var = A()\n')
+        pymod = self.project.get_pymodule(mod)
+        node = pymod.get_ast().body[1].value
+        pyname1 = evaluate.eval_node(pymod.get_scope(), node)
+        misses = self.pycore.get_evaluation_stats()['misses']
+        pyname2 = evaluate.eval_node(pymod.get_scope(), node)
+        self.assertTrue(pyname1 is pyname2)
+        self.assertEquals(pymod['A'].get_object(),
+                          pyname1.get_object().get_type())
+        stats = self.pycore.get_evaluation_stats()
+        self.assertEquals(1, stats['hits'])
+        self.assertEquals(misses, stats['misses'])
+
+    def test_evaluating_nodes_of_functions_for_each_call_site(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('class C1(object):\n    pass\n'
+                  'class C2(object):\n    pass\n'
+                  'def f(p):\n    return [p]\n'
+                  'a_var = f(C1())[0]\nb_var = f(C2())[0]\n')
+        pymod = self.project.get_pymodule(mod)
+        self.assertEquals(pymod['C1'].get_object(),
+                          pymod['a_var'].get_object().get_type())
+        self.assertEquals(pymod['C2'].get_object(),
+                          pymod['b_var'].get_object().get_type())
+
+    def test_forgetting_evaluated_nodes_of_dependent_modules(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod1.write('var = 1\n')
+        mod2.write('import mod1\nb_var = mod1.var\n')
+        pymod2 = self.project.get_pymodule(mod2)
+        node = pymod2.get_ast().body[1].value
+        pyname = evaluate.eval_node(pymod2.get_scope(), node)
+        self.assertEquals((mod1, 1), (pyname.get_definition_location()[0]
+                                      .get_resource(),
+                                      pyname.get_definition_location()[1]))
+        mod1.write('import sys\nvar = 1\n')
+        pyname = evaluate.eval_node(pymod2.get_scope(), node)
+        self.assertEquals(2, pyname.get_definition_location()[1])
+        self.assertEquals(0, self.pycore.get_evaluation_stats()['hits'])
+
+    def test_evicting_least_recently_used_modules(self):
+        self.project.prefs['max_cached_modules'] = 2
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod3 = testutils.create_module(self.project, 'mod3')
+        pymod1 = self.project.get_pymodule(mod1)
+        pymod2 = self.project.get_pymodule(mod2)
+        self.project.get_pymodule(mod1)
+        self.project.get_pymodule(mod3)
+        stats = self.pycore.get_module_cache_stats()
+        self.assertEquals(2, stats['modules'])
+        self.assertEquals(1, stats['evictions'])
+        self.assertTrue(self.project.get_pymodule(mod1) is pymod1)
+        # still used, so it is cached again
+        self.assertTrue(self.project.get_pymodule(mod2) is pymod2)
+
+    def test_limiting_the_size_of_cached_modules(self):
+        self.project.prefs['max_cached_modules_size'] = 15
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod1.write('a_var = 1\n')
+        mod2.write('b_var = 1\n')
+        self.project.get_pymodule(mod1)
+        self.project.get_pymodule(mod2)
+        stats = self.pycore.get_module_cache_stats()
+        self.assertEquals(1, stats['modules'])
+        self.assertEquals(len('b_var = 1\n'), stats['size'])
+
+    def test_forgetting_dependents_of_evicted_modules(self):
+        self.project.prefs['max_cached_modules'] = 2
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod3 = testutils.create_module(self.project, 'mod3')
+        mod1.write('class A(object):\n    def f(self):\n        pass\n')
+        mod2.write('import mod1\nclass B(mod1.A):\n    pass\n')
+        b_class = self.project.get_pymodule(mod2)['B'].get_object()
+        self.assertTrue('f' in b_class)
+        self.project.get_pymodule(mod2)
+        self.project.get_pymodule(mod3)
+        self.assertEquals(1, self.pycore.get_module_cache_stats()['evictions'])
+        mod1.write('class A(object):\n    def g(self):\n        pass\n')
+        self.assertTrue('g' in b_class)
+
     def test_caching_pymodule_with_syntax_errors(self):
         self.project.prefs['ignore_syntax_errors'] = True
         self.project.prefs['automatic_soa'] = True
@@ -1079,6 +1247,15 @@ class TextChangeDetectorTest(unittest.TestCase):
         self.assertTrue(detector.is_changed(2, 3))
         self.assertFalse(detector.is_changed(4, 4))
 
+    def test_changes_between_repeated_lines(self):
+        detector = _TextChangeDetector('1\n\n3\n\n5\n', '1\n\n2\n\n5\n')
+        self.assertEquals([3], detector.lines)
+
+    def test_moved_lines(self):
+        detector = _TextChangeDetector('3\n1\n2\n', '1\n2\n3\n')
+        self.assertTrue(detector.is_changed(1, 1))
+        self.assertFalse(detector.is_changed(2, 3))
+
     def test_multi_line_checks(self):
         detector = _TextChangeDetector('1\n2\n', '1\n3\n')
         self.assertTrue(detector.is_changed(1, 2))
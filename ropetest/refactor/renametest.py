@@ -5,6 +5,8 @@ except ImportError:
     import unittest
 
 import rope.base.codeanalyze
+import rope.base.exceptions
+import rope.base.taskhandle
 import rope.refactor.occurrences
 from rope.refactor import rename
 from rope.refactor.rename import Rename
@@ -38,6 +40,21 @@ class RenameRefactoringTest(unittest.TestCase):
         refactored = self._local_rename('a_var = 20\n', 2, 'new_var')
         self.assertEquals('new_var = 20\n', refactored)
 
+    def test_renaming_in_more_modules_than_are_cached(self):
+        self.project.prefs['max_cached_modules'] = 5
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod1.write('def a_func():\n    pass\n')
+        mods = []
+        for index in range(2, 8):
+            mod = testutils.create_module(self.project, 'mod%d' % index)
+            mod.write('from mod%d import a_func\na_func()\n' % (index - 1))
+            mods.append(mod)
+        self._rename(mod1, len('def '), 'new_func')
+        self.assertEquals('def new_func():\n    pass\n', mod1.read())
+        for index, mod in enumerate(mods):
+            self.assertEquals('from mod%d import new_func\nnew_func()\n' %
+                              (index + 1), mod.read())
+
     def test_variable_renaming_only_in_its_scope(self):
         refactored = self._local_rename(
             'a_var = 20\ndef a_func():\n    a_var = 10\n', 32, 'new_var')
@@ -640,6 +657,33 @@ class RenameRefactoringTest(unittest.TestCase):
         self.assertEquals('def f():\n    pass\n', mod1.read())
         self.assertEquals('import mod1\nmod1.g()\n', mod2.read())
 
+    def test_renaming_in_more_than_one_process(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod3 = testutils.create_module(self.project, 'mod3')
+        mod1.write('def f():\n    pass\n')
+        mod2.write('import mod1\nmod1.f()\n')
+        mod3.write('f = 1\n')
+        changes = Rename(self.project, mod1, mod1.read().rindex('f')).\
+            get_changes('g', resources=[mod3, mod2, mod1], processes=2)
+        self.assertEquals([mod2, mod1],
+                          [change.resource for change in changes.changes])
+        self.project.do(changes)
+        self.assertEquals('def g():\n    pass\n', mod1.read())
+        self.assertEquals('import mod1\nmod1.g()\n', mod2.read())
+        self.assertEquals('f = 1\n', mod3.read())
+
+    def test_stopping_renames_in_more_than_one_process(self):
+        mod1 = testutils.create_module(self.project, 'mod1')
+        mod2 = testutils.create_module(self.project, 'mod2')
+        mod1.write('def f():\n    pass\n')
+        mod2.write('import mod1\nmod1.f()\n')
+        handle = rope.base.taskhandle.TaskHandle()
+        handle.stop()
+        renamer = Rename(self.project, mod1, mod1.read().rindex('f'))
+        with self.assertRaises(rope.base.exceptions.InterruptedTaskError):
+            renamer.get_changes('g', processes=2, task_handle=handle)
+
     # XXX: with variables should not leak
     @testutils.only_for('2.5')
     def xxx_test_with_statement_variables_should_not_leak(self):
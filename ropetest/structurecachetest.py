@@ -0,0 +1,72 @@
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import rope.base.structurecache
+from rope.contrib import autoimport
+from ropetest import testutils
+
+
+class StructureCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        super(StructureCacheTest, self).setUp()
+        self.project = testutils.sample_project(use_structure_cache=True)
+        self.cache = self.project.structure_cache
+        self.mod = testutils.create_module(self.project, 'mod')
+
+    def tearDown(self):
+        testutils.remove_project(self.project)
+        super(StructureCacheTest, self).tearDown()
+
+    def test_global_names(self):
+        self.mod.write('import os\nfrom sys import path\n'
+                       'a_var = 1\ndef a_func():\n    pass\n'
+                       'class C(object):\n    c_var = 1\n'
+                       '    def f(self):\n        pass\n')
+        self.assertEquals({'os': 'module', 'path': 'imported',
+                           'a_var': 'assigned', 'a_func': 'function',
+                           'C': 'class'},
+                          self.cache.get_global_names(self.mod))
+
+    def test_forgetting_changed_modules(self):
+        self.mod.write('a_var = 1\n')
+        self.cache.get_global_names(self.mod)
+        self.mod.write('b_var = 1\n')
+        self.assertEquals({'b_var': 'assigned'},
+                          self.cache.get_global_names(self.mod))
+
+    def test_reusing_saved_structures_without_parsing(self):
+        self.mod.write('a_var = 1\n')
+        self.cache.get_global_names(self.mod)
+        self.project.close()
+        cache = rope.base.structurecache.StructureCache(self.project)
+        self.project.get_pymodule = None
+        self.assertEquals({'a_var': 'assigned'},
+                          cache.get_global_names(self.mod))
+
+    def test_detecting_externally_changed_modules(self):
+        self.mod.write('a_var = 1\n')
+        self.cache.get_global_names(self.mod)
+        testutils.write_externally(self.mod, 'b_var = 1\n')
+        self.project.validate()
+        self.assertEquals({'b_var': 'assigned'},
+                          self.cache.get_global_names(self.mod))
+
+    def test_autoimport_using_the_structure_cache(self):
+        self.mod.write('a_var = 1\nimport os\n')
+        importer = autoimport.AutoImport(self.project, observe=False)
+        importer.generate_cache()
+        self.assertEquals([('a_var', 'mod')], importer.import_assist('a_'))
+        self.assertTrue('mod' in str(self.cache.files))
+
+
+def suite():
+    result = unittest.TestSuite()
+    result.addTests(unittest.makeSuite(StructureCacheTest))
+    return result
+
+
+if __name__ == '__main__':
+    unittest.main()
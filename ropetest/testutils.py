@@ -44,6 +44,15 @@ def remove_project(project):
     remove_recursively(project.address)
 
 
+def write_externally(resource, contents):
+    """Change `resource` without rope noticing it"""
+    with open(resource.real_path, 'w') as output:
+        output.write(contents)
+    # making sure the modification time changes
+    mtime = os.path.getmtime(resource.real_path) + 1
+    os.utime(resource.real_path, (mtime, mtime))
+
+
 def remove_recursively(path):
     import time
     # windows sometimes raises exceptions instead of removing files
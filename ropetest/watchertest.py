@@ -0,0 +1,112 @@
+import os
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import rope.base.watcher
+from rope.base import resourceobserver
+from ropetest import testutils
+
+
+@unittest.skipUnless(rope.base.watcher.is_supported(),
+                     'inotify is not available')
+class WatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        super(WatcherTest, self).setUp()
+        self.project = testutils.sample_project(use_watcher=True)
+        self.watcher = self.project.watcher
+        self.log = []
+        self.project.add_observer(resourceobserver.ResourceObserver(
+            changed=self._log('changed'), moved=self._log('moved'),
+            created=self._log('created'), removed=self._log('removed')))
+        self.watcher.process_events()
+
+    def tearDown(self):
+        self.watcher.close()
+        testutils.remove_project(self.project)
+        super(WatcherTest, self).tearDown()
+
+    def _log(self, kind):
+        def log(*resources):
+            self.log.append((kind,) + tuple(resource.path
+                                            for resource in resources))
+        return log
+
+    def test_reporting_changed_files(self):
+        myfile = self.project.root.create_file('myfile.txt')
+        self.watcher.process_events()
+        del self.log[:]
+        testutils.write_externally(
+            self.project.get_file('myfile.txt'), 'new contents\n')
+        self.assertTrue(self.watcher.process_events())
+        self.assertEquals([('changed', myfile.path)], self.log)
+
+    def test_reporting_created_and_removed_files(self):
+        testutils.write_externally(self.project.get_file('myfile.txt'), '')
+        self.watcher.process_events()
+        self.assertEquals(('created', 'myfile.txt'), self.log[0])
+        os.remove(os.path.join(self.project.address, 'myfile.txt'))
+        self.watcher.process_events()
+        self.assertEquals(('removed', 'myfile.txt'), self.log[-1])
+
+    def test_reporting_moved_files(self):
+        self.project.root.create_file('myfile.txt')
+        self.watcher.process_events()
+        del self.log[:]
+        os.rename(os.path.join(self.project.address, 'myfile.txt'),
+                  os.path.join(self.project.address, 'newfile.txt'))
+        self.watcher.process_events()
+        self.assertEquals([('moved', 'myfile.txt', 'newfile.txt')], self.log)
+
+    def test_watching_new_folders(self):
+        os.mkdir(os.path.join(self.project.address, 'folder'))
+        self.watcher.process_events()
+        testutils.write_externally(
+            self.project.get_file('folder/myfile.txt'), '')
+        self.watcher.process_events()
+        self.assertTrue(('created', 'folder') in self.log)
+        self.assertTrue(('created', 'folder/myfile.txt') in self.log)
+
+    def test_not_reporting_changes_made_by_rope(self):
+        myfile = self.project.root.create_file('myfile.txt')
+        myfile.write('contents\n')
+        del self.log[:]
+        self.watcher.process_events()
+        self.assertEquals([], self.log)
+
+    def test_validating_using_the_watcher(self):
+        mod = testutils.create_module(self.project, 'mod')
+        mod.write('a_var = 1\n')
+        pymod = self.project.get_pymodule(mod)
+        testutils.write_externally(
+            self.project.get_file('mod.py'), 'b_var = 1\n')
+        self.project.validate()
+        self.assertTrue(self.project.get_pymodule(mod) is not pymod)
+        self.assertTrue('b_var' in self.project.get_pymodule(mod))
+
+    def test_closing_the_project_closes_the_watcher(self):
+        self.project.close()
+        self.assertTrue(self.watcher.fd is None)
+        self.assertFalse(hasattr(self.project, '_watcher'))
+
+    def test_validating_walks_the_project_before_watching(self):
+        project = testutils.sample_project(foldername='sampleproject2',
+                                           use_watcher=True)
+        try:
+            self.assertFalse(project.watcher.process_events())
+            self.assertTrue(project.watcher.process_events())
+        finally:
+            project.watcher.close()
+            testutils.remove_project(project)
+
+
+def suite():
+    result = unittest.TestSuite()
+    result.addTests(unittest.makeSuite(WatcherTest))
+    return result
+
+
+if __name__ == '__main__':
+    unittest.main()